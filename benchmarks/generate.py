@@ -0,0 +1,155 @@
+"""Deterministic synthetic cascade trees for benchmarking."""
+
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+try:
+    import yaml
+except Exception:  # pragma: no cover
+    yaml = None
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """Shape of a generated tree.
+
+    Every directory holds a ``__main__`` file, ``files_per_dir`` sibling files
+    and ``fanout`` subdirectories down to ``depth`` levels; the first sibling
+    file shares its stem with the first subdirectory so file/directory merges
+    are exercised. Files hold ``keys_per_file`` keys, nested ``nesting`` levels
+    deep, with lists of ``list_length`` items. Formats are assigned round-robin
+    from ``formats``.
+    """
+
+    depth: int = 3
+    fanout: int = 3
+    files_per_dir: int = 4
+    keys_per_file: int = 20
+    nesting: int = 2
+    list_length: int = 5
+    formats: Tuple[str, ...] = ("yaml", "json", "toml")
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+PRESETS: Dict[str, TreeSpec] = {
+    "small": TreeSpec(depth=2, fanout=2, files_per_dir=3, keys_per_file=10),
+    "medium": TreeSpec(),
+    "large": TreeSpec(depth=4, fanout=4, files_per_dir=6, keys_per_file=40),
+}
+
+
+def _scalar(rng: random.Random) -> Any:
+    kind = rng.randrange(4)
+    if kind == 0:
+        return rng.randrange(100_000)
+    if kind == 1:
+        return round(rng.random() * 1000, 3)
+    if kind == 2:
+        return rng.random() < 0.5
+    return "v" + "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=8))
+
+
+def _content(rng: random.Random, spec: TreeSpec, keys: int, level: int) -> dict:
+    out: Dict[str, Any] = {}
+    for i in range(keys):
+        roll = rng.random()
+        if level < spec.nesting and roll < 0.25:
+            out[f"k{i}"] = _content(rng, spec, max(2, keys // 4), level + 1)
+        elif roll < 0.4:
+            out[f"k{i}"] = [_scalar(rng) for _ in range(spec.list_length)]
+        else:
+            out[f"k{i}"] = _scalar(rng)
+    return out
+
+
+def _toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(_toml_value(v) for v in value) + "]"
+    return json.dumps(value)
+
+
+def _dump_toml(data: dict, prefix: str = "") -> str:
+    # enough TOML for generated content: scalars, scalar lists, nested tables
+    lines = [
+        f"{k} = {_toml_value(v)}" for k, v in data.items() if not isinstance(v, dict)
+    ]
+    for k, v in data.items():
+        if isinstance(v, dict):
+            name = f"{prefix}.{k}" if prefix else k
+            lines.append(f"\n[{name}]")
+            lines.append(_dump_toml(v, name))
+    return "\n".join(lines) + "\n"
+
+
+def _write(path: Path, fmt: str, data: dict) -> Path:
+    if fmt == "json":
+        path = path.with_suffix(".json")
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    elif fmt == "toml":
+        path = path.with_suffix(".toml")
+        path.write_text(_dump_toml(data), encoding="utf-8")
+    elif fmt == "yaml":
+        path = path.with_suffix(".yaml")
+        # JSON is valid YAML, used when PyYAML is missing
+        text = (
+            yaml.safe_dump(data, sort_keys=False)
+            if yaml is not None
+            else json.dumps(data, indent=2)
+        )
+        path.write_text(text, encoding="utf-8")
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return path
+
+
+def generate_tree(root: Path | str, spec: TreeSpec) -> Dict[str, int]:
+    """Write the tree described by ``spec`` below ``root``.
+
+    The same spec always produces the same files. Returns file, directory and
+    byte counts.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    counts = {"files": 0, "dirs": 0, "bytes": 0}
+    n = 0
+
+    def emit(path: Path, data: dict) -> None:
+        nonlocal n
+        written = _write(path, spec.formats[n % len(spec.formats)], data)
+        n += 1
+        counts["files"] += 1
+        counts["bytes"] += written.stat().st_size
+
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n", encoding="utf-8"
+    )
+
+    def build(directory: Path, level: int) -> None:
+        rel = directory.relative_to(root).as_posix()
+        rng = random.Random(f"{spec.seed}:{rel}")
+        counts["dirs"] += 1
+        emit(directory / "__main__", _content(rng, spec, spec.keys_per_file, 0))
+        for i in range(spec.files_per_dir):
+            stem = "d0" if i == 0 and level < spec.depth else f"f{i}"
+            emit(directory / stem, _content(rng, spec, spec.keys_per_file, 0))
+        if level >= spec.depth:
+            return
+        for j in range(spec.fanout):
+            sub = directory / f"d{j}"
+            sub.mkdir(exist_ok=True)
+            build(sub, level + 1)
+
+    build(root, 1)
+    return counts
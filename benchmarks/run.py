@@ -0,0 +1,185 @@
+"""Run the load/access/save benchmarks and print (or write) JSON results.
+
+python -m benchmarks.run --preset medium --repeat 5 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from data_cascade import load_data_cascade, make_cascade, save_data_cascade
+from data_cascade.pathops import get_at, parse_path
+
+from .generate import PRESETS, TreeSpec, generate_tree
+
+_COLD_LOAD = """
+import sys, time
+t = time.perf_counter()
+from data_cascade import load_data_cascade
+load_data_cascade(sys.argv[1])
+print(time.perf_counter() - t)
+"""
+
+
+def _summary(samples: List[float], ops: int = 1) -> Dict[str, Any]:
+    median = statistics.median(samples)
+    return {
+        "seconds": median,
+        "min": min(samples),
+        "max": max(samples),
+        "repeat": len(samples),
+        "ops": ops,
+        "ops_per_sec": ops / median if median else None,
+    }
+
+
+def _timed(fn: Callable[[], Any], repeat: int, ops: int = 1) -> Dict[str, Any]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return _summary(samples, ops)
+
+
+def _leaf_paths(data: Any, cmap: Any, count: int, seed: int) -> List[tuple]:
+    paths = sorted(
+        kp
+        for kp in cmap.reverse
+        if kp and not isinstance(get_at(data, kp, missing=[]), (dict, list))
+    )
+    rng = random.Random(seed)
+    return [rng.choice(paths) for _ in range(count)] if paths else []
+
+
+def run(spec: TreeSpec, repeat: int, ops: int, root: Path) -> Dict[str, Any]:
+    counts = generate_tree(root, spec)
+    results: Dict[str, Any] = {}
+
+    cold = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", _COLD_LOAD, str(root)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    results["cold_load"] = _summary(cold)
+    results["warm_load"] = _timed(lambda: load_data_cascade(root), repeat)
+
+    c = make_cascade(root)
+    paths = _leaf_paths(c.data, c.cmap, ops, spec.seed)
+    strings = [".".join(kp) for kp in paths]
+
+    def parse_all() -> None:
+        for s in strings:
+            parse_path(s)
+
+    def get_all() -> None:
+        for kp in paths:
+            c.get(kp)
+
+    def set_all() -> None:
+        for kp in paths:
+            c.set(kp, 1)
+
+    results["parse_path"] = _timed(parse_all, repeat, len(strings))
+    results["get"] = _timed(get_all, repeat, len(paths))
+    results["get_many"] = _timed(lambda: c.get_many(paths), repeat, len(paths))
+    results["set"] = _timed(set_all, repeat, len(paths))
+    results["set_many"] = _timed(
+        lambda: c.set_many(dict.fromkeys(paths, 2)), repeat, len(paths)
+    )
+
+    c = make_cascade(root)
+    target = paths[0] if paths else ("k0",)
+
+    def dirty_save() -> None:
+        c.set(target, 3)
+        c.save()
+
+    def full_save() -> None:
+        save_data_cascade(root, c.data, c.cmap)
+
+    for name, fn in (("dirty_save", dirty_save), ("full_save", full_save)):
+        try:
+            results[name] = _timed(fn, repeat)
+        except RuntimeError as e:  # e.g. no writer for one of the formats
+            results[name] = {"skipped": str(e)}
+
+    return {"spec": spec.to_dict(), "tree": counts, "results": results}
+
+
+def _version() -> Optional[str]:
+    try:
+        return metadata.version("data-cascade")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--fanout", type=int)
+    parser.add_argument("--files-per-dir", type=int)
+    parser.add_argument("--keys-per-file", type=int)
+    parser.add_argument("--nesting", type=int)
+    parser.add_argument("--list-length", type=int)
+    parser.add_argument("--formats", help="comma separated, e.g. yaml,json")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ops", type=int, default=10_000, help="paths per op test")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    overrides: Dict[str, Any] = {
+        name: getattr(args, name)
+        for name in (
+            "depth",
+            "fanout",
+            "files_per_dir",
+            "keys_per_file",
+            "nesting",
+            "list_length",
+            "seed",
+        )
+        if getattr(args, name) is not None
+    }
+    if args.formats:
+        overrides["formats"] = tuple(args.formats.split(","))
+    spec = replace(PRESETS[args.preset], **overrides)
+
+    with tempfile.TemporaryDirectory(prefix="data-cascade-bench-") as tmp:
+        report = run(spec, args.repeat, args.ops, Path(tmp) / "tree")
+    report.update(
+        preset=args.preset,
+        version=_version(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
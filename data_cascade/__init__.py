@@ -1,15 +1,62 @@
 """Cascade Loader public API."""
 
-from .cascade import Cascade, make_cascade
+from .aio import load_data_cascade_async, save_data_cascade_async
+from .cache import ParseCache, parse_cache
+from .cascade import (
+    Cascade,
+    ConcurrentCascade,
+    OverlayCascade,
+    QueryMatch,
+    make_cascade,
+    make_cascade_async,
+)
+from .diff import ChangeSet, KeyChange, diff
+from .frozen import FrozenDict, freeze, thaw
 from .loader import load_data_cascade
-from .mapping import CascadeMap, KeyOrigin
+from .mapping import CascadeMap, DirectoryConfig, KeyOrigin
+from .overlay import LayerCache, load_overlay
 from .saver import save_data_cascade
+from .server import CascadeClient, CascadeServer
+from .shared import CascadeBuffer, SharedCascade, share_cascade
+from .stats import LoadStats
+from .store import CascadeStore, SqliteCascade, compile_store
+from .views import View, compile_view
+from .watch import CascadeWatcher
 
 __all__ = [
     "load_data_cascade",
     "save_data_cascade",
     "CascadeMap",
     "KeyOrigin",
+    "DirectoryConfig",
     "Cascade",
     "make_cascade",
+    "QueryMatch",
+    "ConcurrentCascade",
+    "OverlayCascade",
+    "load_overlay",
+    "LayerCache",
+    "ParseCache",
+    "parse_cache",
+    "load_data_cascade_async",
+    "save_data_cascade_async",
+    "make_cascade_async",
+    "CascadeWatcher",
+    "diff",
+    "ChangeSet",
+    "KeyChange",
+    "LoadStats",
+    "SqliteCascade",
+    "CascadeStore",
+    "compile_store",
+    "SharedCascade",
+    "CascadeBuffer",
+    "share_cascade",
+    "CascadeServer",
+    "CascadeClient",
+    "View",
+    "compile_view",
+    "FrozenDict",
+    "freeze",
+    "thaw",
 ]
@@ -0,0 +1,145 @@
+"""asyncio counterparts of loading and saving that keep the event loop free."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .config import SUPPORTED_EXTS_DEFAULT
+from .filters import PathFilter
+from .io import _Prefetched, load_file
+from .loader import load_data_cascade
+from .logging_utils import get_logger
+from .mapping import CascadeMap
+from .overlay import Layer, LayerCache, layer_cache, load_layer, merge_layers
+from .saver import ValueAt, _plan_save, _write_planned
+from .traverse import collect_files
+
+log = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+
+# load options under which the sync loader does not parse every file up
+# front from disk
+_NO_PREFETCH = ("lazy", "processes", "loader", "fs", "dir_cache")
+
+
+async def _bounded(
+    sem: asyncio.Semaphore,
+    executor: Optional[Executor],
+    fn: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    async with sem:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+async def _load_one(
+    sem: asyncio.Semaphore, executor: Optional[Executor], path: Path
+) -> Tuple[Any, Optional[BaseException]]:
+    try:
+        return await _bounded(sem, executor, load_file, path), None
+    except Exception as e:  # re-raised by the loader when the traversal asks
+        return None, e
+
+
+def _prefetchable(load_options: Dict[str, Any]) -> bool:
+    # whether the sync loader would parse every file up front from disk
+    return all(load_options.get(k) in (None, False) for k in _NO_PREFETCH)
+
+
+async def load_data_cascade_async(
+    root: Path | str,
+    *,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    **load_options: Any,
+) -> tuple[Dict[str, Any], CascadeMap]:
+    """Async :func:`~data_cascade.loader.load_data_cascade`, which receives
+    ``load_options``.
+
+    Files below a local directory are read and parsed in ``executor`` (the
+    loop's default executor when ``None``) with at most ``max_concurrency`` in
+    flight; the merge then runs in the executor as well, in the same
+    deterministic order as the sync loader. Loads that do not parse every file
+    up front from disk (``lazy``, ``processes``, ``loader``, ``fs``,
+    ``dir_cache`` or an archive root) skip the prefetch and run the sync
+    loader in the executor.
+    """
+    loop = asyncio.get_running_loop()
+    root_path = Path(root)
+    load = partial(load_data_cascade, root_path, **load_options)
+    if not _prefetchable(load_options) or not await loop.run_in_executor(
+        executor, root_path.is_dir
+    ):
+        return await loop.run_in_executor(executor, load)
+    path_filter = PathFilter.build(
+        load_options.get("include"), load_options.get("exclude")
+    )
+    allowed_exts = load_options.get("allowed_exts", SUPPORTED_EXTS_DEFAULT)
+    files = await loop.run_in_executor(
+        executor, collect_files, root_path, allowed_exts, path_filter
+    )
+    sem = asyncio.Semaphore(max_concurrency)
+    loaded = await asyncio.gather(*(_load_one(sem, executor, p) for p in files))
+    prefetched = _Prefetched(dict(zip(files, loaded)))
+    return await loop.run_in_executor(executor, partial(load, loader=prefetched))
+
+
+async def load_overlay_async(
+    roots: Sequence[Path | str],
+    *,
+    cache: Optional[LayerCache] = layer_cache,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    **options: Any,
+) -> Tuple[Dict[str, Any], CascadeMap, List[Layer]]:
+    """Async :func:`~data_cascade.overlay.load_overlay`.
+
+    Roots are loaded in ``executor`` with at most ``max_concurrency`` at once
+    and merged there in their given order.
+    """
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(max_concurrency)
+    layers = await asyncio.gather(
+        *(
+            _bounded(sem, executor, partial(load_layer, root, cache, **options))
+            for root in roots
+        )
+    )
+    data, cmap = await loop.run_in_executor(executor, merge_layers, layers)
+    return data, cmap, list(layers)
+
+
+async def save_data_cascade_async(
+    root: Path | str,
+    data: Dict[str, Any],
+    cmap: CascadeMap,
+    *,
+    target_files: Optional[Iterable[Path]] = None,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    value_at: Optional[ValueAt] = None,
+) -> None:
+    """Async ``save_data_cascade``; files are written concurrently.
+
+    ``data`` must not be modified until the returned coroutine finishes.
+    """
+    loop = asyncio.get_running_loop()
+    root_path = Path(root)
+    await loop.run_in_executor(
+        executor, partial(root_path.mkdir, parents=True, exist_ok=True)
+    )
+    plan = await loop.run_in_executor(
+        executor, _plan_save, root_path, data, cmap, target_files, value_at
+    )
+    sem = asyncio.Semaphore(max_concurrency)
+    await asyncio.gather(
+        *(_bounded(sem, executor, _write_planned, f, obj) for f, obj in plan)
+    )
+
+
+__all__ = ["load_data_cascade_async", "load_overlay_async", "save_data_cascade_async"]
@@ -0,0 +1,140 @@
+"""In-process cache of parsed files shared across loads.
+
+A :class:`ParseCache` is a drop-in ``loader`` for
+:func:`~data_cascade.loader.load_data_cascade` (and so for
+:func:`~data_cascade.cascade.make_cascade`). Entries are keyed by a file's
+real path and validated against its ``(mtime_ns, size)`` stamp, so cascades
+over overlapping roots (symlinked includes, per-tenant trees) parse each file
+once. Files read from another :class:`~data_cascade.fs.FileSystem` (an
+archive, a :class:`~data_cascade.fs.MemoryFS`) are stamped by it and keyed by
+its ``cache_key``, or by the instance when it has none. Results are held as immutable
+:mod:`~data_cascade.codec` payloads and every hit decodes a private copy, so
+one cascade's edits never reach another.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from .codec import decode, encode
+from .fs import FileStamp, FileSystem, file_stamp
+from .io import load_file
+from .logging_utils import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ParseCache:
+    """Parsed file content kept within a memory budget of ``max_bytes``.
+
+    The budget counts encoded payload bytes; the least recently used entries
+    are dropped first, and a file whose payload alone exceeds the budget is
+    not cached. ``hits``, ``misses`` and ``evictions`` count lookups and
+    dropped entries. Content that cannot be encoded is returned uncached.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        loader: Callable[[Path], Any] = load_file,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._loader = loader
+        self._size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[FileStamp, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # a number per file system without a ``cache_key``, never reused
+        self._fs_ids: "weakref.WeakKeyDictionary[FileSystem, int]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._next_fs_id = itertools.count()
+
+    @property
+    def size(self) -> int:
+        """Payload bytes currently held."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, path: Path, fs: Optional[FileSystem]) -> Hashable:
+        if fs is None:
+            return os.path.realpath(path)
+        token = fs.cache_key
+        if token is None:
+            with self._lock:
+                token = self._fs_ids.get(fs)
+                if token is None:
+                    token = self._fs_ids[fs] = next(self._next_fs_id)
+        return token, str(path)
+
+    def __call__(self, path: Path, fs: Optional[FileSystem] = None) -> Any:
+        """Return the parsed content of ``path`` (read from ``fs`` when given,
+        like :func:`~data_cascade.io.load_file`), parsing it on a miss."""
+        key = self._key(path, fs)
+        # stamped before parsing, so a file changed meanwhile misses next time
+        stamp = file_stamp(path) if fs is None else fs.stat(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                payload = entry[1]
+            else:
+                self.misses += 1
+                payload = None
+        if payload is not None:
+            return decode(payload)
+        content = self._loader(path) if fs is None else self._loader(path, fs=fs)
+        try:
+            payload = encode(content)
+        except Exception as e:
+            log.debug("Not caching %s: %s", path, e)
+            return content
+        self._store(key, stamp, payload)
+        return content
+
+    def _store(self, key: Hashable, stamp: FileStamp, payload: bytes) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            if len(payload) > self.max_bytes:
+                return
+            self._entries[key] = (stamp, payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._size -= len(dropped)
+                self.evictions += 1
+
+    def invalidate(self, path: Path, fs: Optional[FileSystem] = None) -> None:
+        """Drop the entry of ``path`` (in ``fs``), if any."""
+        key = self._key(path, fs)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# process-wide default, e.g. ``make_cascade(root, loader=parse_cache)``
+parse_cache = ParseCache()
+
+
+__all__ = ["ParseCache", "parse_cache", "DEFAULT_MAX_BYTES"]
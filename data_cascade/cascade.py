@@ -2,36 +2,122 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import threading
+import weakref
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Set
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
+from .aio import (
+    DEFAULT_CONCURRENCY,
+    load_data_cascade_async,
+    load_overlay_async,
+    save_data_cascade_async,
+)
+from .deferred import record_origins
+from .diff import ChangeSet, diff
+from .filters import PathFilter
+from .frozen import freeze, refreeze
 from .loader import load_data_cascade
 from .logging_utils import get_logger
-from .mapping import CascadeMap, KeyPath
+from .mapping import CascadeMap, KeyOrigin, KeyPath
+from .merge.strategy import MergeStrategy
+from .overlay import Layer, load_overlay
 from .pathops import get_at as _get_at
-from .pathops import parse_path
-from .pathops import set_at as _set_at
+from .pathops import get_many_at as _get_many_at
+from .pathops import parse_path, query_at
+from .pathops import set_many_at as _set_many_at
+from .pathops.query import Query
 from .saver import _pick_default_write_path  # reuse internal
-from .saver import save_data_cascade
+from .saver import ValueAt, save_data_cascade
+from .stats import LoadStats
+from .views import ViewMemo, compile_view
+from .watch import CascadeWatcher, ChangeCallback
 
 log = get_logger(__name__)
 
 
+# data, map, written key paths and unsaved-edit flag replaced by a reload
+_OldState = Tuple[Dict[str, Any], CascadeMap, Set[KeyPath], bool]
+
+
+def _as_key_path(path: str | KeyPath) -> KeyPath:
+    return parse_path(path) if isinstance(path, str) else tuple(path)
+
+
+def _flatten_update(
+    tree: Mapping[Any, Any], base: KeyPath
+) -> Iterable[Tuple[KeyPath, Any]]:
+    for k, v in tree.items():
+        kp = base + (str(k),)
+        if isinstance(v, Mapping) and v:
+            yield from _flatten_update(v, kp)
+        else:
+            yield kp, v
+
+
+@dataclass(frozen=True)
+class QueryMatch:
+    path: KeyPath
+    value: Any
+    origins: Tuple[KeyOrigin, ...]
+
+
 class CascadeNode:
+    """Proxy for a key path in a :class:`Cascade`.
+
+    Nodes are interned per cascade and path while referenced, and child nodes
+    are cached on their parent, so repeated ``cfg.db.host`` hops allocate
+    nothing.
+    """
+
+    __slots__ = ("_c", "_p", "_children", "_cached", "__weakref__")
+
     def __init__(self, cascade: "Cascade", key_path: KeyPath):
         self._c = cascade
         self._p = key_path
+        self._children: Dict[str, CascadeNode] = {}
+        # (cascade version, value); replaced as a whole so that racing
+        # readers never pair a value with another read's version
+        self._cached: Tuple[int, Any] = (-1, None)
+
+    def _child(self, seg: str) -> "CascadeNode":
+        node = self._children.get(seg)
+        if node is None:
+            node = self._c._node_for(self._p + (seg,))
+            self._children.setdefault(seg, node)
+        return node
 
     def __getattr__(self, name: str) -> "CascadeNode":
         if name.startswith("_"):
             raise AttributeError(name)
-        return CascadeNode(self._c, self._p + (name,))
+        return self._child(name)
 
     def __getitem__(self, key: object) -> "CascadeNode":
-        return CascadeNode(self._c, self._p + (str(key),))
+        return self._child(str(key))
+
+    def frozen(self) -> Any:
+        """The immutable value at this path (see :meth:`Cascade.frozen`)."""
+        return _get_at(self._c.frozen(), self._p, missing=None)
+
+    def view(self, schema: Optional[type] = None) -> Any:
+        """The compiled view at this path (see :meth:`Cascade.view`)."""
+        return self._c.view(self._p, schema)
 
     def get(self) -> Any:
-        return self._c.get(self._p)
+        c = self._c
+        if not c.cache_reads:
+            return c.get(self._p)
+        # the version is read first: a write racing the read leaves a newer
+        # value under an older version, which is just read again next time
+        version = c._version
+        cached = self._cached
+        if cached[0] != version:
+            cached = self._cached = (version, c.get(self._p))
+        return cached[1]
 
     def set(self, value: Any) -> None:
         self._c.set(self._p, value)
@@ -44,34 +130,211 @@ class CascadeNode:
 
 
 class Cascade:
-    def __init__(self, root: Path, data: dict, cmap: CascadeMap):
+    """Merged cascade data with path/proxy access and dirty-file saves.
+
+    With ``cache_reads=True`` node proxies memoize the value they resolve until
+    the next mutation through this object (``set``, ``set_many``, ``update``,
+    ``delete``). Mutating ``data`` directly bypasses that invalidation.
+    ``load_options`` are the keyword arguments of ``load_data_cascade`` used
+    again by ``refresh`` and the watcher. A cascade loaded with ``include`` or
+    ``exclude`` rejects writes outside the loaded paths, since their owning
+    files were never read. :meth:`frozen` returns an immutable view that is
+    rebuilt incrementally after writes.
+    """
+
+    # when True writers copy containers along written paths instead of
+    # mutating them, so earlier ``data`` roots remain immutable snapshots
+    _copy_on_write = False
+
+    def __init__(
+        self,
+        root: Path,
+        data: dict,
+        cmap: CascadeMap,
+        *,
+        cache_reads: bool = False,
+        load_options: Optional[Dict[str, Any]] = None,
+    ):
         self.root = Path(root)
         self.data = data
         self.cmap = cmap
+        self.cache_reads = cache_reads
+        self.load_options: Dict[str, Any] = dict(load_options or {})
         self._dirty_files: Set[Path] = set()
+        # bumped on every mutation; invalidates cached node reads
+        self._version = 0
+        # proxies handed out and still referenced
+        self._nodes: "weakref.WeakValueDictionary[KeyPath, CascadeNode]" = (
+            weakref.WeakValueDictionary()
+        )
+        # (version, frozen data) of the last ``frozen()`` call and the key
+        # paths written since then
+        self._frozen: Optional[Tuple[int, Any]] = None
+        self._frozen_stale: Set[KeyPath] = set()
+        # key paths written since the data was (re)loaded
+        self._written: Set[KeyPath] = set()
+        # (path, schema) -> (version, frozen value, view, view memo)
+        self._views: Dict[Tuple[KeyPath, Any], Tuple[int, Any, Any, ViewMemo]] = {}
+        self._path_filter = PathFilter.build(
+            self.load_options.get("include"), self.load_options.get("exclude")
+        )
+        # archives and other virtual file systems are read-only
+        self._writable = self.load_options.get("fs") is None and not any(
+            p.is_file() for p in (self.root, *self.root.parents)
+        )
 
     def get(self, path: str | KeyPath) -> Any:
         kp: KeyPath = parse_path(path) if isinstance(path, str) else path
         return _get_at(self.data, kp, missing=None)
 
-    def set(self, path: str | KeyPath, value: Any) -> None:
-        kp: KeyPath = parse_path(path) if isinstance(path, str) else path
-        self.data = _set_at(self.data, kp, value)
-        # mark files dirty: all origins for this key path
-        if kp in self.cmap.reverse:
-            for o in self.cmap.reverse[kp]:
-                self._dirty_files.add(o.file)
-        else:
-            # choose the file based on nearest ancestor or default
+    def get_many(self, paths: Iterable[str | KeyPath]) -> List[Any]:
+        """Return the values at ``paths`` (in order), ``None`` where missing."""
+        kps = [_as_key_path(p) for p in paths]
+        return _get_many_at(self.data, kps, missing=None)
+
+    def query(self, pattern: str | Query) -> List[QueryMatch]:
+        """Match a wildcard path (``*``, ``**``, ``[a:b]``) against the data.
+
+        Each match carries the origins recorded for its key path in ``cmap``
+        (empty for keys that were added since loading).
+        """
+        reverse = self.cmap.reverse
+        return [
+            QueryMatch(kp, value, tuple(reverse.get(kp, ())))
+            for kp, value in query_at(self.data, pattern)
+        ]
+
+    def _owning_files(self, origins: List[KeyOrigin]) -> Iterable[Path]:
+        # files that a write to a key path with these origins is saved to
+        return (o.file for o in origins)
+
+    def _save_values(self, data: Dict[str, Any]) -> Optional[ValueAt]:
+        # where saved files read their values from; None for ``data`` itself
+        return None
+
+    def _mark_dirty(
+        self,
+        key_paths: Iterable[KeyPath],
+        fallback: Optional[Dict[KeyPath, Path]] = None,
+    ) -> None:
+        # mark files dirty: all origins for a key path, or the owner of the
+        # nearest ancestor (or the default file) for new key paths. ``fallback``
+        # memoizes the ancestor lookups across one batch.
+        self._version += 1
+        reverse = self.cmap.reverse
+        if fallback is None:
+            fallback = {}
+        for kp in key_paths:
+            if kp in reverse:
+                self._dirty_files.update(self._owning_files(reverse[kp]))
+                continue
+            seen: List[KeyPath] = []
             prefix = kp
-            while prefix and prefix not in self.cmap.reverse:
+            while prefix and prefix not in reverse and prefix not in fallback:
+                seen.append(prefix)
                 prefix = prefix[:-1]
-            if prefix in self.cmap.reverse:
-                file = self.cmap.reverse[prefix][0].file
+            if prefix in fallback:
+                file = fallback[prefix]
+            elif prefix in reverse:
+                file = reverse[prefix][0].file
             else:
                 file = _pick_default_write_path(self.root)
+            for p in seen:
+                fallback[p] = file
             self._dirty_files.add(file)
 
+    def _mark_dirty_below(self, key_paths: List[KeyPath]) -> None:
+        # mark the files owning key paths below replaced containers
+        prefixes = set(key_paths)
+        for kp, origins in self.cmap.reverse.items():
+            if any(kp[:i] in prefixes for i in range(len(kp))):
+                self._dirty_files.update(self._owning_files(origins))
+
+    def _write(self, pairs: List[Tuple[KeyPath, Any]]) -> None:
+        # single entry point for mutations of ``data``
+        if self._path_filter is not None:
+            for kp, _ in pairs:
+                if not self._path_filter.covers(kp):
+                    raise ValueError(
+                        f"Path {'.'.join(kp)!r} is outside the loaded part of "
+                        "the cascade"
+                    )
+        old = _get_many_at(self.data, [kp for kp, _ in pairs])
+        if self.load_options.get("lazy") or self.load_options.get("layered"):
+            # the files below a replaced container are rewritten too, so
+            # their origins are needed even if it was never read
+            record_origins(old)
+        self.data = _set_many_at(self.data, pairs, copy_on_write=self._copy_on_write)
+        self._mark_dirty(kp for kp, _ in pairs)
+        replaced = [kp for (kp, _), v in zip(pairs, old) if isinstance(v, (dict, list))]
+        if replaced:
+            self._mark_dirty_below(replaced)
+        self._written.update(kp for kp, _ in pairs)
+        if self._frozen is not None:
+            self._frozen_stale.update(kp for kp, _ in pairs)
+
+    def frozen(self) -> Any:
+        """Return the data as an immutable, hashable tree.
+
+        Dicts become :class:`~data_cascade.frozen.FrozenDict` and lists tuples.
+        The result is cached until the next write; after writes through this
+        object only the written paths and their ancestors are rebuilt, the
+        rest is shared with the previous frozen tree. Like ``cache_reads`` it
+        does not notice direct mutation of ``data``. Unloaded lazy subtrees
+        are loaded.
+        """
+        cached = self._frozen
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        if cached is None:
+            value = freeze(self.data)
+        elif self._frozen_stale:
+            value = refreeze(cached[1], self.data, self._frozen_stale)
+        else:
+            value = cached[1]
+        self._frozen = (self._version, value)
+        self._frozen_stale = set()
+        return value
+
+    def view(self, path: str | KeyPath = (), schema: Optional[type] = None) -> Any:
+        """Return the data at ``path`` compiled into an attribute-access view.
+
+        See :func:`~data_cascade.views.compile_view`. Views are snapshots of
+        :meth:`frozen`: fetch them again after writes or refreshes. The view
+        is cached until then, and rebuilding it reuses the views of subtrees
+        that did not change.
+        """
+        key = (_as_key_path(path), schema)
+        cached = self._views.get(key)
+        version = self._version
+        if cached is not None and cached[0] == version:
+            return cached[2]
+        value = _get_at(self.frozen(), key[0], missing=None)
+        if cached is not None and cached[1] is value:
+            view, memo = cached[2], cached[3]
+        else:
+            memo = {}
+            view = compile_view(
+                value, schema, reuse=cached[3] if cached else None, memo=memo
+            )
+        self._views[key] = (version, value, view, memo)
+        return view
+
+    def set(self, path: str | KeyPath, value: Any) -> None:
+        self._write([(_as_key_path(path), value)])
+
+    def set_many(self, items: Mapping[str | KeyPath, Any]) -> None:
+        """Assign several paths at once with a single dirty-tracking pass."""
+        self._write([(_as_key_path(p), v) for p, v in items.items()])
+
+    def update(self, subtree: Mapping[Any, Any], path: str | KeyPath = ()) -> None:
+        """Deep-update the data at ``path`` with ``subtree``.
+
+        Nested mappings are merged key by key; any other value (including lists
+        and empty mappings) replaces the existing value.
+        """
+        self._write(list(_flatten_update(subtree, _as_key_path(path))))
+
     def delete(self, path: str | KeyPath) -> None:
         kp: KeyPath = parse_path(path) if isinstance(path, str) else path
         # Deletion strategy: set None at the leaf (simple). The saver reconstructs
@@ -80,22 +343,414 @@ class Cascade:
         # the key at the parent level. For brevity we keep None-write here.
         self.set(kp, None)
 
+    def config_for(self, path: str | KeyPath) -> Optional[Mapping[str, Any]]:
+        """The directory default config (``__config__``) in effect at ``path``."""
+        return self.cmap.config_for(_as_key_path(path))
+
+    def strategy_for(self, path: str | KeyPath) -> MergeStrategy:
+        """The merge strategy that applies at ``path``."""
+        return self.cmap.strategy_for(_as_key_path(path))
+
+    def _node_for(self, kp: KeyPath) -> CascadeNode:
+        node = self._nodes.get(kp)
+        if node is None:
+            # setdefault keeps interning intact when readers race on a miss
+            node = self._nodes.setdefault(kp, CascadeNode(self, kp))
+        return node
+
     def node(self, path: str | KeyPath = ()) -> CascadeNode:
         kp: KeyPath = (
             parse_path(path) if isinstance(path, str) else (path if path else tuple())
         )
-        return CascadeNode(self, kp)
+        return self._node_for(tuple(kp))
+
+    def _replace_state(self, data: Dict[str, Any], cmap: CascadeMap) -> _OldState:
+        # returns the replaced data and map, the key paths written to them and
+        # whether any of those writes is unsaved
+        old = (self.data, self.cmap, self._written, bool(self._dirty_files))
+        self.data = data
+        self.cmap = cmap
+        self._dirty_files.clear()
+        self._written = set()
+        self._version += 1
+        self._frozen = None
+        self._frozen_stale = set()
+        return old
+
+    def _reload(
+        self,
+        data: Dict[str, Any],
+        cmap: CascadeMap,
+        files: Optional[Iterable[Path]] = None,
+    ) -> ChangeSet:
+        # swap in freshly loaded state; ``files`` changed since the last load
+        old_data, old_map, written, unsaved = self._replace_state(data, cmap)
+        return diff(
+            old_data,
+            data,
+            old_map,
+            cmap,
+            files=files,
+            written=written,
+            full=unsaved,
+        )
+
+    def _watch_roots(self) -> List[Path]:
+        # the directories a CascadeWatcher watches
+        return [self.root]
+
+    def _reload_files(self, files: Set[Path], **options: Any) -> ChangeSet:
+        # reload after ``files`` changed (for a CascadeWatcher); ``options``
+        # override ``load_options`` for this load
+        data, cmap = load_data_cascade(self.root, **{**self.load_options, **options})
+        return self._reload(data, cmap, files=files)
+
+    def _preload(self, **options: Any) -> None:
+        # fill the caches in ``options`` ahead of the first _reload_files
+        load_data_cascade(self.root, **{**self.load_options, **options})
+
+    def refresh(self) -> ChangeSet:
+        """Reload data and origins from ``root``, discarding unsaved edits.
+
+        Returns the key-level changes relative to the previous state.
+        """
+        data, cmap = load_data_cascade(self.root, **self.load_options)
+        return self._reload(data, cmap)
+
+    async def refresh_async(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> ChangeSet:
+        data, cmap = await load_data_cascade_async(
+            self.root,
+            max_concurrency=max_concurrency,
+            executor=executor,
+            **self.load_options,
+        )
+        return self._reload(data, cmap)
+
+    def watch(
+        self, callback: Optional[ChangeCallback] = None, **kwargs: Any
+    ) -> CascadeWatcher:
+        """Start a :class:`CascadeWatcher` that reloads this cascade on change.
+
+        ``callback`` receives the :class:`ChangeSet` of each reload. Call
+        ``stop()`` on the returned watcher (or use it as a context manager).
+        """
+        return CascadeWatcher(self, callback, **kwargs).start()
+
+    def _take_dirty(self) -> Tuple[Dict[str, Any], Set[Path]]:
+        files = set(self._dirty_files)
+        self._dirty_files.clear()
+        return self.data, files
+
+    def _restore_dirty(self, files: Set[Path]) -> None:
+        self._dirty_files |= files
+
+    def _check_writable(self) -> None:
+        if not self._writable:
+            raise ValueError(f"Cannot save {self.root}: it is not a directory")
 
     def save(self) -> None:
-        if not self._dirty_files:
+        self._check_writable()
+        data, files = self._take_dirty()
+        if not files:
             log.info("No dirty files to save.")
             return
-        save_data_cascade(
-            self.root, self.data, self.cmap, target_files=self._dirty_files
+        try:
+            save_data_cascade(
+                self.root,
+                data,
+                self.cmap,
+                target_files=files,
+                value_at=self._save_values(data),
+            )
+        except Exception:
+            self._restore_dirty(files)
+            raise
+
+    async def save_async(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Async ``save``.
+
+        Do not mutate the cascade until it finishes unless it is a
+        :class:`ConcurrentCascade`, whose snapshots are immutable.
+        """
+        self._check_writable()
+        data, files = self._take_dirty()
+        if not files:
+            log.info("No dirty files to save.")
+            return
+        try:
+            await save_data_cascade_async(
+                self.root,
+                data,
+                self.cmap,
+                target_files=files,
+                max_concurrency=max_concurrency,
+                executor=executor,
+                value_at=self._save_values(data),
+            )
+        except Exception:
+            self._restore_dirty(files)
+            raise
+
+
+class ConcurrentCascade(Cascade):
+    """Cascade that can be shared between threads.
+
+    Writers are serialized and never modify published containers: every write
+    path-copies the containers it touches and then swaps ``data`` to the new
+    root. Readers therefore take no lock; ``get``/``query``/``snapshot`` see a
+    consistent, immutable tree. ``save`` writes a snapshot taken at its start
+    while reads and further writes continue.
+    """
+
+    _copy_on_write = True
+
+    def __init__(self, root: Path, data: dict, cmap: CascadeMap, **kwargs: Any):
+        super().__init__(root, data, cmap, **kwargs)
+        self._write_lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current data root; it is never modified afterwards."""
+        return self.data
+
+    def _write(self, pairs: List[Tuple[KeyPath, Any]]) -> None:
+        with self._write_lock:
+            super()._write(pairs)
+
+    def _replace_state(self, data: Dict[str, Any], cmap: CascadeMap) -> _OldState:
+        with self._write_lock:
+            return super()._replace_state(data, cmap)
+
+    def frozen(self) -> Any:
+        with self._write_lock:
+            return super().frozen()
+
+    def _take_dirty(self) -> Tuple[Dict[str, Any], Set[Path]]:
+        with self._write_lock:
+            return super()._take_dirty()
+
+    def _restore_dirty(self, files: Set[Path]) -> None:
+        with self._write_lock:
+            super()._restore_dirty(files)
+
+    def save(self) -> None:
+        with self._save_lock:
+            super().save()
+
+    async def save_async(self, **kwargs: Any) -> None:
+        # the lock is shared with threads calling ``save``, so a contended
+        # acquire waits in the executor; if this task is cancelled meanwhile
+        # the lock is released as soon as that acquire returns
+        if not self._save_lock.acquire(blocking=False):
+            loop = asyncio.get_running_loop()
+            acquire = loop.run_in_executor(
+                kwargs.get("executor"), self._save_lock.acquire
+            )
+            try:
+                await asyncio.shield(acquire)
+            except asyncio.CancelledError:
+                acquire.add_done_callback(lambda _: self._save_lock.release())
+                raise
+        try:
+            await super().save_async(**kwargs)
+        finally:
+            self._save_lock.release()
+
+
+class OverlayCascade(Cascade):
+    """Cascade over several roots merged as ordered layers.
+
+    See :func:`~data_cascade.overlay.load_overlay`. The layers may be shared
+    with other overlays, so writes copy the containers along their path. A
+    written key is saved to the top-most root that defines it (a new key to
+    the root owning its nearest ancestor, else the last root). Saved files
+    keep their own content for every key path that was not written, so
+    values merged in from other roots are not copied into them.
+    """
+
+    _copy_on_write = True
+
+    def __init__(
+        self,
+        roots: Sequence[Path | str],
+        data: dict,
+        cmap: CascadeMap,
+        *,
+        layers: Sequence[Layer],
+        **kwargs: Any,
+    ):
+        self.roots = [Path(r) for r in roots]
+        super().__init__(self.roots[-1], data, cmap, **kwargs)
+        self._set_layers(layers)
+
+    def _set_layers(self, layers: Sequence[Layer]) -> None:
+        file_layer: Dict[Path, int] = {}
+        for i, layer in enumerate(layers):
+            file_layer.update(dict.fromkeys(layer.cmap.fingerprints, i))
+            file_layer.update(dict.fromkeys(layer.cmap.forward, i))
+        self.layers = list(layers)
+        self._file_layer = file_layer
+
+    def _layer_of(self, file: Path) -> int:
+        # files not loaded from any root are new files of the last root
+        return self._file_layer.get(file, len(self.layers) - 1)
+
+    def _owning_files(self, origins: List[KeyOrigin]) -> Iterable[Path]:
+        # origins are listed top-most root first
+        top = self._layer_of(origins[0].file)
+        return (o.file for o in origins if self._layer_of(o.file) == top)
+
+    def _save_values(self, data: Dict[str, Any]) -> Optional[ValueAt]:
+        reverse, layers = self.cmap.reverse, self.layers
+        written = set(self._written)
+
+        def value_at(file: Path, kp: KeyPath, default: Any) -> Any:
+            # written values go to the top-most root defining the key path;
+            # everything else keeps the value the file's own root loaded.
+            # Unwritten paths no file owns (e.g. the tail of a list extended
+            # by another root) are not saved anywhere.
+            i = self._layer_of(file)
+            origins = reverse.get(kp)
+            is_written = any(kp[:n] in written for n in range(len(kp) + 1))
+            if origins is None:
+                source = data if is_written else None
+            elif is_written and self._layer_of(origins[0].file) == i:
+                source = data
+            else:
+                source = layers[i].data
+            value = default if source is None else _get_at(source, kp, missing=default)
+            # the saver fills in what it is given; layers are shared
+            return value if value is default else copy.deepcopy(value)
+
+        return value_at
+
+    def _watch_roots(self) -> List[Path]:
+        return list(self.roots)
+
+    def _reload_files(self, files: Set[Path], **options: Any) -> ChangeSet:
+        # the layer cache parses only the roots holding changed files
+        options.pop("loader", None)
+        options.pop("dir_cache", None)
+        data, cmap, layers = load_overlay(
+            self.roots, **{**self.load_options, **options}
         )
-        self._dirty_files.clear()
+        self._set_layers(layers)
+        return self._reload(data, cmap, files=files)
+
+    def _preload(self, **options: Any) -> None:
+        pass
+
+    def refresh(self) -> ChangeSet:
+        data, cmap, layers = load_overlay(self.roots, **self.load_options)
+        self._set_layers(layers)
+        return self._reload(data, cmap)
+
+    async def refresh_async(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> ChangeSet:
+        data, cmap, layers = await load_overlay_async(
+            self.roots,
+            max_concurrency=max_concurrency,
+            executor=executor,
+            **self.load_options,
+        )
+        self._set_layers(layers)
+        return self._reload(data, cmap)
+
+
+class ConcurrentOverlayCascade(ConcurrentCascade, OverlayCascade):
+    """:class:`OverlayCascade` that can be shared between threads."""
+
+
+def make_cascade(
+    root: Path | str | Sequence[Path | str],
+    *,
+    cache_reads: bool = False,
+    thread_safe: bool = False,
+    stats: Optional[LoadStats] = None,
+    store: Optional[Path | str] = None,
+    shared: bool | Path | str = False,
+    **load_options: Any,
+) -> Cascade:
+    """Load ``root`` into a :class:`Cascade`.
+
+    Extra keyword arguments (``lazy``, ``allowed_exts``, ...) are passed to
+    :func:`load_data_cascade`. ``stats`` instruments this initial load only,
+    not later refreshes.
+
+    With ``store`` (a SQLite file path) a
+    :class:`~data_cascade.store.SqliteCascade` is opened on the store there,
+    which is compiled from ``root`` first when missing or out of date.
+
+    With ``shared`` a read-only :class:`~data_cascade.shared.SharedCascade` is
+    returned, packed into an anonymous shared mapping (``True``) or a file (a
+    path) for worker processes; see :func:`~data_cascade.shared.share_cascade`.
+
+    A list of roots loads an :class:`OverlayCascade` instead; the extra
+    keyword arguments then go to :func:`~data_cascade.overlay.load_overlay`.
+    ``store`` and ``shared`` take a single root and exclude each other.
+    """
+    if store is not None and shared is not False:
+        raise ValueError("store cannot be combined with shared")
+    if isinstance(root, (list, tuple)):
+        if store is not None or shared is not False:
+            raise ValueError("store and shared take a single root")
+        data, cmap, layers = load_overlay(root, stats=stats, **load_options)
+        overlay_cls = ConcurrentOverlayCascade if thread_safe else OverlayCascade
+        return overlay_cls(
+            root,
+            data,
+            cmap,
+            layers=layers,
+            cache_reads=cache_reads,
+            load_options=load_options,
+        )
+    if store is not None:
+        from .store import ConcurrentSqliteCascade, SqliteCascade, open_store
+
+        opened = open_store(root, store, stats=stats, **load_options)
+        store_cls = ConcurrentSqliteCascade if thread_safe else SqliteCascade
+        return store_cls(opened, cache_reads=cache_reads, load_options=load_options)
+    if shared is not False:
+        from .shared import SharedCascade, share_cascade
+
+        buffer = share_cascade(
+            root, None if shared is True else shared, stats=stats, **load_options
+        )
+        return SharedCascade(buffer, cache_reads=cache_reads, load_options=load_options)
+    data, cmap = load_data_cascade(root, stats=stats, **load_options)
+    cls = ConcurrentCascade if thread_safe else Cascade
+    return cls(
+        Path(root), data, cmap, cache_reads=cache_reads, load_options=load_options
+    )
 
 
-def make_cascade(root: Path | str) -> Cascade:
-    data, cmap = load_data_cascade(root)
-    return Cascade(Path(root), data, cmap)
+async def make_cascade_async(
+    root: Path | str,
+    *,
+    cache_reads: bool = False,
+    thread_safe: bool = False,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    **load_options: Any,
+) -> Cascade:
+    data, cmap = await load_data_cascade_async(
+        root, max_concurrency=max_concurrency, executor=executor, **load_options
+    )
+    cls = ConcurrentCascade if thread_safe else Cascade
+    return cls(
+        Path(root), data, cmap, cache_reads=cache_reads, load_options=load_options
+    )
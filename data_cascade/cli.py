@@ -0,0 +1,139 @@
+"""Command line entry point: ``data-cascade <command> ...``."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+from typing import List, Optional
+
+from .config import SUPPORTED_EXTS_DEFAULT
+from .loader import load_data_cascade
+from .logging_utils import TRACE, enable_trace
+from .stats import PHASES, LoadStats
+
+
+def _cmd_profile(args: argparse.Namespace) -> int:
+    stats = LoadStats()
+    load_data_cascade(
+        args.root,
+        allowed_exts=tuple(args.ext) if args.ext else SUPPORTED_EXTS_DEFAULT,
+        include=args.include,
+        exclude=args.exclude,
+        stats=stats,
+        compact=args.compact,
+    )
+    if args.phase:
+        for t in stats.slowest(args.top, phase=args.phase):
+            print(f"{t.seconds:>9.4f}s {t.bytes:>10}B {t.nodes:>7}  {t.path}")
+    else:
+        print(stats.report(args.top))
+    return 0
+
+
+def _cmd_compile(args: argparse.Namespace) -> int:
+    from .store import compile_store
+
+    compile_store(
+        args.root,
+        args.store,
+        allowed_exts=tuple(args.ext) if args.ext else SUPPORTED_EXTS_DEFAULT,
+        include=args.include,
+        exclude=args.exclude,
+    ).close()
+    return 0
+
+
+def _interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from .server import serve
+
+    # stop cleanly (removing the socket) when a service manager terminates us
+    signal.signal(signal.SIGTERM, _interrupt)
+    serve(
+        args.root,
+        args.socket,
+        watch=not args.no_watch,
+        allowed_exts=tuple(args.ext) if args.ext else SUPPORTED_EXTS_DEFAULT,
+        include=args.include,
+        exclude=args.exclude,
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="data-cascade")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log at INFO")
+    parser.add_argument(
+        "--trace",
+        type=float,
+        metavar="RATE",
+        help="log a RATE fraction (0-1] of per-file and per-merge trace points",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    profile = commands.add_parser(
+        "profile", help="load a cascade and report where the time went"
+    )
+    profile.add_argument("root", help="cascade root directory")
+    profile.add_argument(
+        "--top", type=int, default=10, help="number of entries to list"
+    )
+    profile.add_argument(
+        "--phase", choices=PHASES, help="list the slowest timings of one phase"
+    )
+    profile.add_argument(
+        "--ext", action="append", help="allowed file extension (repeatable)"
+    )
+    profile.add_argument("--include", action="append", help="key path to load")
+    profile.add_argument("--exclude", action="append", help="key path to skip")
+    profile.add_argument(
+        "--compact", action="store_true", help="compact and report memory saved"
+    )
+    profile.set_defaults(func=_cmd_profile)
+
+    compile_ = commands.add_parser(
+        "compile", help="compile a cascade into a SQLite store"
+    )
+    compile_.add_argument("root", help="cascade root directory")
+    compile_.add_argument("store", help="SQLite file to write")
+    compile_.add_argument(
+        "--ext", action="append", help="allowed file extension (repeatable)"
+    )
+    compile_.add_argument("--include", action="append", help="key path to load")
+    compile_.add_argument("--exclude", action="append", help="key path to skip")
+    compile_.set_defaults(func=_cmd_compile)
+
+    serve = commands.add_parser(
+        "serve", help="serve a cascade to local clients over a Unix socket"
+    )
+    serve.add_argument("root", help="cascade root directory")
+    serve.add_argument("--socket", required=True, help="Unix socket path")
+    serve.add_argument(
+        "--no-watch", action="store_true", help="do not reload on file changes"
+    )
+    serve.add_argument(
+        "--ext", action="append", help="allowed file extension (repeatable)"
+    )
+    serve.add_argument("--include", action="append", help="key path to load")
+    serve.add_argument("--exclude", action="append", help="key path to skip")
+    serve.set_defaults(func=_cmd_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        logging.basicConfig(level=TRACE)
+        enable_trace(args.trace)
+    elif args.verbose:
+        logging.basicConfig(level=logging.INFO)
+    return args.func(args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
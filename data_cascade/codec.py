@@ -0,0 +1,35 @@
+"""Compact binary encoding of parsed file content.
+
+``marshal`` is used when the value consists of builtin types only (the common
+case for JSON/YAML/TOML content) as it is several times faster than
+``pickle``; anything else (e.g. ``datetime`` values from YAML or TOML) falls
+back to ``pickle``. The first byte tags the format.
+"""
+
+from __future__ import annotations
+
+import marshal
+import pickle
+from typing import Any
+
+_MARSHAL = b"M"
+_PICKLE = b"P"
+
+
+def encode(obj: Any) -> bytes:
+    try:
+        return _MARSHAL + marshal.dumps(obj)
+    except ValueError:
+        return _PICKLE + pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode(buf: bytes | memoryview) -> Any:
+    tag = bytes(buf[:1])
+    if tag == _MARSHAL:
+        return marshal.loads(buf[1:])
+    if tag == _PICKLE:
+        return pickle.loads(buf[1:])
+    raise ValueError(f"Unknown encoding tag: {tag!r}")
+
+
+__all__ = ["encode", "decode"]
@@ -0,0 +1,152 @@
+"""Load-time compaction: interned keys, shared leaves and key paths.
+
+Large cascades repeat the same field names across many records, and every
+origin key path is a fresh tuple of fresh strings. :func:`compact` rebuilds
+the merged data and its :class:`CascadeMap` so that equal strings, numbers,
+key paths and origins are single shared objects, and containers are sized
+exactly.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
+
+from .deferred import DeferredDict
+from .logging_utils import get_logger
+from .mapping import CascadeMap, KeyOrigin, KeyPath
+
+log = get_logger(__name__)
+
+
+@dataclass
+class CompactReport:
+    bytes_before: int
+    bytes_after: int
+    # str objects replaced by an equal one that was already in use
+    strings_shared: int
+    # int/float/bytes objects replaced likewise
+    values_shared: int
+
+    @property
+    def saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def deep_size(*roots: Any) -> int:
+    """Approximate bytes held by ``roots``, counting shared objects once.
+
+    Unloaded lazy subtrees are not loaded (and not counted).
+    """
+    seen: Set[int] = set()
+    total = 0
+    stack: List[Any] = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, DeferredDict):
+            if obj._loaded:
+                stack.extend(dict.keys(obj))
+                stack.extend(dict.values(obj))
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, KeyOrigin):
+            stack.append(obj.__dict__)
+        elif isinstance(obj, CascadeMap):
+            stack.extend((obj.forward, obj.reverse, obj.fingerprints))
+    return total
+
+
+class _Compactor:
+    def __init__(self) -> None:
+        self.values: Dict[Tuple[type, Any], Any] = {}
+        self.paths: Dict[KeyPath, KeyPath] = {}
+        self.origins: Dict[KeyOrigin, KeyOrigin] = {}
+        self.strings_shared = 0
+        self.values_shared = 0
+
+    def leaf(self, v: Any) -> Any:
+        t = type(v)
+        if t is str:
+            s = sys.intern(v)
+            if s is not v:
+                self.strings_shared += 1
+            return s
+        if t is int or t is float or t is bytes:
+            # 0.0 == -0.0, so keep the sign in the key
+            key = (t, v) if t is not float or v else (t, v, math.copysign(1, v))
+            hit = self.values.setdefault(key, v)
+            if hit is not v:
+                self.values_shared += 1
+            return hit
+        return v
+
+    def tree(self, obj: Any) -> Any:
+        # only plain containers are rebuilt; subclasses (lazy placeholders,
+        # round-trip YAML nodes, ...) keep their identity
+        t = type(obj)
+        if t is dict:
+            return {self.leaf(k): self.tree(v) for k, v in obj.items()}
+        if t is list:
+            return [self.tree(v) for v in obj]
+        return self.leaf(obj)
+
+    def path(self, kp: KeyPath) -> KeyPath:
+        hit = self.paths.get(kp)
+        if hit is None:
+            hit = tuple(self.leaf(seg) for seg in kp)
+            self.paths[hit] = hit
+        return hit
+
+    def origin(self, o: KeyOrigin) -> KeyOrigin:
+        hit = self.origins.get(o)
+        if hit is None:
+            hit = KeyOrigin(file=o.file, local_path=self.path(o.local_path))
+            self.origins[hit] = hit
+        return hit
+
+    def cmap(self, cmap: CascadeMap) -> CascadeMap:
+        out = CascadeMap(fingerprints=dict(cmap.fingerprints))
+        for kp, origins in cmap.reverse.items():
+            kp2 = self.path(kp)
+            out.reverse[kp2] = [self.origin(o) for o in origins]
+        for file, kps in cmap.forward.items():
+            out.forward[file] = {self.path(kp) for kp in kps}
+        out.configs = {self.path(kp): dc for kp, dc in cmap.configs.items()}
+        return out
+
+
+def compact(
+    data: Dict[str, Any], cmap: CascadeMap, *, measure: bool = True
+) -> Tuple[Dict[str, Any], CascadeMap, CompactReport]:
+    """Return compacted copies of ``data`` and ``cmap`` plus a report.
+
+    With ``measure=False`` the before/after sizes (which need a walk over both
+    trees) are reported as 0.
+    """
+    before = deep_size(data, cmap) if measure else 0
+    c = _Compactor()
+    data2 = c.tree(data)
+    cmap2 = c.cmap(cmap)
+    after = deep_size(data2, cmap2) if measure else 0
+    report = CompactReport(before, after, c.strings_shared, c.values_shared)
+    if measure:
+        log.info(
+            "Compaction saved %d of %d bytes (%d strings, %d values shared)",
+            report.saved,
+            before,
+            c.strings_shared,
+            c.values_shared,
+        )
+    return data2, cmap2, report
+
+
+__all__ = ["compact", "deep_size", "CompactReport"]
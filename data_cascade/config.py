@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Final
 
 SUPPORTED_EXTS_DEFAULT: Final[tuple[str, ...]] = (".yaml", ".yml", ".json", ".toml")
+# compression suffixes that may follow a format extension ("data.json.gz")
+COMPRESSED_EXTS: Final[tuple[str, ...]] = (".gz", ".bz2", ".xz")
 MAIN_STEM: Final[str] = "__main__"
 CONFIG_STEM: Final[str] = "__config__"
 MAGIC_PREFIX: Final[str] = "__"
@@ -19,6 +22,39 @@ def is_magic_name(name: str) -> bool:
     return name.startswith(MAGIC_PREFIX) and name.endswith(MAGIC_SUFFIX)
 
 
+def split_ext(name: str) -> tuple[str, str]:
+    """
+    Split a file name into its stem and lower-cased extension, keeping a
+    compression suffix with the format extension ("a.json.gz" -> "a", ".json.gz").
+    """
+    stem, ext = os.path.splitext(name)
+    ext = ext.lower()
+    if ext in COMPRESSED_EXTS:
+        inner_stem, inner = os.path.splitext(stem)
+        if inner:
+            return inner_stem, inner.lower() + ext
+    return stem, ext
+
+
+def file_stem(path: Path) -> str:
+    """
+    The key a file contributes to its directory: its name without extensions.
+    """
+    return split_ext(path.name)[0]
+
+
+def has_allowed_ext(name: str, allowed_exts: tuple[str, ...]) -> bool:
+    """
+    Check if a file name has an allowed extension; compressed files are allowed
+    with their format extension (".json" allows "a.json.gz").
+    """
+    ext = split_ext(name)[1]
+    if ext in allowed_exts:
+        return True
+    i = ext.find(".", 1)
+    return i > 0 and ext[:i] in allowed_exts
+
+
 def ensure_dir(path: Path) -> None:
     """
     Ensure that the given path is a directory. Raise NotADirectoryError if not.
@@ -0,0 +1,175 @@
+"""dict subclass whose content is produced on first use."""
+
+from __future__ import annotations
+
+import copy
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable
+
+
+class DeferredDict(dict, metaclass=ABCMeta):
+    """A real ``dict`` (so ``isinstance`` checks keep working) that calls
+    ``_materialize`` before its content is first read or written.
+
+    Subclasses implement the abstract ``_materialize``, fill the storage with
+    ``dict.update(self, ...)`` and set ``_loaded``. C code that reads dict
+    storage directly (e.g. ``json.dumps``) sees an unloaded instance as empty;
+    pass such data through :func:`plain` first.
+    """
+
+    __slots__ = ("_loaded",)
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "DeferredDict":
+        # dict.__new__ skips the abstract-method check object.__new__ does
+        if cls.__abstractmethods__:
+            missing = ", ".join(sorted(cls.__abstractmethods__))
+            raise TypeError(
+                f"Can't instantiate abstract class {cls.__name__} without an "
+                f"implementation for {missing}"
+            )
+        return super().__new__(cls)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._loaded = False
+
+    @abstractmethod
+    def _materialize(self) -> None:
+        """Fill the storage and set ``_loaded``."""
+
+    def _ensure(self) -> None:
+        if not self._loaded:
+            self._materialize()
+
+    def _unread(self) -> bool:
+        # nothing has been read from this node yet
+        return not self._loaded
+
+    def _record_origins(self) -> None:
+        # make the origins of everything below this node known to the map it
+        # was loaded with, e.g. before a write replaces the node unread
+        self._ensure()
+        for v in dict.values(self):
+            record_origins(v)
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        self._ensure()
+        if isinstance(other, DeferredDict):
+            other._ensure()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        if not self._loaded:
+            return f"<{type(self).__name__} (not loaded)>"
+        return dict.__repr__(self)
+
+    def copy(self) -> dict:
+        self._ensure()
+        return dict(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        self._ensure()
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        self._ensure()
+        return (dict, (dict(self),))
+
+
+def _deferring(name: str) -> Callable[..., Any]:
+    base = getattr(dict, name)
+
+    def method(self: DeferredDict, *args: Any, **kwargs: Any) -> Any:
+        if not self._loaded:
+            self._materialize()
+        return base(self, *args, **kwargs)
+
+    method.__name__ = name
+    method.__qualname__ = f"DeferredDict.{name}"
+    return method
+
+
+for _name in (
+    "__getitem__",
+    "__setitem__",
+    "__delitem__",
+    "__contains__",
+    "__iter__",
+    "__reversed__",
+    "__len__",
+    "__or__",
+    "__ior__",
+    "get",
+    "keys",
+    "values",
+    "items",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+    "clear",
+):
+    setattr(DeferredDict, _name, _deferring(_name))
+
+
+def is_unloaded(obj: Any) -> bool:
+    return isinstance(obj, DeferredDict) and not obj._loaded
+
+
+def is_unread(obj: Any) -> bool:
+    """Whether ``obj`` is a :class:`DeferredDict` no key was read from (nodes
+    resolving single keys can be read without being loaded)."""
+    return isinstance(obj, DeferredDict) and obj._unread()
+
+
+def record_origins(obj: Any) -> None:
+    """Record the origins of every :class:`DeferredDict` in ``obj`` in the map
+    it was loaded with, so that saves route the keys below them to their
+    files even after the nodes are replaced."""
+    if isinstance(obj, dict):
+        if type(obj) is not dict and isinstance(obj, DeferredDict):
+            obj._record_origins()
+            return
+        for v in obj.values():
+            record_origins(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            record_origins(v)
+
+
+def plain(obj: Any) -> Any:
+    """Return ``obj`` with every :class:`DeferredDict` replaced by a ``dict``.
+
+    Containers are only copied where something below them had to change.
+    """
+    if isinstance(obj, dict):
+        # most nodes are plain dicts; skip the slower ABC isinstance for them
+        deferred = type(obj) is not dict and isinstance(obj, DeferredDict)
+        out = dict(obj) if deferred else None
+        for k, v in obj.items():
+            p = plain(v)
+            if p is not v:
+                if out is None:
+                    out = dict(obj)
+                out[k] = p
+        return obj if out is None else out
+    if isinstance(obj, list):
+        out_list = None
+        for i, v in enumerate(obj):
+            p = plain(v)
+            if p is not v:
+                if out_list is None:
+                    out_list = list(obj)
+                out_list[i] = p
+        return obj if out_list is None else out_list
+    return obj
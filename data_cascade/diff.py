@@ -0,0 +1,203 @@
+"""Key-level differences between two cascade states."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from .config import CONFIG_STEM, MAIN_STEM, file_stem
+from .deferred import is_unread
+from .layered import claim_origins
+from .mapping import CascadeMap, KeyOrigin, KeyPath
+from .pathops.access import _MISSING, get_at
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+
+@dataclass(frozen=True)
+class KeyChange:
+    path: KeyPath
+    kind: str  # ADDED, REMOVED or MODIFIED
+    old: Any
+    new: Any
+    # origins from the new map (the old map for removed keys)
+    origins: Tuple[KeyOrigin, ...]
+
+
+@dataclass
+class ChangeSet:
+    """Changes ordered by key path.
+
+    An added, removed or retyped subtree is reported once at its top rather
+    than once per leaf. Lazy subtrees read on neither side are not compared:
+    an old node would read the files as they are now, so changes below them
+    are not reported (read them before a refresh to have them compared).
+    """
+
+    changes: List[KeyChange] = field(default_factory=list)
+
+    def _of(self, kind: str) -> List[KeyPath]:
+        return [c.path for c in self.changes if c.kind == kind]
+
+    @property
+    def added(self) -> List[KeyPath]:
+        return self._of(ADDED)
+
+    @property
+    def removed(self) -> List[KeyPath]:
+        return self._of(REMOVED)
+
+    @property
+    def modified(self) -> List[KeyPath]:
+        return self._of(MODIFIED)
+
+    @property
+    def paths(self) -> List[KeyPath]:
+        return [c.path for c in self.changes]
+
+    def touches(self, prefix: KeyPath) -> bool:
+        """True if any change is at, above or below ``prefix``."""
+        n = len(prefix)
+        return any(
+            c.path[:n] == prefix or prefix[: len(c.path)] == c.path
+            for c in self.changes
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+
+def _walk(
+    old: Any, new: Any, base: KeyPath, out: List[Tuple[KeyPath, str, Any, Any]]
+) -> None:
+    if old is new or (is_unread(old) and is_unread(new)):
+        # lazy subtrees read on neither side are not loaded to compare them
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        # compared key by key: ``==`` would load lazy subtrees
+        for k, v in old.items():
+            if k not in new:
+                out.append((base + (str(k),), REMOVED, v, None))
+        for k, v in new.items():
+            if k in old:
+                _walk(old[k], v, base + (str(k),), out)
+            else:
+                out.append((base + (str(k),), ADDED, None, v))
+    elif type(old) is type(new) and old == new:
+        return
+    elif isinstance(old, list) and isinstance(new, list):
+        for i in range(max(len(old), len(new))):
+            kp = base + (str(i),)
+            if i >= len(new):
+                out.append((kp, REMOVED, old[i], None))
+            elif i >= len(old):
+                out.append((kp, ADDED, None, new[i]))
+            else:
+                _walk(old[i], new[i], kp, out)
+    else:
+        out.append((base, MODIFIED, old, new))
+
+
+def changed_files(old_map: CascadeMap, new_map: CascadeMap) -> Optional[Set[Path]]:
+    """Files added, removed or modified between two loads.
+
+    Judged by the maps' fingerprints; ``None`` when a fingerprint is missing.
+    """
+    old_fp, new_fp = old_map.fingerprints, new_map.fingerprints
+    files = set(old_map.forward) | set(new_map.forward)
+    if not old_fp or not new_fp or not files <= (old_fp.keys() | new_fp.keys()):
+        return None
+    return {f for f in old_fp.keys() | new_fp.keys() if old_fp.get(f) != new_fp.get(f)}
+
+
+def _merged(cmap: CascadeMap, key_paths: Iterable[KeyPath]) -> bool:
+    # whether any of ``key_paths`` is merged from more than one file
+    reverse = cmap.reverse
+    return any(len(reverse.get(kp, ())) > 1 for kp in key_paths)
+
+
+def _minimal(paths: Iterable[KeyPath]) -> List[KeyPath]:
+    keep: Set[KeyPath] = set()
+    for kp in sorted(set(paths), key=len):
+        if not any(kp[:i] in keep for i in range(len(kp))):
+            keep.add(kp)
+    return sorted(keep)
+
+
+def diff(
+    old: Any,
+    new: Any,
+    old_map: Optional[CascadeMap] = None,
+    new_map: Optional[CascadeMap] = None,
+    *,
+    files: Optional[Iterable[Path]] = None,
+    written: Iterable[KeyPath] = (),
+    full: bool = False,
+) -> ChangeSet:
+    """Compute the key-level changes from ``old`` to ``new`` merged data.
+
+    With both maps the comparison is limited to the key paths owned by
+    changed files (``files``, or those whose fingerprints differ) and the
+    ``written`` key paths (edits made to ``old`` since it was loaded), so
+    subtrees coming only from unchanged files are skipped. A changed
+    ``__config__`` file can affect any merge below it, and a ``__main__``
+    file or a key path merged from several files can shift the parts of
+    unchanged files (e.g. extended lists, whose ``__main__`` items are not
+    in the maps); these fall back to a full comparison, as does ``full``.
+    """
+    raw: List[Tuple[KeyPath, str, Any, Any]] = []
+    changed = None
+    if old_map is not None and new_map is not None and not full:
+        if files is not None:
+            changed = set(files)
+        else:
+            changed = changed_files(old_map, new_map)
+        if changed is not None:
+            # layered loads record origins as keys are read
+            claim_origins(old, changed)
+            claim_origins(new, changed)
+    roots: Set[KeyPath] = set()
+    if changed is not None:
+        for f in changed:
+            roots |= old_map.forward.get(f, set())  # type: ignore[union-attr]
+            roots |= new_map.forward.get(f, set())  # type: ignore[union-attr]
+    if (
+        changed is None
+        or any(file_stem(Path(f)) in (CONFIG_STEM, MAIN_STEM) for f in changed)
+        or _merged(old_map, roots)  # type: ignore[arg-type]
+        or _merged(new_map, roots)  # type: ignore[arg-type]
+    ):
+        _walk(old, new, (), raw)
+    else:
+        roots.update(written)
+        for kp in _minimal(roots):
+            a = get_at(old, kp, missing=_MISSING)
+            b = get_at(new, kp, missing=_MISSING)
+            if a is _MISSING and b is _MISSING:
+                continue
+            if a is _MISSING:
+                raw.append((kp, ADDED, None, b))
+            elif b is _MISSING:
+                raw.append((kp, REMOVED, a, None))
+            else:
+                _walk(a, b, kp, raw)
+
+    def origins_for(kp: KeyPath, kind: str) -> Tuple[KeyOrigin, ...]:
+        cmap = old_map if kind == REMOVED else new_map
+        return tuple(cmap.reverse.get(kp, ())) if cmap is not None else ()
+
+    return ChangeSet(
+        [
+            KeyChange(kp, kind, a, b, origins_for(kp, kind))
+            for kp, kind, a, b in sorted(raw, key=lambda c: c[0])
+        ]
+    )
+
+
+__all__ = ["diff", "changed_files", "ChangeSet", "KeyChange"]
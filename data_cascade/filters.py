@@ -0,0 +1,90 @@
+"""Include/exclude key-path filters for partial loads."""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from .mapping import KeyPath
+from .pathops import parse_path
+
+WILDCARD = "*"
+
+
+def _as_key_paths(
+    paths: Optional[Iterable[str | KeyPath]],
+) -> Optional[List[KeyPath]]:
+    if paths is None:
+        return None
+    return [parse_path(p) if isinstance(p, str) else tuple(p) for p in paths]
+
+
+def _seg_matches(pattern: str, key: str) -> bool:
+    return pattern == WILDCARD or pattern == key
+
+
+class PathFilter:
+    """Selects the part of a cascade to load, relative to one directory node.
+
+    ``include`` limits loading to the given key paths (``None`` means
+    everything) and ``exclude`` removes key paths; a ``*`` segment matches any
+    key. Filtering happens at file and directory granularity: a sibling file
+    or subdirectory is skipped when its key cannot contain an included path or
+    is excluded as a whole, while ``__main__``/``__config__`` files are always
+    loaded and files that are loaded keep all their keys.
+    """
+
+    __slots__ = ("include", "exclude")
+
+    def __init__(
+        self,
+        include: Optional[List[KeyPath]] = None,
+        exclude: Optional[List[KeyPath]] = None,
+    ):
+        self.include = include
+        self.exclude = exclude or []
+
+    @classmethod
+    def build(
+        cls,
+        include: Optional[Iterable[str | KeyPath]] = None,
+        exclude: Optional[Iterable[str | KeyPath]] = None,
+    ) -> Optional["PathFilter"]:
+        """Return a filter, or ``None`` when nothing would be filtered."""
+        inc = _as_key_paths(include)
+        exc = _as_key_paths(exclude) or []
+        if inc is not None and any(not p for p in inc):
+            inc = None
+        if inc is None and not exc:
+            return None
+        return cls(inc, exc)
+
+    def wants(self, key: str) -> bool:
+        """Whether the child ``key`` may hold loaded data."""
+        if any(len(e) == 1 and _seg_matches(e[0], key) for e in self.exclude):
+            return False
+        if self.include is None:
+            return True
+        return any(_seg_matches(i[0], key) for i in self.include)
+
+    def child(self, key: str) -> Optional["PathFilter"]:
+        """The filter relative to the child ``key`` (``None``: load it all)."""
+        inc: Optional[List[KeyPath]] = None
+        if self.include is not None:
+            inc = [i[1:] for i in self.include if _seg_matches(i[0], key)]
+            if any(not i for i in inc):
+                inc = None
+        exc = [e[1:] for e in self.exclude if len(e) > 1 and _seg_matches(e[0], key)]
+        if inc is None and not exc:
+            return None
+        return PathFilter(inc, exc)
+
+    def covers(self, key_path: KeyPath) -> bool:
+        """Whether ``key_path`` lies inside the loaded part of the cascade."""
+        node: Optional[PathFilter] = self
+        for seg in key_path:
+            if node is None:
+                return True
+            if not node.wants(seg):
+                return False
+            node = node.child(seg)
+        return node is None or node.include is None
@@ -0,0 +1,127 @@
+"""Immutable, hashable views of cascade data.
+
+:func:`freeze` turns dicts into :class:`FrozenDict` and lists into tuples;
+scalars are kept as they are. Frozen trees can be shared across threads and
+used as cache keys without copying. :func:`refreeze` builds the frozen form of
+an updated tree while reusing every frozen subtree outside the changed paths.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, Mapping, Set
+
+from .mapping import KeyPath
+from .pathops.access import is_int_segment
+
+
+class FrozenDict(Mapping):
+    """Read-only mapping; hashable when all of its values are."""
+
+    __slots__ = ("_d", "_hash")
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._d: Dict[Any, Any] = dict(*args, **kwargs)
+        self._hash: int | None = None
+
+    @classmethod
+    def _wrap(cls, d: Dict[Any, Any]) -> "FrozenDict":
+        # take ownership of ``d`` without copying
+        out = cls.__new__(cls)
+        out._d = d
+        out._hash = None
+        return out
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._d[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._d)
+
+    def __len__(self) -> int:
+        return len(self._d)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._d
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._d.get(key, default)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenDict):
+            return self._d == other._d
+        if isinstance(other, Mapping):
+            return self._d == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._d.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({self._d!r})"
+
+    def __reduce__(self) -> Any:
+        return (FrozenDict, (self._d,))
+
+
+def freeze(obj: Any) -> Any:
+    """Return an immutable copy of ``obj`` (already frozen parts are reused)."""
+    if isinstance(obj, dict):
+        return FrozenDict._wrap({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    if isinstance(obj, tuple) and not isinstance(obj, FrozenDict):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Return a mutable deep copy of a frozen tree."""
+    if isinstance(obj, Mapping):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+def refreeze(old: Any, new: Any, changed: Iterable[KeyPath]) -> Any:
+    """Freeze ``new``, reusing subtrees of ``old`` (the frozen previous state)
+    that lie outside the ``changed`` key paths."""
+    return _refreeze(old, new, set(changed))
+
+
+def _refreeze(old: Any, new: Any, changed: Set[KeyPath]) -> Any:
+    if () in changed:
+        return freeze(new)
+    groups: Dict[str, Set[KeyPath]] = defaultdict(set)
+    for kp in changed:
+        groups[kp[0]].add(kp[1:])
+    if isinstance(old, FrozenDict) and isinstance(new, dict):
+        d = dict(old._d)
+        for seg, sub in groups.items():
+            if seg not in new:
+                d.pop(seg, None)
+            elif seg in d:
+                d[seg] = _refreeze(d[seg], new[seg], sub)
+            else:
+                d[seg] = freeze(new[seg])
+        if len(d) != len(new):
+            return freeze(new)
+        return FrozenDict._wrap(d)
+    if (
+        isinstance(old, tuple)
+        and isinstance(new, list)
+        and len(old) == len(new)
+        and all(is_int_segment(seg) and 0 <= int(seg) < len(new) for seg in groups)
+    ):
+        items = list(old)
+        for seg, sub in groups.items():
+            i = int(seg)
+            items[i] = _refreeze(items[i], new[i], sub)
+        return tuple(items)
+    return freeze(new)
+
+
+__all__ = ["FrozenDict", "freeze", "thaw", "refreeze"]
@@ -1,10 +1,30 @@
-"""Filesystem helpers using pathlib."""
+"""Filesystem helpers using pathlib, and the file systems loads read from."""
 
 from __future__ import annotations
 
+import logging
+import os
+import posixpath
+import tarfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from datetime import datetime
+from io import BytesIO
 from pathlib import Path
-from typing import Iterable
+from typing import (
+    BinaryIO,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
+from .config import has_allowed_ext
 from .logging_utils import get_logger
 
 log = get_logger(__name__)
@@ -15,15 +35,278 @@ def list_files(directory: Path, allowed_exts: tuple[str, ...]) -> Iterable[Path]
         (
             p
             for p in directory.iterdir()
-            if p.is_file() and p.suffix.lower() in allowed_exts
+            if p.is_file() and has_allowed_ext(p.name, allowed_exts)
         ),
         key=lambda p: p.name,
     )
-    log.debug("Found %d files in %s", len(files), directory)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Found %d files in %s", len(files), directory)
     return files
 
 
 def list_dirs(directory: Path) -> Iterable[Path]:
     dirs = sorted((p for p in directory.iterdir() if p.is_dir()), key=lambda p: p.name)
-    log.debug("Found %d subdirectories in %s", len(dirs), directory)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Found %d subdirectories in %s", len(dirs), directory)
     return dirs
+
+
+FileStamp = Tuple[int, int]
+
+
+def file_stamp(path: Path) -> FileStamp:
+    """Return ``(mtime_ns, size)`` used to detect file changes."""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def scan_files(
+    directory: Path, allowed_exts: tuple[str, ...], *, recursive: bool = True
+) -> Dict[Path, FileStamp]:
+    """Map every loadable file below ``directory`` to its stamp.
+
+    Uses ``os.scandir`` so that the stat information comes with the listing.
+    """
+    out: Dict[Path, FileStamp] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except (FileNotFoundError, NotADirectoryError):
+        return out
+    for entry in entries:
+        try:
+            if entry.is_file():
+                if has_allowed_ext(entry.name, allowed_exts):
+                    st = entry.stat()
+                    out[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+            elif recursive and entry.is_dir():
+                out.update(scan_files(Path(entry.path), allowed_exts))
+        except FileNotFoundError:
+            continue
+    return out
+
+
+def root_stamps(root: Path, allowed_exts: tuple[str, ...]) -> Dict[Path, FileStamp]:
+    """Stamps that change whenever anything loadable below ``root`` changes.
+
+    An archive root is stamped as a whole.
+    """
+    if root.is_file():
+        return {root: file_stamp(root)}
+    return scan_files(root, allowed_exts)
+
+
+class FileSystem(ABC):
+    """A directory tree the loader reads from: list, stat and open files.
+
+    Paths are :class:`~pathlib.Path` objects in the file system's namespace;
+    :data:`local_fs` is the real file system. Backends are read-only.
+    ``cache_key`` identifies the content served when other instances may
+    serve the same (an archive's real path and stamp), for caches shared
+    between loads; ``None`` when only this instance does.
+    """
+
+    cache_key: Optional[Hashable] = None
+
+    @abstractmethod
+    def list_files(self, directory: Path, allowed_exts: tuple[str, ...]) -> List[Path]:
+        """The files in ``directory`` with an allowed extension, by name."""
+
+    @abstractmethod
+    def list_dirs(self, directory: Path) -> List[Path]:
+        """The subdirectories of ``directory``, by name."""
+
+    @abstractmethod
+    def is_dir(self, path: Path) -> bool:
+        """Whether ``path`` is a directory."""
+
+    @abstractmethod
+    def stat(self, path: Path) -> FileStamp:
+        """The ``(mtime_ns, size)`` stamp of the file ``path``."""
+
+    @abstractmethod
+    def open(self, path: Path) -> BinaryIO:
+        """Open ``path`` for reading bytes."""
+
+    def close(self) -> None:
+        pass
+
+
+class LocalFS(FileSystem):
+    def list_files(self, directory: Path, allowed_exts: tuple[str, ...]) -> List[Path]:
+        return list(list_files(directory, allowed_exts))
+
+    def list_dirs(self, directory: Path) -> List[Path]:
+        return list(list_dirs(directory))
+
+    def is_dir(self, path: Path) -> bool:
+        return path.is_dir()
+
+    def stat(self, path: Path) -> FileStamp:
+        return file_stamp(path)
+
+    def open(self, path: Path) -> BinaryIO:
+        return path.open("rb")
+
+
+local_fs = LocalFS()
+
+
+class _IndexedFS(FileSystem):
+    """A tree indexed up front from its member names, rooted at ``root``.
+
+    Member names are ``/``-separated paths relative to ``root``; directories
+    are implied by the members below them.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+        self._stamps: Dict[str, FileStamp] = {}
+        # directory name ("" for the root) -> (file names, subdirectory names)
+        self._dirs: Dict[str, Tuple[Set[str], Set[str]]] = {"": (set(), set())}
+
+    def _add(self, name: str, stamp: FileStamp) -> None:
+        name = name.strip("/")
+        if not name:
+            return
+        self._stamps[name] = stamp
+        parent, _, base = name.rpartition("/")
+        self._add_dir(parent)[0].add(base)
+
+    def _add_dir(self, name: str) -> Tuple[Set[str], Set[str]]:
+        entry = self._dirs.get(name)
+        if entry is None:
+            entry = self._dirs[name] = (set(), set())
+            parent, _, base = name.rpartition("/")
+            self._add_dir(parent)[1].add(base)
+        return entry
+
+    def _name(self, path: Path) -> str:
+        rel = Path(path).relative_to(self.root)
+        return "" if rel == Path(".") else rel.as_posix()
+
+    def _entry(self, directory: Path) -> Tuple[Set[str], Set[str]]:
+        try:
+            return self._dirs[self._name(directory)]
+        except (KeyError, ValueError):
+            raise NotADirectoryError(f"Not a directory: {directory}") from None
+
+    def list_files(self, directory: Path, allowed_exts: tuple[str, ...]) -> List[Path]:
+        files = self._entry(directory)[0]
+        return [
+            directory / f for f in sorted(files) if has_allowed_ext(f, allowed_exts)
+        ]
+
+    def list_dirs(self, directory: Path) -> List[Path]:
+        return [directory / d for d in sorted(self._entry(directory)[1])]
+
+    def is_dir(self, path: Path) -> bool:
+        try:
+            return self._name(path) in self._dirs
+        except ValueError:
+            return False
+
+    def stat(self, path: Path) -> FileStamp:
+        try:
+            return self._stamps[self._name(path)]
+        except (KeyError, ValueError):
+            raise FileNotFoundError(f"No such file: {path}") from None
+
+    def open(self, path: Path) -> BinaryIO:
+        self.stat(path)
+        return self._open(self._name(path))
+
+    @abstractmethod
+    def _open(self, name: str) -> BinaryIO:
+        """Open the member ``name`` for reading bytes."""
+
+
+def _archive_key(archive: Path) -> Hashable:
+    # stamped before the archive is opened, like loaded files
+    return os.path.realpath(archive), file_stamp(archive)
+
+
+class MemoryFS(_IndexedFS):
+    """Files held in memory: ``{"services/api.yaml": b"port: 80", ...}``.
+
+    Names are relative to ``root`` (the path to load); ``str`` content is
+    encoded as UTF-8.
+    """
+
+    def __init__(self, files: Mapping[str, bytes | str], root: Path | str = "."):
+        super().__init__(root)
+        self._content: Dict[str, bytes] = {}
+        for name, content in files.items():
+            data = content.encode("utf-8") if isinstance(content, str) else content
+            self._add(name, (0, len(data)))
+            self._content[name.strip("/")] = data
+
+    def _open(self, name: str) -> BinaryIO:
+        return BytesIO(self._content[name])
+
+
+class ZipFS(_IndexedFS):
+    """The members of a zip archive, listed from its central directory.
+
+    Paths are rooted at the archive's own path, so ``release.zip/a/b.yaml``
+    is the member ``a/b.yaml``; reads share the archive's one file handle.
+    """
+
+    def __init__(self, archive: Path | str) -> None:
+        super().__init__(archive)
+        self.cache_key = _archive_key(self.root)
+        self._zip = zipfile.ZipFile(archive)
+        for info in self._zip.infolist():
+            if info.is_dir():
+                self._add_dir(info.filename.strip("/"))
+            else:
+                mtime = datetime(*info.date_time).timestamp()
+                self._add(info.filename, (int(mtime * 1e9), info.file_size))
+
+    def _open(self, name: str) -> BinaryIO:
+        return self._zip.open(self._zip.getinfo(name))  # type: ignore[return-value]
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class TarFS(_IndexedFS):
+    """The regular files of a (possibly compressed) tar archive.
+
+    Paths are rooted at the archive's path as for :class:`ZipFS`. Members are
+    read through one handle, one at a time.
+    """
+
+    def __init__(self, archive: Path | str) -> None:
+        super().__init__(archive)
+        self.cache_key = _archive_key(self.root)
+        self._tar = tarfile.open(archive)
+        self._members: Dict[str, tarfile.TarInfo] = {}
+        self._lock = threading.Lock()
+        for member in self._tar.getmembers():
+            name = posixpath.normpath(member.name).strip("/")
+            if name == ".":
+                continue
+            if member.isdir():
+                self._add_dir(name)
+            elif member.isfile():
+                self._add(name, (int(member.mtime * 1e9), member.size))
+                self._members[name] = member
+
+    def _open(self, name: str) -> BinaryIO:
+        with self._lock:
+            f = self._tar.extractfile(self._members[name])
+            assert f is not None
+            with f:
+                return BytesIO(f.read())
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+def open_archive(path: Path) -> Optional[FileSystem]:
+    """Return a :class:`ZipFS` or :class:`TarFS` for an archive at ``path``."""
+    if zipfile.is_zipfile(path):
+        return ZipFS(path)
+    if tarfile.is_tarfile(path):
+        return TarFS(path)
+    return None
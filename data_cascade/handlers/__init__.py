@@ -1,5 +1,11 @@
+from .compressed import CompressedHandler
 from .json import JsonHandler
-from .registry import get_handler_for, known_extensions, register_handler
+from .registry import (
+    get_handler_for,
+    known_extensions,
+    register_compression,
+    register_handler,
+)
 from .toml import TomlHandler
 from .yaml import YamlHandler
 
@@ -7,7 +13,9 @@ __all__ = [
     "TomlHandler",
     "JsonHandler",
     "YamlHandler",
+    "CompressedHandler",
     "register_handler",
+    "register_compression",
     "get_handler_for",
     "known_extensions",
 ]
@@ -0,0 +1,66 @@
+"""gzip, bz2 and xz compressed files of any registered format."""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Sequence
+
+from ..config import split_ext
+from ..logging_utils import get_logger
+from .registry import FileHandler, register_compression
+
+log = get_logger(__name__)
+
+# compression suffix -> ``open(file or file object, mode)``
+OPENERS: dict[str, Callable[..., Any]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+
+class CompressedHandler(FileHandler):
+    """Handler for compressed files such as ``data.json.gz``.
+
+    Content is decompressed (or compressed) as a stream through the format
+    handler's ``load_fp``/``save_fp``.
+    """
+
+    def __init__(self, inner: FileHandler, ext: str) -> None:
+        self.inner = inner
+        self.ext = ext
+        self._open = OPENERS[ext]
+
+    def __repr__(self) -> str:
+        return f"CompressedHandler({self.inner!r}, {self.ext!r})"
+
+    def supported_exts(self) -> Sequence[str]:
+        return tuple(e + self.ext for e in self.inner.supported_exts())
+
+    def can_handle(self, path: Path) -> bool:
+        return split_ext(path.name)[1] in self.supported_exts()
+
+    def load(self, path: Path) -> Any:
+        with self._open(path, "rb") as f:
+            return self.inner.load_fp(f)
+
+    def load_fp(self, fp: BinaryIO) -> Any:
+        with self._open(fp, "rb") as f:
+            return self.inner.load_fp(f)
+
+    def save(self, path: Path, data: Any) -> None:
+        with self._open(path, "wb") as f:
+            self.inner.save_fp(f, data)
+
+    def save_fp(self, fp: BinaryIO, data: Any) -> None:
+        with self._open(fp, "wb") as f:
+            self.inner.save_fp(f, data)
+
+
+for _ext in OPENERS:
+    register_compression(_ext, partial(CompressedHandler, ext=_ext))
+log.debug("Registered compression suffixes %r", list(OPENERS))
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import io
 import json
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, BinaryIO, Sequence
 
 from ..logging_utils import get_logger
 from .registry import FileHandler, register_handler
@@ -25,6 +26,14 @@ class JsonHandler(FileHandler):
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
 
+    def load_fp(self, fp: BinaryIO) -> Any:
+        return json.load(io.TextIOWrapper(fp, encoding="utf-8"))
+
+    def save_fp(self, fp: BinaryIO, data: Any) -> None:
+        text = io.TextIOWrapper(fp, encoding="utf-8")
+        json.dump(data, text, ensure_ascii=False, indent=2)
+        text.detach()
+
     def save(self, path: Path, data: Any) -> None:
         with path.open("w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
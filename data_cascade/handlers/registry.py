@@ -2,8 +2,20 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
 
 from ..logging_utils import get_logger
 
@@ -22,12 +34,21 @@ class FileHandler(Protocol):
     def load(self, path: Path) -> Any:
         """Load data from the given file path."""
 
+    def load_fp(self, fp: BinaryIO) -> Any:
+        """Load data from a binary file object (e.g. an archive member)."""
+
     def save(self, path: Path, data: Any) -> None:
         """Save data to the given file path."""
 
+    def save_fp(self, fp: BinaryIO, data: Any) -> None:
+        """Save data to a binary file object, leaving it open."""
+
 
 _HANDLERS: List[FileHandler] = []
 _EXT_TO_HANDLER: Dict[str, FileHandler] = {}
+# compression suffix -> wraps the handler of the format extension before it
+_COMPRESSION: Dict[str, Callable[[FileHandler], FileHandler]] = {}
+_WRAPPED: Dict[Tuple[str, str], FileHandler] = {}
 
 
 def register_handler(handler: FileHandler) -> None:
@@ -39,14 +60,34 @@ def register_handler(handler: FileHandler) -> None:
         if ext_low in _EXT_TO_HANDLER:
             log.debug("Overriding handler for extension %s with %r", ext_low, handler)
         _EXT_TO_HANDLER[ext_low] = handler
+    _WRAPPED.clear()
     _HANDLERS.append(handler)
     log.debug("Registered handler %r for %r", handler, list(handler.supported_exts()))
 
 
+def register_compression(ext: str, wrap: Callable[[FileHandler], FileHandler]) -> None:
+    """
+    Register a compression suffix (e.g. ".gz"); ``wrap`` builds the handler of
+    "<name>.<format><ext>" files from the handler of the format.
+    """
+    _COMPRESSION[ext.lower()] = wrap
+    _WRAPPED.clear()
+
+
 def get_handler_for(path: Path) -> Optional[FileHandler]:
     """Get a handler for the given file path, if any."""
     ext = path.suffix.lower()
-    return _EXT_TO_HANDLER.get(ext)
+    wrap = _COMPRESSION.get(ext)
+    if wrap is None:
+        return _EXT_TO_HANDLER.get(ext)
+    key = (ext, os.path.splitext(path.stem)[1].lower())
+    handler = _WRAPPED.get(key)
+    if handler is None:
+        inner = _EXT_TO_HANDLER.get(key[1])
+        if inner is None:
+            return None
+        handler = _WRAPPED[key] = wrap(inner)
+    return handler
 
 
 def known_extensions() -> Iterable[str]:
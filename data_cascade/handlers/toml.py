@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, BinaryIO, Sequence
 
 from ..logging_utils import get_logger
 from .registry import FileHandler, register_handler
@@ -56,7 +57,28 @@ class TomlHandler(FileHandler):
                 "No TOML backend available. Install tomli or use Python 3.11+."
             )
         with path.open("rb") as f:
-            return tomllib.load(f)  # type: ignore[name-defined]
+            return self.load_fp(f)
+
+    def load_fp(self, fp: BinaryIO) -> Any:
+        if _TOML_LOAD_BACKEND is None:
+            raise RuntimeError(
+                "No TOML backend available. Install tomli or use Python 3.11+."
+            )
+        return tomllib.load(fp)  # type: ignore[name-defined]
+
+    def save_fp(self, fp: BinaryIO, data: Any) -> None:
+        if _TOML_SAVE_BACKEND is None:
+            raise RuntimeError("No TOML writer available. Install tomli-w or toml.")
+        if _TOML_SAVE_BACKEND == "tomli_w":
+            from tomli_w import dump as tomli_dump  # type: ignore
+
+            tomli_dump(data, fp)
+        else:
+            import toml  # type: ignore
+
+            text = io.TextIOWrapper(fp, encoding="utf-8")
+            toml.dump(data, text)  # type: ignore
+            text.detach()
 
     def save(self, path: Path, data: Any) -> None:
         if _TOML_SAVE_BACKEND is None:
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, BinaryIO, Sequence
 
 from ..logging_utils import get_logger
 from .registry import FileHandler, register_handler
@@ -59,6 +60,32 @@ class YamlHandler(FileHandler):
         with path.open("r", encoding="utf-8") as f:
             return _yaml_loader.safe_load(f)  # type: ignore[attr-defined]
 
+    def load_fp(self, fp: BinaryIO) -> Any:
+        if _YAML_BACKEND is None:
+            raise RuntimeError(
+                "No YAML backend available. Install ruamel.yaml or PyYAML."
+            )
+        text = io.TextIOWrapper(fp, encoding="utf-8")
+        if _YAML_BACKEND == "ruamel":
+            return _yaml_loader.load(text)
+        return _yaml_loader.safe_load(text)  # type: ignore[attr-defined]
+
+    def save_fp(self, fp: BinaryIO, data: Any) -> None:
+        if _YAML_BACKEND is None:
+            raise RuntimeError("No YAML backend available for saving.")
+        text = io.TextIOWrapper(fp, encoding="utf-8")
+        if _YAML_BACKEND == "ruamel":
+            _yaml_dumper.dump(data, text)
+        else:
+            _yaml_dumper.safe_dump(  # type: ignore[attr-defined]
+                data,
+                text,
+                default_flow_style=False,
+                sort_keys=False,
+                allow_unicode=True,
+            )
+        text.detach()
+
     def save(self, path: Path, data: Any) -> None:
         if _YAML_BACKEND is None:
             raise RuntimeError("No YAML backend available for saving.")
@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
+from .fs import FileSystem
 from .handlers.registry import get_handler_for, known_extensions
-from .logging_utils import get_logger
+from .logging_utils import get_logger, tracer
 
 log = get_logger(__name__)
 
 
-def load_file(path: Path) -> Any:
+def load_file(path: Path, fs: Optional[FileSystem] = None) -> Any:
+    """Parse ``path``, read from ``fs`` when given and from disk otherwise."""
     handler = get_handler_for(path)
     if handler is None:
         log.warning(
@@ -20,8 +22,12 @@ def load_file(path: Path) -> Any:
             list(known_extensions()),
         )
         raise ValueError(f"Unsupported file extension: {path.suffix} for {path}")
-    log.debug("Loading file: %s with handler: %r", path, handler)
-    return handler.load(path)
+    if tracer.on:
+        tracer.emit(log, "Loading file: %s with handler: %r", path, handler)
+    if fs is None:
+        return handler.load(path)
+    with fs.open(path) as fp:
+        return handler.load_fp(fp)
 
 
 def save_file(path: Path, data: Any) -> None:
@@ -35,5 +41,21 @@ def save_file(path: Path, data: Any) -> None:
         raise ValueError(
             f"Unsupported file extension for saving: {path.suffix} for {path}"
         )
-    log.debug("Saving file: %s with handler: %r", path, handler)
+    if tracer.on:
+        tracer.emit(log, "Saving file: %s with handler: %r", path, handler)
     handler.save(path, data)
+
+
+class _Prefetched:
+    """Loader serving parse results gathered ahead of the traversal."""
+
+    def __init__(self, results: Dict[Path, Tuple[Any, Optional[BaseException]]]):
+        self._results = results
+
+    def __call__(self, path: Path) -> Any:
+        if path not in self._results:
+            return load_file(path)
+        content, error = self._results.pop(path)
+        if error is not None:
+            raise error
+        return content
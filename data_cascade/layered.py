@@ -0,0 +1,481 @@
+"""Layered cascade nodes: merged lazily, one key at a time.
+
+A :class:`LayeredNode` keeps the parsed content of each file of its directory
+as a layer instead of merging everything up front. Reading a key folds the
+layers that define it according to the node's :class:`MergeStrategy`, in the
+order :func:`~data_cascade.traverse.load_directory_node` merges them, and
+memoizes the result; subdirectories become child nodes. Origins are recorded
+in the context's map as keys are resolved, so the map only covers what has
+been read until :func:`claim_origins` completes it for some files.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .config import CONFIG_STEM, MAIN_STEM, SUPPORTED_EXTS_DEFAULT, file_stem
+from .deferred import DeferredDict
+from .filters import PathFilter
+from .fs import FileSystem, local_fs
+from .io import load_file
+from .logging_utils import get_logger, tracer
+from .mapping import CascadeMap, DirectoryConfig, KeyOrigin, KeyPath, enumerate_paths
+from .merge.merge import deep_merge_dicts, merge_lists, merge_values
+from .merge.strategy import DictMode, MergeStrategy, extract_strategy_from_node
+from .stats import LIST, STRATEGY, LoadStats, measure
+from .traverse import LazyContext, _parse, _read_default_config, _skipped_by_filter
+
+log = get_logger(__name__)
+
+_MISSING = object()
+
+
+class LayeredContext(LazyContext):
+    """Shared state of one layered load.
+
+    ``holders`` maps every parsed file to the node holding it as a layer and
+    the key it is a layer of (``None`` for ``__main__`` files).
+    """
+
+    def __init__(
+        self, stats: Optional[LoadStats] = None, fs: FileSystem = local_fs
+    ) -> None:
+        super().__init__(stats, fs)
+        self.holders: Dict[Path, Tuple["LayeredNode", Optional[str]]] = {}
+
+
+class LayeredNode(DeferredDict):
+    """A directory node whose keys are merged from their layers on first read.
+
+    ``__getitem__``, ``get``, ``__contains__`` and single-key writes resolve
+    only the key involved; anything that needs all keys (iteration, ``len``,
+    comparison, copying) resolves the whole node, one level deep.
+    """
+
+    __slots__ = (
+        "_ctx",
+        "_directory",
+        "_key_path",
+        "_parent",
+        "_strategy",
+        "_final",
+        "_default_config",
+        "_allowed_exts",
+        "_loader",
+        "_path_filter",
+        "_mains",
+        "_siblings",
+        "_children",
+        "_bases",
+        "_order",
+        "_resolved",
+        "_claimed",
+    )
+
+    def __init__(
+        self,
+        ctx: LayeredContext,
+        directory: Path,
+        key_path: KeyPath = (),
+        strategy: Optional[MergeStrategy] = None,
+        default_config: Optional[Mapping[str, Any]] = None,
+        allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+        loader: Callable[[Path], Any] = load_file,
+        path_filter: Optional[PathFilter] = None,
+        parent: Optional["LayeredNode"] = None,
+    ):
+        super().__init__()
+        self._ctx = ctx
+        self._directory = directory
+        self._key_path = key_path
+        self._parent = parent
+        # strategy the files are merged with, and the one after the
+        # ``__main__`` files' own ``__config__`` (set by ``_scan``)
+        self._strategy = strategy or MergeStrategy()
+        self._final: Optional[MergeStrategy] = None
+        self._default_config = default_config
+        self._allowed_exts = allowed_exts
+        self._loader = loader
+        self._path_filter = path_filter
+        self._mains: List[Tuple[Path, Mapping[str, Any]]] = []
+        self._siblings: Dict[str, List[Tuple[Path, Any]]] = {}
+        self._children: Dict[str, LayeredNode] = {}
+        # (content, strategy) merged under this node, innermost first: what
+        # the parent's own files and the parent's bases hold for its key
+        self._bases: List[Tuple[Mapping[str, Any], MergeStrategy]] = []
+        self._order: Optional[Dict[Any, None]] = None
+        # keys settled in storage (or deleted), and keys whose origins are
+        # recorded
+        self._resolved: Set[Any] = set()
+        self._claimed: Set[Any] = set()
+
+    # -- loading -----------------------------------------------------------
+
+    def _scan(self) -> None:
+        ctx, cmap = self._ctx, self._ctx.cmap
+        assert cmap is not None
+        strategy = self._strategy
+        config = self._default_config
+        with measure(ctx.stats, LIST, self._directory):
+            listed = ctx.fs.list_files(self._directory, self._allowed_exts)
+        to_parse: List[Path] = []
+        for file_path in listed:
+            stem = file_stem(file_path)
+            if stem == CONFIG_STEM:
+                config = _read_default_config(
+                    self._loader, file_path, config, cmap, ctx.stats, ctx.fs
+                )
+            elif stem == MAIN_STEM:
+                to_parse.insert(0, file_path)
+            elif not _skipped_by_filter(self._path_filter, stem):
+                to_parse.append(file_path)
+        if isinstance(config, Mapping):
+            with measure(ctx.stats, STRATEGY, self._directory):
+                strategy = extract_strategy_from_node({CONFIG_STEM: config}, strategy)
+
+        for file_path in to_parse:
+            stem = file_stem(file_path)
+            if stem in strategy.excludes:
+                continue
+            try:
+                content = _parse(self._loader, file_path, cmap, ctx.stats, ctx.fs)
+            except Exception as e:
+                log.warning("Skipping file %s due to load error: %s", file_path, e)
+                continue
+            if content is None:
+                content = {}
+            if stem == MAIN_STEM:
+                if not isinstance(content, Mapping):
+                    raise RuntimeError(
+                        f"{file_path} must contain a mapping for {MAIN_STEM}"
+                    )
+                self._mains.append((file_path, content))
+                ctx.holders[file_path] = (self, None)
+            else:
+                self._siblings.setdefault(stem, []).append((file_path, content))
+                ctx.holders[file_path] = (self, stem)
+        self._strategy = strategy
+
+        node_config = (
+            _MISSING if CONFIG_STEM in strategy.excludes else self._own(CONFIG_STEM)
+        )
+        final = extract_strategy_from_node(
+            {} if node_config is _MISSING else {CONFIG_STEM: node_config}, strategy
+        )
+        self._final = final
+
+        with measure(ctx.stats, LIST, self._directory):
+            subdirs = ctx.fs.list_dirs(self._directory)
+        for subdir in subdirs:
+            key = subdir.name
+            if key in (CONFIG_STEM, MAIN_STEM) or key in final.excludes:
+                continue
+            if _skipped_by_filter(self._path_filter, key):
+                continue
+            self._children[key] = LayeredNode(
+                ctx,
+                subdir,
+                self._key_path + (key,),
+                final.for_child(key),
+                config,
+                self._allowed_exts,
+                self._loader,
+                self._path_filter.child(key) if self._path_filter else None,
+                self,
+            )
+        cmap.configs[self._key_path] = DirectoryConfig(config, final)
+
+    def _scan_tree(self) -> None:
+        self._scan()
+        for child in self._children.values():
+            child._scan_tree()
+
+    def _ready(self) -> None:
+        if self._final is None:
+            self._scan()
+
+    # -- resolution --------------------------------------------------------
+
+    def _keys(self) -> Dict[Any, None]:
+        # key order of the fully merged node
+        if self._order is None:
+            final = self._final
+            assert final is not None
+            seen: Dict[Any, None] = {}
+            for _, content in self._mains:
+                seen.update(dict.fromkeys(content))
+            seen.update(dict.fromkeys(self._siblings))
+            seen.update(dict.fromkeys(self._children))
+            keys = [k for k in seen if k not in final.excludes]
+            for base, strategy in self._bases:
+                keys = list(base) + [
+                    k for k in keys if k not in base and k not in strategy.excludes
+                ]
+            self._order = dict.fromkeys(keys)
+        return self._order
+
+    def _own(self, key: Any) -> Any:
+        # the key's value merged from this directory's __main__ files
+        value = _MISSING
+        for _, content in self._mains:
+            if key in content:
+                if value is _MISSING:
+                    value = content[key]
+                else:
+                    value = merge_values(
+                        value, content[key], self._strategy.for_child(key)
+                    )
+        return value
+
+    def _claim(self, key: Any) -> None:
+        # record the origins this directory's files hold below ``key``:
+        # sibling files first, then __main__ files for paths nobody owns yet
+        if key in self._claimed:
+            return
+        self._claimed.add(key)
+        final = self._final
+        assert final is not None and self._ctx.cmap is not None
+        if key in final.excludes:
+            return
+        cmap, base = self._ctx.cmap, self._key_path
+        seg = key if isinstance(key, str) else str(key)
+        owned: Set[KeyPath] = set()
+        for file_path, content in self._siblings.get(key, ()):
+            for rel in enumerate_paths(content):
+                owned.add((seg,) + rel)
+                cmap.add_origin(base + (seg,) + rel, KeyOrigin(file_path, rel))
+        for file_path, content in self._mains:
+            if key not in content:
+                continue
+            for rel in enumerate_paths(content[key], (seg,)):
+                if rel not in owned:
+                    owned.add(rel)
+                    cmap.add_origin(base + rel, KeyOrigin(file_path, rel))
+
+    def _claim_path(self) -> None:
+        # claim the keys leading to this node, top-down, so that origins are
+        # recorded in the order a full load records them
+        chain = []
+        node = self
+        while node._parent is not None:
+            chain.append(node)
+            node = node._parent
+        for n in reversed(chain):
+            assert n._parent is not None
+            n._parent._ready()
+            n._parent._claim(n._key_path[-1])
+
+    def _resolve(self, key: Any) -> Any:
+        if tracer.on:
+            tracer.emit(log, "Resolving key %s of %s", key, self._directory)
+        self._claim(key)
+        strategy, final = self._strategy, self._final
+        assert final is not None
+        value = _MISSING
+        if key not in final.excludes:
+            value = self._own(key)
+            child_strategy = strategy.for_child(key)
+            for file_path, content in self._siblings.get(key, ()):
+                if value is _MISSING:
+                    value = content
+                elif isinstance(value, dict) and isinstance(content, dict):
+                    value = deep_merge_dicts(value, content, child_strategy)
+                elif isinstance(value, list) and isinstance(content, list):
+                    value = merge_lists(value, content, child_strategy.list_strategy)
+                else:
+                    log.warning(
+                        "Type mismatch when merging key %s from file %s; skipping",
+                        key,
+                        file_path,
+                    )
+            child = self._children.get(key)
+            if child is not None:
+                if value is _MISSING:
+                    value = child
+                elif isinstance(value, dict):
+                    child._bases.insert(0, (value, final.for_child(key)))
+                    value = child
+        for base, base_strategy in self._bases:
+            if key in base_strategy.excludes:
+                value = base.get(key, _MISSING)
+            elif key in base:
+                if value is _MISSING:
+                    value = base[key]
+                else:
+                    value = _merge_over(base[key], value, base_strategy.for_child(key))
+        return value
+
+    def _unread(self) -> bool:
+        # directories are scanned before any of their keys is resolved
+        return not self._loaded and self._final is None
+
+    def _record_origins(self) -> None:
+        # claim every key of this node and of the directories below it,
+        # without merging them
+        with self._ctx.lock:
+            if not self._loaded:
+                self._claim_path()
+                self._ready()
+                for key in self._keys():
+                    self._claim(key)
+            children = [
+                *self._children.values(),
+                *(v for v in dict.values(self) if isinstance(v, LayeredNode)),
+            ]
+        for child in children:
+            child._record_origins()
+
+    def _settle(self, key: Any) -> None:
+        # resolve ``key`` into storage once; the caller holds the lock
+        if self._loaded or key in self._resolved:
+            return
+        self._ready()
+        if key in self._keys():
+            value = self._resolve(key)
+            if value is not _MISSING:
+                dict.__setitem__(self, key, value)
+            self._resolved.add(key)
+
+    def _materialize(self) -> None:
+        with self._ctx.lock:
+            if self._loaded:
+                return
+            self._ready()
+            items: Dict[Any, Any] = {}
+            for key in self._keys():
+                if key in self._resolved:
+                    if dict.__contains__(self, key):
+                        items[key] = dict.__getitem__(self, key)
+                    continue
+                value = self._resolve(key)
+                if value is not _MISSING:
+                    items[key] = value
+            # keys written before the node was resolved as a whole
+            for key, value in dict.items(self):
+                items.setdefault(key, value)
+            dict.clear(self)
+            dict.update(self, items)
+            self._loaded = True
+            # every layer is merged into the storage now; keys that were
+            # written unresolved still own origins in the layers
+            for key in self._keys():
+                self._claim(key)
+            self._mains = []
+            self._siblings = {}
+            self._children = {}
+            self._bases = []
+            self._order = None
+            self._resolved = set()
+
+    # -- single-key access ---------------------------------------------------
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._loaded:
+            return dict.__getitem__(self, key)
+        with self._ctx.lock:
+            self._settle(key)
+            return dict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        if self._loaded:
+            return dict.__contains__(self, key)
+        with self._ctx.lock:
+            if self._loaded or key in self._resolved:
+                return dict.__contains__(self, key)
+            self._ready()
+            return key in self._keys()
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._ctx.lock:
+            self._settle(key)
+            self._resolved.add(key)
+            dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._ctx.lock:
+            self._settle(key)
+            dict.__delitem__(self, key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        with self._ctx.lock:
+            self._settle(key)
+            return dict.pop(self, key, *default)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        with self._ctx.lock:
+            self._settle(key)
+            self._resolved.add(key)
+            return dict.setdefault(self, key, default)
+
+
+def _merge_over(base: Any, value: Any, strategy: MergeStrategy) -> Any:
+    # ``merge_values(base, value, strategy)`` that keeps a layered node lazy
+    if isinstance(value, LayeredNode) and isinstance(base, Mapping):
+        if strategy.dict_mode == DictMode.FIRST_WINS:
+            return dict(base)
+        if strategy.dict_mode == DictMode.DEEP:
+            value._bases.append((base, strategy))
+        return value
+    return merge_values(base, value, strategy)
+
+
+def load_layered(
+    root: Path,
+    *,
+    allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+    loader: Callable[[Path], Any] = load_file,
+    lazy: bool = False,
+    path_filter: Optional[PathFilter] = None,
+    stats: Optional[LoadStats] = None,
+    fs: FileSystem = local_fs,
+) -> Tuple[LayeredNode, CascadeMap]:
+    """Parse the files below ``root`` into a :class:`LayeredNode` tree.
+
+    Every file is parsed up front unless ``lazy``, in which case directories
+    are listed and parsed on first access too. The returned map starts with
+    fingerprints and directory configs only.
+    """
+    ctx = LayeredContext(stats, fs)
+    cmap = ctx.cmap = CascadeMap()
+    node = LayeredNode(
+        ctx, root, allowed_exts=allowed_exts, loader=loader, path_filter=path_filter
+    )
+    if lazy:
+        node._scan()
+    else:
+        node._scan_tree()
+    return node, cmap
+
+
+def claim_origins(data: Any, files: Optional[Iterable[Path]] = None) -> None:
+    """Record every origin of ``files`` (all parsed files when ``None``) in
+    the map of layered ``data``; a no-op for other data.
+
+    Savers and diffs call this before they rely on a file's origins.
+    """
+    if not isinstance(data, LayeredNode):
+        return
+    ctx = data._ctx
+    with ctx.lock:
+        if files is None:
+            holders = list(ctx.holders.values())
+        else:
+            holders = [ctx.holders[f] for f in files if f in ctx.holders]
+        for node, key in holders:
+            node._claim_path()
+            if key is not None:
+                node._claim(key)
+            else:
+                for _, content in node._mains:
+                    for k in content:
+                        node._claim(k)
+
+
+__all__ = ["LayeredNode", "load_layered", "claim_origins"]
@@ -2,30 +2,182 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Executor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Optional
 
+from .cache import ParseCache
+from .compact import compact as _compact
 from .config import SUPPORTED_EXTS_DEFAULT, ensure_dir
+from .filters import PathFilter
+from .fs import FileSystem, local_fs, open_archive
 
 # import handlers to register
+from .handlers import compressed  # noqa: F401
 from .handlers import json  # noqa: F401
 from .handlers import toml  # noqa: F401
 from .handlers import yaml  # noqa: F401
+from .io import _Prefetched, load_file
+from .layered import load_layered
 from .logging_utils import get_logger
-from .mapping import CascadeMap
-from .traverse import load_directory_node
+from .mapping import CascadeMap, KeyPath
+from .stats import LoadStats
+from .traverse import DirectoryCache, LazyContext, collect_files, load_directory_node
 
 log = get_logger(__name__)
 
 
+def _archive_of(root: Path) -> Optional[FileSystem]:
+    # the archive ``root`` is, or lies in
+    if root.is_dir():
+        return None
+    for path in (root, *root.parents):
+        if path.is_file():
+            return open_archive(path)
+        if path.exists():
+            break
+    return None
+
+
+def _bind_fs(loader: Callable[[Path], Any], fs: FileSystem) -> Callable[[Path], Any]:
+    # loaders that know how to read through a file system are told which
+    if fs is not local_fs and (loader is load_file or isinstance(loader, ParseCache)):
+        return partial(loader, fs=fs)
+    return loader
+
+
 def load_data_cascade(
     root: Path | str,
     *,
     allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+    lazy: bool = False,
+    loader: Callable[[Path], Any] = load_file,
+    include: Optional[Iterable[str | KeyPath]] = None,
+    exclude: Optional[Iterable[str | KeyPath]] = None,
+    stats: Optional[LoadStats] = None,
+    processes: int | Executor | None = None,
+    compact: bool = False,
+    layered: bool = False,
+    fs: Optional[FileSystem] = None,
+    dir_cache: Optional[DirectoryCache] = None,
 ) -> tuple[Dict[str, Any], CascadeMap]:
+    """Load the cascade below ``root`` into merged data and its origin map.
+
+    With ``lazy=True`` subdirectories are loaded (and their origins added to
+    the returned map) only when their node is first accessed. ``loader`` reads
+    and parses a single file. ``include``/``exclude`` key paths restrict the
+    load to part of the tree (see :class:`~data_cascade.filters.PathFilter`).
+    A :class:`~data_cascade.stats.LoadStats` passed as ``stats`` collects
+    per-file and per-phase timings.
+
+    With ``processes`` (a worker count, or a process pool to reuse) files are
+    parsed up front in worker processes while merging stays in this process;
+    it cannot be combined with ``lazy`` or a custom ``loader``.
+
+    ``compact=True`` runs :func:`~data_cascade.compact.compact` on the result
+    (subtrees a lazy load defers are not compacted). The memory saved is
+    logged and, with ``stats``, stored as ``stats.compaction``.
+
+    ``layered=True`` returns a :class:`~data_cascade.layered.LayeredNode`:
+    files are parsed but merged only key by key as the data is read, and
+    origins are added to the returned map as keys are resolved. It cannot be
+    combined with ``compact``.
+
+    ``fs`` is the :class:`~data_cascade.fs.FileSystem` to read from, e.g. a
+    :class:`~data_cascade.fs.MemoryFS`. A zip or tar archive as ``root`` is
+    read in place (see :func:`~data_cascade.fs.open_archive`), as is a
+    directory inside one (``release.zip/config``); paths inside it are rooted
+    at the archive's path.
+
+    ``dir_cache`` (a :class:`~data_cascade.traverse.DirectoryCache`) reuses
+    subdirectories merged by earlier loads of the same tree unless they were
+    invalidated; lazy and layered loads ignore it.
+    """
     root_path = Path(root)
-    ensure_dir(root_path)
+    opened = None
+    if fs is None:
+        fs = opened = _archive_of(root_path)
+        if fs is None:
+            fs = local_fs
+    if fs is local_fs:
+        ensure_dir(root_path)
+    elif not fs.is_dir(root_path):
+        raise NotADirectoryError(f"Not a directory: {root_path}")
     log.info("Loading data cascade from %s", root_path)
-    data, cmap = load_directory_node(root_path, allowed_exts=allowed_exts)
+    path_filter = PathFilter.build(include, exclude)
+    if layered and compact:
+        raise ValueError("compact cannot be combined with layered")
+    if processes is not None:
+        if lazy or loader is not load_file:
+            raise ValueError("processes cannot be combined with lazy or loader")
+        if fs is not local_fs:
+            raise ValueError("processes cannot read from an archive or fs")
+        from .parallel import parse_files
+
+        files = collect_files(root_path, allowed_exts, path_filter)
+        loader = _Prefetched(parse_files(files, processes))
+    else:
+        loader = _bind_fs(loader, fs)
+    try:
+        return _load(
+            root_path,
+            allowed_exts,
+            lazy,
+            loader,
+            path_filter,
+            stats,
+            compact,
+            layered,
+            fs,
+            dir_cache,
+        )
+    finally:
+        # lazy nodes keep reading from an archive opened here
+        if opened is not None and not lazy:
+            opened.close()
+
+
+def _load(
+    root_path: Path,
+    allowed_exts: tuple[str, ...],
+    lazy: bool,
+    loader: Callable[[Path], Any],
+    path_filter: Optional[PathFilter],
+    stats: Optional[LoadStats],
+    compact: bool,
+    layered: bool,
+    fs: FileSystem,
+    dir_cache: Optional[DirectoryCache],
+) -> tuple[Dict[str, Any], CascadeMap]:
+    if layered:
+        node, cmap = load_layered(
+            root_path,
+            allowed_exts=allowed_exts,
+            loader=loader,
+            lazy=lazy,
+            path_filter=path_filter,
+            stats=stats,
+            fs=fs,
+        )
+        log.info("Finished scanning layered cascade from %s", root_path)
+        return node, cmap
+    ctx = LazyContext(stats, fs) if lazy else None
+    data, cmap = load_directory_node(
+        root_path,
+        allowed_exts=allowed_exts,
+        loader=loader,
+        lazy=ctx,
+        path_filter=path_filter,
+        stats=stats,
+        fs=fs,
+        dir_cache=dir_cache,
+    )
+    if compact:
+        data, cmap, report = _compact(data, cmap)
+        if stats is not None:
+            stats.compaction = report
+    if ctx is not None:
+        ctx.cmap = cmap
     log.info("Finished loading cascade from %s", root_path)
     return data, cmap
@@ -1,12 +1,80 @@
-"""Logging helpers for consistent logger creation."""
+"""Logging helpers for consistent logger creation.
+
+Per-directory diagnostics are logged at ``DEBUG`` behind ``isEnabledFor``
+guards. Per-file and per-merge diagnostics use the opt-in ``TRACE`` level:
+call sites check the plain attribute ``tracer.on`` before building any
+arguments, so they cost one attribute lookup while tracing is off. Enable it
+with :func:`enable_trace` or the ``DATA_CASCADE_TRACE`` environment variable
+(a sample rate, e.g. ``0.01`` to keep one trace point in a hundred).
+"""
 
 from __future__ import annotations
 
 import logging
+import os
+import random
+from typing import Any, Optional
 
 LOGGER_NAME = "data_cascade"
+TRACE = 5
+
+logging.addLevelName(TRACE, "TRACE")
 
 
 def get_logger(*args, **kwargs) -> logging.Logger:
     logger = logging.getLogger(*args, **kwargs)
     return logger
+
+
+class Tracer:
+    """Switch and sampler for ``TRACE`` level trace points."""
+
+    __slots__ = ("on", "sample_rate", "emitted", "dropped", "_rng")
+
+    def __init__(self) -> None:
+        self.on = False
+        self.sample_rate = 1.0
+        self.emitted = 0
+        self.dropped = 0
+        self._rng = random.Random(0)
+
+    def emit(self, logger: logging.Logger, msg: str, *args: Any) -> None:
+        if self.sample_rate < 1.0 and self._rng.random() >= self.sample_rate:
+            self.dropped += 1
+            return
+        self.emitted += 1
+        logger.log(TRACE, msg, *args)
+
+
+tracer = Tracer()
+
+
+def enable_trace(sample_rate: float = 1.0, *, seed: Optional[int] = None) -> None:
+    """Turn on trace points, keeping a ``sample_rate`` fraction of them.
+
+    Lowers the ``data_cascade`` logger to ``TRACE`` if it is set higher;
+    handlers still need to let ``TRACE`` records through.
+    """
+    if not 0.0 < sample_rate <= 1.0:
+        raise ValueError("sample_rate must be in (0, 1]")
+    tracer.sample_rate = sample_rate
+    tracer.emitted = tracer.dropped = 0
+    tracer._rng = random.Random(seed)
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.getEffectiveLevel() > TRACE:
+        logger.setLevel(TRACE)
+    tracer.on = True
+
+
+def disable_trace() -> None:
+    tracer.on = False
+
+
+_env_rate = os.environ.get("DATA_CASCADE_TRACE")
+if _env_rate:
+    try:
+        enable_trace(float(_env_rate))
+    except ValueError:
+        logging.getLogger(LOGGER_NAME).warning(
+            "Ignoring invalid DATA_CASCADE_TRACE=%r", _env_rate
+        )
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .fs import FileStamp
+from .merge.strategy import MergeStrategy
 
 KeyPath = Tuple[str, ...]
 LocalPath = Tuple[str, ...]
@@ -16,15 +19,78 @@ class KeyOrigin:
     local_path: LocalPath
 
 
+@dataclass(frozen=True)
+class DirectoryConfig:
+    """Effective configuration of one directory node.
+
+    ``config`` is the directory's default config (its ``__config__`` files
+    merged over the inherited one, ``None`` if there is none) and ``strategy``
+    the merge strategy the directory's node was built with.
+    """
+
+    config: Optional[Mapping[str, Any]]
+    strategy: MergeStrategy
+
+
 @dataclass
 class CascadeMap:
     forward: Dict[Path, set[KeyPath]] = field(default_factory=dict)
     reverse: Dict[KeyPath, List[KeyOrigin]] = field(default_factory=dict)
+    # (mtime_ns, size) of every file read while loading, taken before reading
+    fingerprints: Dict[Path, FileStamp] = field(default_factory=dict)
+    # per directory node, kept out of the data and the origin maps
+    configs: Dict[KeyPath, DirectoryConfig] = field(default_factory=dict)
 
     def add_origin(self, key_path: KeyPath, origin: KeyOrigin) -> None:
         self.reverse.setdefault(key_path, []).append(origin)
         self.forward.setdefault(origin.file, set()).add(key_path)
 
+    def merge_in(self, other: "CascadeMap", *, prefix: KeyPath = ()) -> None:
+        """Add every origin of ``other`` (below ``prefix``) to this map."""
+        for kp, origins in other.reverse.items():
+            kp2 = prefix + kp
+            for o in origins:
+                self.add_origin(kp2, o)
+        self.fingerprints.update(other.fingerprints)
+        for kp, dc in other.configs.items():
+            self.configs[prefix + kp] = dc
+
+    def descendant_test(self) -> Callable[[KeyPath], bool]:
+        """Return a test whether ``reverse`` holds a key path strictly below a
+        given one; built in one pass and valid until the map changes."""
+        all_reverse = set(self.reverse)
+        has_descendant: set = set()
+        for kp in all_reverse:
+            for length in range(len(kp)):
+                prefix = kp[:length]
+                if prefix in all_reverse:
+                    has_descendant.add(prefix)
+        return has_descendant.__contains__
+
+    def directory_config(self, key_path: KeyPath) -> Optional[DirectoryConfig]:
+        """The config of the nearest directory node at or above ``key_path``."""
+        for i in range(len(key_path), -1, -1):
+            dc = self.configs.get(key_path[:i])
+            if dc is not None:
+                return dc
+        return None
+
+    def config_for(self, key_path: KeyPath) -> Optional[Mapping[str, Any]]:
+        """The directory default config in effect at ``key_path``."""
+        dc = self.directory_config(key_path)
+        return dc.config if dc is not None else None
+
+    def strategy_for(self, key_path: KeyPath) -> MergeStrategy:
+        """The merge strategy applied at ``key_path``."""
+        for i in range(len(key_path), -1, -1):
+            dc = self.configs.get(key_path[:i])
+            if dc is not None:
+                strategy = dc.strategy
+                for seg in key_path[i:]:
+                    strategy = strategy.for_child(seg)
+                return strategy
+        return MergeStrategy()
+
     def drop_prefix(self, prefix: KeyPath) -> None:
         to_drop = [
             kp for kp in list(self.reverse.keys()) if kp[: len(prefix)] == prefix
@@ -36,20 +102,42 @@ class CascadeMap:
                     self.forward[o.file].remove(kp)
                     if not self.forward[o.file]:
                         del self.forward[o.file]
+        for kp in [kp for kp in self.configs if kp[: len(prefix)] == prefix]:
+            del self.configs[kp]
+
+
+def pack_key_path(kp: KeyPath) -> bytes:
+    """Encode ``kp`` as NUL-terminated UTF-8 segments.
+
+    Packed key paths sort like the tuples, and those below a prefix follow
+    it contiguously (``0xFF`` never occurs in UTF-8).
+    """
+    return b"".join(seg.encode("utf-8") + b"\0" for seg in kp)
+
+
+def unpack_key_path(blob: bytes) -> KeyPath:
+    return tuple(seg.decode("utf-8") for seg in blob.split(b"\0")[:-1])
 
 
 def merge_maps(a: CascadeMap, b: CascadeMap, *, prefix: KeyPath = ()) -> CascadeMap:
     out = CascadeMap(
         forward={p: set(kps) for p, kps in a.forward.items()},
         reverse={kp: list(origins) for kp, origins in a.reverse.items()},
+        fingerprints=dict(a.fingerprints),
+        configs=dict(a.configs),
     )
-    for kp, origins in b.reverse.items():
-        kp2 = prefix + kp
-        for o in origins:
-            out.add_origin(kp2, o)
+    out.merge_in(b, prefix=prefix)
     return out
 
 
+# shared segment strings for the list indexes most lists stay below
+_INDEX_SEGMENTS = tuple(str(i) for i in range(1024))
+
+
+def _index_segment(idx: int) -> str:
+    return _INDEX_SEGMENTS[idx] if idx < 1024 else str(idx)
+
+
 def enumerate_paths(obj: Any, base: KeyPath = ()) -> Iterable[KeyPath]:
     if isinstance(obj, dict):
         yield base
@@ -60,6 +148,6 @@ def enumerate_paths(obj: Any, base: KeyPath = ()) -> Iterable[KeyPath]:
     elif isinstance(obj, list):
         yield base
         for idx, v in enumerate(obj):
-            yield from enumerate_paths(v, base + (str(idx),))
+            yield from enumerate_paths(v, base + (_index_segment(idx),))
     else:
         yield base
@@ -5,7 +5,7 @@ from __future__ import annotations
 from math import log
 from typing import Any, Dict, Mapping, MutableMapping
 
-from data_cascade.logging_utils import get_logger
+from data_cascade.logging_utils import get_logger, tracer
 from data_cascade.merge.strategy import DictMode, ListMode, ListStrategy, MergeStrategy
 
 log = get_logger(__name__)
@@ -13,7 +13,10 @@ log = get_logger(__name__)
 
 def merge_lists(a: list[Any], b: list[Any], strategy: ListStrategy) -> list[Any]:
     mode = strategy.mode
-    log.debug("Merging lists with mode %s: %s + %s", mode, a, b)
+    if tracer.on:
+        tracer.emit(
+            log, "Merging lists with mode %s: %d + %d items", mode, len(a), len(b)
+        )
     if mode == ListMode.REPLACE:
         return list(b)
     if mode == ListMode.EXTEND:
@@ -55,14 +58,16 @@ def merge_lists(a: list[Any], b: list[Any], strategy: ListStrategy) -> list[Any]
 
 def merge_values(a: Any, b: Any, strategy: MergeStrategy) -> Any:
     if isinstance(a, Mapping) and isinstance(b, Mapping):
-        log.debug("Merging dicts with strategy: %s", strategy.dict_mode)
+        if tracer.on:
+            tracer.emit(log, "Merging dicts with strategy: %s", strategy.dict_mode)
         if strategy.dict_mode == DictMode.FIRST_WINS:
             return dict(a)
         if strategy.dict_mode == DictMode.OVERRIDE:
             return dict(b)
         return deep_merge_dicts(dict(a), dict(b), strategy)
     if isinstance(a, list) and isinstance(b, list):
-        log.debug("Merging lists with strategy: %s", strategy.list_strategy)
+        if tracer.on:
+            tracer.emit(log, "Merging lists with strategy: %s", strategy.list_strategy)
         return merge_lists(a, b, strategy.list_strategy)
     if strategy.dict_mode == DictMode.FIRST_WINS:
         return a
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, Mapping, Optional
 
-from data_cascade.logging_utils import get_logger
+from data_cascade.logging_utils import get_logger, tracer
 
 log = get_logger(__name__)
 
@@ -83,7 +83,7 @@ class MergeStrategy:
             for name in exclude_val:
                 if isinstance(name, str) and name:
                     base.excludes.add(name)
-        log.debug("Constructed MergeStrategy from config: %s", repr(base))
+        log.debug("Constructed MergeStrategy from config: %r", base)
         return base
 
 
@@ -92,7 +92,8 @@ def extract_strategy_from_node(
 ) -> MergeStrategy:
     cfg = node.get("__config__")
     if not isinstance(cfg, Mapping):
-        log.debug("No __config__ mapping found; using inherited strategy")
+        if tracer.on:
+            tracer.emit(log, "No __config__ mapping found; using inherited strategy")
         return inherited
     if cfg.get("__config__") is not None:
         log.info("Ignoring nested __config__ in __config__ mapping")
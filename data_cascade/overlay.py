@@ -0,0 +1,221 @@
+"""Cascades over several roots merged as ordered layers.
+
+:func:`load_overlay` loads each root on its own and merges the roots in order
+(later roots override earlier ones) with the merge strategies of the first
+root's directories. Loaded roots are kept in a :class:`LayerCache`, so many
+overlays over the same base parse the base once; the merge copies only the
+containers an overlay touches and shares every other subtree with the cached
+base. Cached layers must therefore never be mutated.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .config import SUPPORTED_EXTS_DEFAULT
+from .fs import FileStamp, root_stamps
+from .loader import load_data_cascade
+from .logging_utils import get_logger
+from .mapping import CascadeMap, KeyPath
+from .merge.merge import merge_values
+from .merge.strategy import DictMode
+from .stats import LoadStats
+
+log = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Layer:
+    """One loaded root of an overlay; ``data`` may be shared, never mutate it."""
+
+    root: Path
+    data: Dict[str, Any]
+    cmap: CascadeMap
+
+
+def _paths_key(paths: Optional[Iterable[str | KeyPath]]) -> Any:
+    if paths is None:
+        return None
+    return tuple(p if isinstance(p, str) else tuple(p) for p in paths)
+
+
+class LayerCache:
+    """Loaded roots kept for reuse by :func:`load_overlay`.
+
+    An entry is reused while the stamps of the loadable files below its root
+    are unchanged (a changed, added or removed file reloads the root). At most
+    ``maxsize`` roots are kept; the least recently used is dropped first.
+    """
+
+    def __init__(self, maxsize: int = 8) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Tuple[Dict[Path, FileStamp], Layer]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        root: Path | str,
+        *,
+        allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+        include: Optional[Iterable[str | KeyPath]] = None,
+        exclude: Optional[Iterable[str | KeyPath]] = None,
+        stats: Optional[LoadStats] = None,
+        processes: int | Executor | None = None,
+    ) -> Layer:
+        """Return the cached layer of ``root``, loading it if needed."""
+        root_path = Path(root)
+        key = (
+            root_path.resolve(),
+            tuple(allowed_exts),
+            _paths_key(include),
+            _paths_key(exclude),
+        )
+        # taken before loading, so a file changed during the load is seen as
+        # changed by the next lookup
+        stamps = root_stamps(root_path, allowed_exts)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamps:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                log.debug("Reusing cached layer %s", root_path)
+                return entry[1]
+            self.misses += 1
+        data, cmap = load_data_cascade(
+            root_path,
+            allowed_exts=allowed_exts,
+            include=include,
+            exclude=exclude,
+            stats=stats,
+            processes=processes,
+        )
+        layer = Layer(root_path, data, cmap)
+        with self._lock:
+            self._entries[key] = (stamps, layer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return layer
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# process-wide default used by load_overlay and make_cascade
+layer_cache = LayerCache()
+
+
+def _merge_node(
+    a: Mapping[str, Any],
+    b: Mapping[str, Any],
+    path: KeyPath,
+    cmap: CascadeMap,
+    above_dirs: Set[KeyPath],
+) -> Dict[str, Any]:
+    # deep-merge ``b`` over ``a`` at ``path``; children holding a directory
+    # at or below them are merged with that directory's own strategy
+    strategy = cmap.strategy_for(path)
+    out = dict(a)
+    for k, b_val in b.items():
+        if k in strategy.excludes:
+            continue
+        if k not in out:
+            out[k] = b_val
+            continue
+        kp = path + (k,)
+        a_val = out[k]
+        if kp not in above_dirs and kp not in cmap.configs:
+            out[k] = merge_values(a_val, b_val, strategy.for_child(k))
+            continue
+        child = cmap.strategy_for(kp)
+        if (
+            kp in above_dirs
+            and child.dict_mode == DictMode.DEEP
+            and isinstance(a_val, Mapping)
+            and isinstance(b_val, Mapping)
+        ):
+            out[k] = _merge_node(a_val, b_val, kp, cmap, above_dirs)
+        else:
+            out[k] = merge_values(a_val, b_val, child)
+    return out
+
+
+def merge_layers(layers: Sequence[Layer]) -> Tuple[Dict[str, Any], CascadeMap]:
+    """Merge loaded ``layers`` (in order) into data and one origin map.
+
+    Each directory's subtree is merged with the strategy that directory has
+    in the first root. Origins of a key path are listed top-most root first,
+    so that new keys are assigned to the highest root defining their parent.
+    Directory configs of lower roots take precedence, as their strategy
+    governs the merge.
+    """
+    if not layers:
+        raise ValueError("an overlay needs at least one root")
+    base_map = layers[0].cmap
+    # key paths with a directory strictly below them
+    above_dirs = {kp[:i] for kp in base_map.configs for i in range(len(kp))}
+    data = layers[0].data
+    for layer in layers[1:]:
+        data = _merge_node(data, layer.data, (), base_map, above_dirs)
+    cmap = CascadeMap()
+    for layer in reversed(layers):
+        cmap.merge_in(layer.cmap)
+    return data, cmap
+
+
+def load_layer(
+    root: Path | str, cache: Optional[LayerCache] = layer_cache, **options: Any
+) -> Layer:
+    """Load one root of an overlay through ``cache`` (afresh when ``None``)."""
+    if cache is None:
+        data, cmap = load_data_cascade(root, **options)
+        return Layer(Path(root), data, cmap)
+    return cache.load(root, **options)
+
+
+def load_overlay(
+    roots: Sequence[Path | str],
+    *,
+    cache: Optional[LayerCache] = layer_cache,
+    allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+    include: Optional[Iterable[str | KeyPath]] = None,
+    exclude: Optional[Iterable[str | KeyPath]] = None,
+    stats: Optional[LoadStats] = None,
+    processes: int | Executor | None = None,
+) -> Tuple[Dict[str, Any], CascadeMap, List[Layer]]:
+    """Load ``roots`` as ordered layers; return merged data, map and layers.
+
+    Roots are loaded through ``cache`` (``None`` loads every root afresh).
+    The merged data shares containers with the layers: copy before mutating
+    (:class:`~data_cascade.cascade.OverlayCascade` writes copy-on-write).
+    """
+    options: Dict[str, Any] = dict(
+        allowed_exts=allowed_exts,
+        include=include,
+        exclude=exclude,
+        stats=stats,
+        processes=processes,
+    )
+    layers = [load_layer(root, cache, **options) for root in roots]
+    data, cmap = merge_layers(layers)
+    return data, cmap, layers
+
+
+__all__ = [
+    "Layer",
+    "LayerCache",
+    "layer_cache",
+    "load_layer",
+    "load_overlay",
+    "merge_layers",
+]
@@ -0,0 +1,105 @@
+"""Parse files in worker processes, handing results back via shared memory.
+
+Workers parse with :func:`~data_cascade.io.load_file` and encode the result
+with :func:`~data_cascade.codec.encode`; payloads above a size threshold are
+written to a ``multiprocessing.shared_memory`` block so only its name crosses
+the pipe.
+The parent decodes the results and merges them itself, so merge order and
+results match a sequential load.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .codec import decode, encode
+from .io import load_file
+from .logging_utils import get_logger
+
+log = get_logger(__name__)
+
+# payloads smaller than this are returned through the pipe directly
+SHM_THRESHOLD = 64 * 1024
+
+# ("shm", block name, size) | ("bytes", payload) | ("error", exception)
+_Result = Tuple[Any, ...]
+
+
+def _create_block(size: int) -> shared_memory.SharedMemory:
+    # the parent unlinks the block; keep the worker's resource tracker from
+    # unlinking it again (and warning) when the worker exits
+    try:
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+    except TypeError:  # Python < 3.13
+        block = shared_memory.SharedMemory(create=True, size=size)
+        resource_tracker.unregister(block._name, "shared_memory")  # type: ignore
+        return block
+
+
+def _parse_worker(path: str, shm_threshold: int) -> _Result:
+    try:
+        payload = encode(load_file(Path(path)))
+    except Exception as e:
+        return ("error", e)
+    if len(payload) < shm_threshold:
+        return ("bytes", payload)
+    block = _create_block(len(payload))
+    try:
+        block.buf[: len(payload)] = payload
+        return ("shm", block.name, len(payload))
+    finally:
+        block.close()
+
+
+def _receive(result: _Result) -> Tuple[Any, Optional[BaseException]]:
+    kind = result[0]
+    if kind == "error":
+        return None, result[1]
+    if kind == "bytes":
+        return decode(result[1]), None
+    block = shared_memory.SharedMemory(name=result[1])
+    try:
+        return decode(block.buf[: result[2]]), None
+    finally:
+        block.close()
+        block.unlink()
+
+
+def parse_files(
+    files: Iterable[Path],
+    processes: int | Executor | None = None,
+    *,
+    shm_threshold: int = SHM_THRESHOLD,
+) -> Dict[Path, Tuple[Any, Optional[BaseException]]]:
+    """Parse ``files`` in a process pool; map each to ``(content, error)``.
+
+    ``processes`` is a worker count (default: CPU count) for a pool created
+    for this call, or an existing process pool to reuse.
+    """
+    files = list(files)
+    if isinstance(processes, Executor):
+        return _collect(processes, files, shm_threshold)
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(files), 1))) as pool:
+        return _collect(pool, files, shm_threshold)
+
+
+def _collect(
+    pool: Executor, files: list, shm_threshold: int
+) -> Dict[Path, Tuple[Any, Optional[BaseException]]]:
+    futures = [(f, pool.submit(_parse_worker, str(f), shm_threshold)) for f in files]
+    out: Dict[Path, Tuple[Any, Optional[BaseException]]] = {}
+    for f, fut in futures:
+        try:
+            out[f] = _receive(fut.result())
+        except Exception as e:  # e.g. an unpicklable error or a dead worker
+            out[f] = (None, e)
+    log.debug("Parsed %d files in worker processes", len(out))
+    return out
+
+
+__all__ = ["parse_files", "SHM_THRESHOLD"]
@@ -1,4 +1,16 @@
-from .access import delete_at, get_at, is_int_segment, set_at
+from .access import delete_at, get_at, get_many_at, is_int_segment, set_at, set_many_at
 from .parse import join_path, parse_path
+from .query import parse_query, query_at
 
-__all__ = ["parse_path", "join_path", "get_at", "set_at", "delete_at", "is_int_segment"]
+__all__ = [
+    "parse_path",
+    "join_path",
+    "get_at",
+    "get_many_at",
+    "set_at",
+    "set_many_at",
+    "delete_at",
+    "is_int_segment",
+    "parse_query",
+    "query_at",
+]
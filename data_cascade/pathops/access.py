@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Tuple
+from typing import Any, Iterable, Mapping, Sequence, Tuple
 
 KeyPath = Tuple[str, ...]
 
@@ -15,34 +15,103 @@ def is_int_segment(s: str) -> bool:
         return False
 
 
+_MISSING = object()
+
+
+def _step(cur: Any, seg: str) -> Any:
+    if isinstance(cur, dict):
+        return cur.get(seg, _MISSING)
+    if isinstance(cur, (list, tuple)) and is_int_segment(seg):
+        idx = int(seg)
+        if 0 <= idx < len(cur):
+            return cur[idx]
+        return _MISSING
+    if isinstance(cur, Mapping):  # e.g. frozen views
+        return cur.get(seg, _MISSING)
+    return _MISSING
+
+
 def get_at(obj: Any, key_path: KeyPath, *, missing: object = None) -> Any:
     cur = obj
     for seg in key_path:
-        if isinstance(cur, dict):
-            if seg in cur:
-                cur = cur[seg]
-            else:
-                return missing
-        elif isinstance(cur, list):
-            if is_int_segment(seg):
-                idx = int(seg)
-                if 0 <= idx < len(cur):
-                    cur = cur[idx]
-                else:
-                    return missing
-            else:
-                return missing
-        else:
+        cur = _step(cur, seg)
+        if cur is _MISSING:
             return missing
     return cur
 
 
+def _common_prefix_len(a: KeyPath, b: KeyPath, limit: int) -> int:
+    n = 0
+    while n < limit and a[n] == b[n]:
+        n += 1
+    return n
+
+
+def get_many_at(
+    obj: Any, key_paths: Sequence[KeyPath], *, missing: object = None
+) -> list[Any]:
+    """Look up several key paths, walking each shared prefix only once.
+
+    Paths are visited in sorted order so that neighbours share their longest
+    common prefix; results are returned in the order of ``key_paths``.
+    """
+    out: list[Any] = [missing] * len(key_paths)
+    prev: KeyPath = ()
+    # stack[i] holds the value found at prev[:i]
+    stack: list[Any] = [obj]
+    for i in sorted(range(len(key_paths)), key=key_paths.__getitem__):
+        kp = key_paths[i]
+        common = _common_prefix_len(prev, kp, min(len(kp), len(stack) - 1))
+        del stack[common + 1 :]
+        cur = stack[-1]
+        for seg in kp[common:]:
+            cur = _step(cur, seg)
+            if cur is _MISSING:
+                break
+            stack.append(cur)
+        if cur is not _MISSING:
+            out[i] = cur
+        prev = kp
+    return out
+
+
 def _ensure_container(obj: Any, next_seg: str) -> Any:
     if obj is None:
         return [] if is_int_segment(next_seg) else {}
     return obj
 
 
+def _descend_for_write(cur: Any, seg: str, next_seg: str) -> Any:
+    if isinstance(cur, dict):
+        nxt = _ensure_container(cur.get(seg), next_seg)
+        cur[seg] = nxt
+        return nxt
+    if isinstance(cur, list):
+        if not is_int_segment(seg):
+            raise TypeError("List index segment expected")
+        idx = int(seg)
+        while len(cur) <= idx:
+            cur.append(None)
+        nxt = _ensure_container(cur[idx], next_seg)
+        cur[idx] = nxt
+        return nxt
+    raise TypeError("Cannot descend into scalar")
+
+
+def _assign(cur: Any, seg: str, value: Any) -> None:
+    if isinstance(cur, dict):
+        cur[seg] = value
+    elif isinstance(cur, list):
+        if not is_int_segment(seg):
+            raise TypeError("List index segment expected")
+        idx = int(seg)
+        while len(cur) <= idx:
+            cur.append(None)
+        cur[idx] = value
+    else:
+        raise TypeError("Cannot descend into scalar")
+
+
 def set_at(obj: Any, key_path: KeyPath, value: Any) -> Any:
     if not key_path:
         return value
@@ -50,31 +119,94 @@ def set_at(obj: Any, key_path: KeyPath, value: Any) -> Any:
     if cur is None:
         cur = [] if is_int_segment(key_path[0]) else {}
         obj = cur
-    for i, seg in enumerate(key_path):
-        is_last = i == len(key_path) - 1
-        if isinstance(cur, dict):
-            if is_last:
-                cur[seg] = value
+    for i, seg in enumerate(key_path[:-1]):
+        cur = _descend_for_write(cur, seg, key_path[i + 1])
+    _assign(cur, key_path[-1], value)
+    return obj
+
+
+def set_many_at(
+    obj: Any, items: Iterable[Tuple[KeyPath, Any]], *, copy_on_write: bool = False
+) -> Any:
+    """Assign several key paths, walking a prefix shared with the previous
+    path only once.
+
+    Assignments are applied in the given order, with the same result as
+    :func:`set_at` called for each in turn, except that values assigned
+    earlier in the batch are copied before a later path descends into them,
+    so the caller's objects are never modified. With ``copy_on_write`` no
+    existing container is modified either: every container along the written
+    paths is shallow-copied (once per call) and the new root is returned, so
+    the previous root stays a consistent snapshot.
+    """
+    # ids of containers copied or created by this call, safe to modify in
+    # place; of values assigned by this call; and of copies whose children
+    # may still be the caller's
+    fresh: set[int] = set()
+    assigned: set[int] = set()
+    lent: set[int] = set()
+
+    def borrowed(container: Any, parent: Any = None) -> bool:
+        # whether ``container`` must be copied before it is modified
+        if id(container) in fresh or not isinstance(container, (dict, list)):
+            return False
+        return copy_on_write or id(container) in assigned or id(parent) in lent
+
+    def own(container: Any, parent: Any = None) -> Any:
+        copied = dict(container) if isinstance(container, dict) else list(container)
+        fresh.add(id(copied))
+        if id(container) in assigned or id(parent) in lent:
+            lent.add(id(copied))
+        return copied
+
+    def descend(cur: Any, seg: str, next_seg: str) -> Any:
+        child = _step(cur, seg)
+        if child is _MISSING or child is None:
+            child = _descend_for_write(cur, seg, next_seg)
+            fresh.add(id(child))
+            return child
+        if borrowed(child, cur):
+            child = own(child, cur)
+            _assign(cur, seg, child)
+        return _descend_for_write(cur, seg, next_seg)
+
+    prev: KeyPath = ()
+    # stack[i] holds the container at prev[:i]; stack[len(prev)] is the value
+    # assigned last, so a following descendant path can descend into it.
+    if borrowed(obj):
+        obj = own(obj)
+    stack: list[Any] = [obj]
+    for kp, value in items:
+        if not kp:
+            obj = value
+            assigned.add(id(value))
+            stack = [obj]
+            prev = kp
+            continue
+        common = _common_prefix_len(prev, kp, min(len(kp) - 1, len(stack) - 1))
+        del stack[common + 1 :]
+        cur = stack[-1]
+        parent = stack[-2] if common else None
+        if cur is None or borrowed(cur, parent):
+            # e.g. a None or a container assigned earlier in this batch:
+            # replaced by a new container or a copy
+            if cur is None:
+                cur = _ensure_container(cur, kp[common])
+                fresh.add(id(cur))
             else:
-                nxt = cur.get(seg)
-                nxt = _ensure_container(nxt, key_path[i + 1])
-                cur[seg] = nxt
-                cur = nxt
-        elif isinstance(cur, list):
-            if not is_int_segment(seg):
-                raise TypeError("List index segment expected")
-            idx = int(seg)
-            while len(cur) <= idx:
-                cur.append(None)
-            if is_last:
-                cur[idx] = value
+                cur = own(cur, parent)
+            stack[-1] = cur
+            if common == 0:
+                obj = cur
             else:
-                nxt = cur[idx]
-                nxt = _ensure_container(nxt, key_path[i + 1])
-                cur[idx] = nxt
-                cur = nxt
-        else:
-            raise TypeError("Cannot descend into scalar")
+                _assign(parent, kp[common - 1], cur)
+        for i in range(common, len(kp) - 1):
+            cur = descend(cur, kp[i], kp[i + 1])
+            stack.append(cur)
+        _assign(cur, kp[-1], value)
+        assigned.add(id(value))
+        stack.append(value)
+        prev = kp
     return obj
 
 
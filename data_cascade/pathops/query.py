@@ -0,0 +1,95 @@
+"""Wildcard queries over nested data: ``*``, ``**`` and list slices."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterator, Optional, Tuple
+
+from .access import _MISSING, KeyPath, _step
+from .parse import parse_path
+
+# (kind, argument) pairs; kind is one of "key", "any", "deep" or "slice"
+QuerySegment = Tuple[str, Any]
+Query = Tuple[QuerySegment, ...]
+
+_SLICE_RE = re.compile(r"(-?\d*):(-?\d*)(?::(-?\d*))?")
+
+
+def _as_slice(token: str) -> Optional[slice]:
+    m = _SLICE_RE.fullmatch(token)
+    if m is None:
+        return None
+    start, stop, step = (int(g) if g else None for g in m.groups())
+    return slice(start, stop, step)
+
+
+def parse_query(expr: str) -> Query:
+    """Parse a path expression that may contain wildcards.
+
+    ``*`` matches any single key or index, ``**`` matches zero or more levels
+    and ``[start:stop:step]`` selects a slice of a list, e.g.
+    ``services.*.port``, ``teams[*].members`` or ``**.port``.
+    """
+    out: list[QuerySegment] = []
+    for tok in parse_path(expr):
+        if tok == "*":
+            out.append(("any", None))
+        elif tok == "**":
+            if not out or out[-1][0] != "deep":
+                out.append(("deep", None))
+        else:
+            sl = _as_slice(tok)
+            out.append(("slice", (sl, tok)) if sl is not None else ("key", tok))
+    return tuple(out)
+
+
+def _children(obj: Any) -> Iterator[Tuple[str, Any]]:
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield (k if isinstance(k, str) else str(k)), v
+    elif isinstance(obj, list):
+        for idx, v in enumerate(obj):
+            yield str(idx), v
+
+
+def _match(
+    obj: Any, query: Query, pos: int, base: KeyPath
+) -> Iterator[Tuple[KeyPath, Any]]:
+    if pos == len(query):
+        yield base, obj
+        return
+    kind, arg = query[pos]
+    if kind == "key":
+        child = _step(obj, arg)
+        if child is not _MISSING:
+            yield from _match(child, query, pos + 1, base + (arg,))
+    elif kind == "any":
+        for seg, child in _children(obj):
+            yield from _match(child, query, pos + 1, base + (seg,))
+    elif kind == "slice":
+        sl, token = arg
+        if isinstance(obj, list):
+            for idx in range(*sl.indices(len(obj))):
+                yield from _match(obj[idx], query, pos + 1, base + (str(idx),))
+        else:
+            child = _step(obj, token)
+            if child is not _MISSING:
+                yield from _match(child, query, pos + 1, base + (token,))
+    else:  # deep: match here, then keep descending with the same pattern
+        yield from _match(obj, query, pos + 1, base)
+        for seg, child in _children(obj):
+            yield from _match(child, query, pos, base + (seg,))
+
+
+def query_at(obj: Any, query: str | Query) -> Iterator[Tuple[KeyPath, Any]]:
+    """Yield ``(key_path, value)`` for every location matching ``query``.
+
+    Only branches that can still match are descended into, so exact segments
+    cost a single lookup and just ``*``/``**`` fan out.
+    """
+    q = parse_query(query) if isinstance(query, str) else query
+    seen: set[KeyPath] = set()
+    for kp, value in _match(obj, q, 0, ()):
+        if kp not in seen:
+            seen.add(kp)
+            yield kp, value
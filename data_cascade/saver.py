@@ -3,15 +3,21 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from .deferred import is_unloaded, plain
 from .handlers.registry import get_handler_for, known_extensions
 from .io import save_file
+from .layered import claim_origins
 from .logging_utils import get_logger
 from .mapping import CascadeMap, KeyOrigin, KeyPath
 
 log = get_logger(__name__)
 
+# ``value_at(file, key_path, default)``: the value ``file`` should hold at
+# ``key_path``; by default the merged data's value
+ValueAt = Callable[[Path, KeyPath, Any], Any]
+
 
 def _is_int(s: str) -> bool:
     try:
@@ -92,17 +98,18 @@ def _choose_origin_for_key(file: Path, origins: List[KeyOrigin]) -> KeyOrigin:
     return origins[0]
 
 
-def _reconstruct_file_object(file: Path, data: Dict[str, Any], cmap: CascadeMap) -> Any:
-    # Precompute which key paths have at least one strict descendant anywhere in
-    # cmap.reverse, so the container-origin check below is O(1) per path rather
-    # than O(N) (scanning all of cmap.reverse for every container path).
-    all_reverse = set(cmap.reverse)
-    has_descendant: set = set()
-    for kp in all_reverse:
-        for length in range(len(kp)):
-            prefix = kp[:length]
-            if prefix in all_reverse:
-                has_descendant.add(prefix)
+def _reconstruct_file_object(
+    file: Path,
+    data: Dict[str, Any],
+    cmap: CascadeMap,
+    value_at: Optional[ValueAt] = None,
+    has_descendant: Optional[Callable[[KeyPath], bool]] = None,
+) -> Any:
+    # Whether a key path has at least one strict descendant anywhere in
+    # cmap.reverse, answered in O(1) per path rather than O(N) (scanning all of
+    # cmap.reverse for every container path). Built once per save plan.
+    if has_descendant is None:
+        has_descendant = cmap.descendant_test()
 
     root_obj: Any = None
     key_paths = sorted(
@@ -115,14 +122,17 @@ def _reconstruct_file_object(file: Path, data: Dict[str, Any], cmap: CascadeMap)
         o = _choose_origin_for_key(file, origins)
         local = o.local_path
         sentinel = object()
-        val = _get_at(data, kp, missing=sentinel)
+        if value_at is None:
+            val = _get_at(data, kp, missing=sentinel)
+        else:
+            val = value_at(file, kp, sentinel)
         if val is sentinel:
             continue
         if local == tuple():
             # If any descendant path exists (in this file OR in a sibling file),
             # reconstruct from owned descendants to avoid writing sibling-owned
             # data into this container.
-            if kp and kp in has_descendant:
+            if kp and has_descendant(kp):
                 if root_obj is None:
                     root_obj = [] if isinstance(val, list) else {}
                 continue
@@ -153,7 +163,10 @@ def _assign_new_keys_to_files(
 
     def walk(obj: Any, base: KeyPath = ()) -> None:
         if isinstance(obj, dict):
-            for k, v in obj.items():
+            # of a node that is not (fully) loaded yet only the keys already
+            # in its storage can hold new keys
+            items = dict.items(obj) if is_unloaded(obj) else obj.items()
+            for k, v in items:
                 if isinstance(k, str) and k.startswith("__") and k.endswith("__"):
                     continue
                 walk(v, base + (str(k),))
@@ -181,16 +194,15 @@ def _assign_new_keys_to_files(
     return assignments
 
 
-def save_data_cascade(
-    root: Path | str,
+def _plan_save(
+    root_path: Path,
     data: Dict[str, Any],
     cmap: CascadeMap,
-    *,
     target_files: Optional[Iterable[Path]] = None,
-) -> None:
-    root_path = Path(root)
-    root_path.mkdir(parents=True, exist_ok=True)
-
+    value_at: Optional[ValueAt] = None,
+) -> List[Tuple[Path, Any]]:
+    """Reconstruct the object to write for every file that needs saving."""
+    claim_origins(data, target_files)
     files = list(cmap.forward.keys())
     new_assignments = _assign_new_keys_to_files(root_path, data, cmap)
     files = set(files) | set(new_assignments.keys())
@@ -200,23 +212,51 @@ def save_data_cascade(
         # include any assignment files not already present
         files = files | (set(new_assignments.keys()) & set(target_files))
 
+    plan: List[Tuple[Path, Any]] = []
+    has_descendant = cmap.descendant_test() if files else None
     for file in sorted(files):
         try:
-            obj = _reconstruct_file_object(file, data, cmap)
+            obj = _reconstruct_file_object(file, data, cmap, value_at, has_descendant)
             for kp, local in new_assignments.get(file, []):
                 sentinel = object()
-                val = _get_at(data, kp, missing=sentinel)
+                if value_at is None:
+                    val = _get_at(data, kp, missing=sentinel)
+                else:
+                    val = value_at(file, kp, sentinel)
                 if val is sentinel:
                     continue
                 if obj is None:
                     obj = [] if (local and _is_int(local[0])) else {}
                 obj = _set_at_local(obj, local, val)
-            file.parent.mkdir(parents=True, exist_ok=True)
-            save_file(file, obj)
-            log.info("Saved %s", file)
         except Exception as e:
             log.error("Failed to save %s: %s", file, e)
             raise
+        plan.append((file, plain(obj)))
+    return plan
+
+
+def _write_planned(file: Path, obj: Any) -> None:
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        save_file(file, obj)
+        log.info("Saved %s", file)
+    except Exception as e:
+        log.error("Failed to save %s: %s", file, e)
+        raise
+
+
+def save_data_cascade(
+    root: Path | str,
+    data: Dict[str, Any],
+    cmap: CascadeMap,
+    *,
+    target_files: Optional[Iterable[Path]] = None,
+    value_at: Optional[ValueAt] = None,
+) -> None:
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    for file, obj in _plan_save(root_path, data, cmap, target_files, value_at):
+        _write_planned(file, obj)
 
 
 __all__ = ["save_data_cascade"]
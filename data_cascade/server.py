@@ -0,0 +1,325 @@
+"""A cascade served to local processes over a Unix domain socket.
+
+``data-cascade serve ROOT --socket PATH`` (or :func:`serve`) keeps a
+thread-safe :class:`~data_cascade.cascade.Cascade` loaded, reloads it when
+files below ``ROOT`` change, and answers lookups from :class:`CascadeClient`,
+so short-lived tools pay one round trip instead of a full load.
+
+Messages are a 4-byte big-endian length followed by the payload. A request
+is an op byte and a ``marshal``-encoded argument (never unpickled by the
+server); a response is a status byte and, for success, the result encoded
+with :mod:`~data_cascade.codec`, or else ``marshal``-encoded
+``(error type, message)``.
+"""
+
+from __future__ import annotations
+
+import errno
+import marshal
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from .cascade import Cascade, QueryMatch, make_cascade
+from .codec import decode, encode
+from .deferred import plain
+from .logging_utils import get_logger
+from .mapping import KeyOrigin, KeyPath
+from .pathops import parse_path
+
+log = get_logger(__name__)
+
+_LENGTH = struct.Struct(">I")
+
+# request ops
+_GET, _QUERY, _ORIGINS = 1, 2, 3
+# response status
+_OK, _ERROR = 0, 1
+
+# exceptions re-raised as such by the client; others become RuntimeError
+_ERRORS: Dict[str, type] = {
+    "KeyError": KeyError,
+    "TypeError": TypeError,
+    "ValueError": ValueError,
+}
+
+
+def _send(sock_file: Any, payload: bytes) -> None:
+    sock_file.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv(rfile: BinaryIO) -> Optional[bytes]:
+    # None on a clean end of stream between messages
+    head = rfile.read(_LENGTH.size)
+    if not head:
+        return None
+    if len(head) < _LENGTH.size:
+        raise ConnectionError("truncated message")
+    (n,) = _LENGTH.unpack(head)
+    payload = rfile.read(n)
+    if len(payload) < n:
+        raise ConnectionError("truncated message")
+    return payload
+
+
+def _origin_rows(origins: Iterable[KeyOrigin]) -> List[Tuple[str, KeyPath]]:
+    return [(str(o.file), o.local_path) for o in origins]
+
+
+def _key_path(arg: Any) -> KeyPath:
+    if not isinstance(arg, tuple) or not all(isinstance(s, str) for s in arg):
+        raise TypeError("key paths are sent as tuples of strings")
+    return arg
+
+
+def _remove_stale_socket(path: Path) -> None:
+    # unlink a socket left behind by a server that died; one still accepting
+    # connections is in use
+    try:
+        if not stat.S_ISSOCK(path.lstat().st_mode):
+            return
+    except FileNotFoundError:
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except ConnectionRefusedError:
+        path.unlink()
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, f"A server is already listening on {path}")
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "CascadeServer"
+
+    def handle(self) -> None:
+        rfile = self.request.makefile("rb")
+        try:
+            while True:
+                request = _recv(rfile)
+                if request is None:
+                    return
+                _send(self.request, self.server.respond(request))
+        except (ConnectionError, BrokenPipeError) as e:
+            log.debug("Client connection dropped: %s", e)
+        finally:
+            rfile.close()
+
+
+class CascadeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Answers :class:`CascadeClient` requests about ``cascade`` on ``path``.
+
+    Each connection is served by its own thread, so pass a ``thread_safe``
+    cascade when it is refreshed while serving. The socket is created
+    accessible to the current user only and removed by ``server_close``. A
+    socket left at ``path`` by a dead server is replaced; one a live server
+    listens on raises :class:`OSError` (``EADDRINUSE``).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, cascade: Cascade, path: Path | str) -> None:
+        self.cascade = cascade
+        self.path = Path(path)
+        # (st_dev, st_ino) of the socket file this server bound
+        self._bound: Optional[Tuple[int, int]] = None
+        _remove_stale_socket(self.path)
+        super().__init__(str(self.path), _Handler)
+
+    def server_bind(self) -> None:
+        old = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old)
+        st = self.path.lstat()
+        self._bound = (st.st_dev, st.st_ino)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            st = self.path.lstat()
+        except FileNotFoundError:
+            return
+        # the path may have been taken over by another server since
+        if (st.st_dev, st.st_ino) == self._bound:
+            self.path.unlink()
+
+    def respond(self, request: bytes) -> bytes:
+        """Answer one encoded request."""
+        try:
+            if not request:
+                raise ValueError("empty request")
+            result = self._dispatch(request[0], marshal.loads(request[1:]))
+            return bytes((_OK,)) + encode(result)
+        except Exception as e:
+            log.debug("Request failed: %r", e)
+            return bytes((_ERROR,)) + marshal.dumps((type(e).__name__, str(e)))
+
+    def _dispatch(self, op: int, arg: Any) -> Any:
+        c = self.cascade
+        if op == _GET:
+            return [plain(v) for v in c.get_many([_key_path(kp) for kp in arg])]
+        if op == _QUERY:
+            if not isinstance(arg, str):
+                raise TypeError("queries are sent as strings")
+            return [
+                (m.path, plain(m.value), _origin_rows(m.origins)) for m in c.query(arg)
+            ]
+        if op == _ORIGINS:
+            return _origin_rows(c.cmap.reverse.get(_key_path(arg), ()))
+        raise ValueError(f"unknown request op {op}")
+
+
+def serve(
+    root: Path | str,
+    path: Path | str,
+    *,
+    watch: bool = True,
+    ready: Optional[threading.Event] = None,
+    **load_options: Any,
+) -> None:
+    """Load ``root`` and serve it on the socket ``path`` until interrupted.
+
+    With ``watch`` the cascade is reloaded when its files change.
+    ``load_options`` go to :func:`~data_cascade.cascade.make_cascade`;
+    ``ready`` is set once the socket accepts connections.
+    """
+    cascade = make_cascade(root, thread_safe=True, **load_options)
+    watcher = cascade.watch() if watch else None
+    server = CascadeServer(cascade, path)
+    log.info("Serving %s on %s", root, path)
+    try:
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if watcher is not None:
+            watcher.stop()
+
+
+class ClientNode:
+    """Read-only proxy for a key path, like
+    :class:`~data_cascade.cascade.CascadeNode`."""
+
+    __slots__ = ("_c", "_p", "_children")
+
+    def __init__(self, client: "CascadeClient", key_path: KeyPath) -> None:
+        self._c = client
+        self._p = key_path
+        self._children: Dict[str, ClientNode] = {}
+
+    def __getattr__(self, name: str) -> "ClientNode":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, key: object) -> "ClientNode":
+        seg = str(key)
+        node = self._children.get(seg)
+        if node is None:
+            node = self._children.setdefault(seg, ClientNode(self._c, self._p + (seg,)))
+        return node
+
+    def get(self) -> Any:
+        return self._c.get(self._p)
+
+    def origins(self) -> List[KeyOrigin]:
+        return self._c.origins(self._p)
+
+    def __repr__(self) -> str:
+        return f"ClientNode(path={self._p!r})"
+
+
+class CascadeClient:
+    """Reads a cascade served by :class:`CascadeServer` at ``path``.
+
+    Connects on first use and keeps the connection; safe to share between
+    threads (requests are serialized). Values are decoded with
+    :func:`~data_cascade.codec.decode`, so only connect to servers you trust.
+    """
+
+    def __init__(self, path: Path | str, *, timeout: Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._rfile: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def __enter__(self) -> "CascadeClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _disconnect(self) -> None:
+        if self._rfile is not None:
+            self._rfile.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._rfile = None
+
+    def _call(self, op: int, arg: Any) -> Any:
+        request = bytes((op,)) + marshal.dumps(arg)
+        with self._lock:
+            try:
+                if self._sock is None:
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    sock.settimeout(self.timeout)
+                    sock.connect(str(self.path))
+                    self._sock, self._rfile = sock, sock.makefile("rb")
+                _send(self._sock, request)
+                response = _recv(self._rfile)  # type: ignore[arg-type]
+                if response is None:
+                    raise ConnectionError("server closed the connection")
+            except OSError:
+                # reconnect on the next call
+                self._disconnect()
+                raise
+        if response[0] == _OK:
+            return decode(response[1:])
+        name, message = marshal.loads(response[1:])
+        raise _ERRORS.get(name, RuntimeError)(message)
+
+    def get(self, path: str | KeyPath) -> Any:
+        return self.get_many([path])[0]
+
+    def get_many(self, paths: Iterable[str | KeyPath]) -> List[Any]:
+        """Return the values at ``paths`` (in order) in one round trip."""
+        kps = [parse_path(p) if isinstance(p, str) else tuple(p) for p in paths]
+        return self._call(_GET, kps)
+
+    def query(self, pattern: str) -> List[QueryMatch]:
+        return [
+            QueryMatch(path, value, tuple(_origins(rows)))
+            for path, value, rows in self._call(_QUERY, pattern)
+        ]
+
+    def origins(self, path: str | KeyPath) -> List[KeyOrigin]:
+        kp = parse_path(path) if isinstance(path, str) else tuple(path)
+        return _origins(self._call(_ORIGINS, kp))
+
+    def node(self, path: str | KeyPath = ()) -> ClientNode:
+        kp = parse_path(path) if isinstance(path, str) else tuple(path)
+        return ClientNode(self, kp)
+
+
+def _origins(rows: Iterable[Tuple[str, KeyPath]]) -> List[KeyOrigin]:
+    return [KeyOrigin(file=Path(f), local_path=tuple(lp)) for f, lp in rows]
+
+
+__all__ = ["CascadeServer", "CascadeClient", "ClientNode", "serve"]
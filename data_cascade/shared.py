@@ -0,0 +1,584 @@
+"""Read-only cascades packed into one buffer shared between processes.
+
+:func:`share_cascade` loads a cascade once and packs its merged values and
+origin map into a flat, offset-addressed buffer: an anonymous shared mapping
+that ``fork``\\ ed workers inherit, or a file that other processes map. A
+:class:`SharedCascade` reads that buffer through small accessor objects
+(:class:`SharedNode` mappings, a lazy origin map), so workers decode only
+what they look at and never touch the buffer's pages with reference counts.
+
+Buffer layout (little-endian, offsets from the start of the buffer)::
+
+    header   magic, root value, origin index, file table, meta offset/size
+    value    tag byte + payload; strings are stored once and shared
+    dict     count, (key, value) offset pairs in order, then the pair
+             indexes sorted by key string (looked up by binary search)
+    list     count, value offsets
+    origins  count, (key path, origin list) offset pairs sorted by packed
+             key path (see :func:`~data_cascade.mapping.pack_key_path`)
+    files    count, (path string, origin index list) offset pairs
+    meta     pickled root, fingerprints and directory configs
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Set, Tuple
+
+from .cascade import Cascade
+from .codec import decode, encode
+from .deferred import DeferredDict, plain
+from .diff import ChangeSet
+from .layered import claim_origins
+from .loader import load_data_cascade
+from .logging_utils import get_logger
+from .mapping import CascadeMap, KeyOrigin, KeyPath, pack_key_path, unpack_key_path
+
+log = get_logger(__name__)
+
+MAGIC = b"DCS1"
+
+_HEADER = struct.Struct("<4s5I")
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# value tags
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _OBJ, _DICT, _LIST = range(9)
+
+_MAX_OFFSET = 2**32 - 1
+
+
+def _sort_key(key: Any) -> bytes:
+    # dict keys are searched by their key-path segment
+    return (key if isinstance(key, str) else str(key)).encode("utf-8")
+
+
+class _Packer:
+    def __init__(self) -> None:
+        self.out = bytearray(_HEADER.size)
+        # offsets of values written already: strings, packed key paths and
+        # scalars other than floats (``-0.0 == 0.0``) are shared
+        self._strings: Dict[str, int] = {}
+        self._blobs: Dict[bytes, int] = {}
+        self._scalars: Dict[Tuple[type, Any], int] = {}
+
+    def _emit(self, *parts: bytes) -> int:
+        off = len(self.out)
+        for part in parts:
+            self.out += part
+        return off
+
+    def string(self, s: str) -> int:
+        off = self._strings.get(s)
+        if off is None:
+            raw = s.encode("utf-8")
+            off = self._emit(bytes((_STR,)), _U32.pack(len(raw)), raw)
+            self._strings[s] = off
+        return off
+
+    def blob(self, raw: bytes) -> int:
+        off = self._blobs.get(raw)
+        if off is None:
+            off = self._emit(_U32.pack(len(raw)), raw)
+            self._blobs[raw] = off
+        return off
+
+    def value(self, obj: Any) -> int:
+        if isinstance(obj, str):
+            return self.string(str(obj))
+        if isinstance(obj, dict):
+            return self._dict(obj)
+        if isinstance(obj, list):
+            return self._list(obj)
+        t = type(obj)
+        if t is float:
+            return self._emit(bytes((_FLOAT,)), _F64.pack(obj))
+        if obj is None or t is bool or (t is int and -(2**63) <= obj < 2**63):
+            key = (t, obj)
+            off = self._scalars.get(key)
+            if off is None:
+                off = self._emit(*self._scalar(obj))
+                self._scalars[key] = off
+            return off
+        payload = encode(obj)
+        return self._emit(bytes((_OBJ,)), _U32.pack(len(payload)), payload)
+
+    @staticmethod
+    def _scalar(obj: Any) -> Tuple[bytes, ...]:
+        if obj is None:
+            return (bytes((_NONE,)),)
+        if obj is True:
+            return (bytes((_TRUE,)),)
+        if obj is False:
+            return (bytes((_FALSE,)),)
+        return bytes((_INT,)), _I64.pack(obj)
+
+    def _dict(self, obj: Dict[Any, Any]) -> int:
+        keys = list(obj)
+        pairs = [(self.value(k), self.value(v)) for k, v in obj.items()]
+        order = sorted(range(len(keys)), key=lambda i: _sort_key(keys[i]))
+        return self._emit(
+            bytes((_DICT,)),
+            _U32.pack(len(pairs)),
+            b"".join(_PAIR.pack(*p) for p in pairs),
+            struct.pack(f"<{len(order)}I", *order),
+        )
+
+    def _list(self, obj: List[Any]) -> int:
+        offs = [self.value(v) for v in obj]
+        return self._emit(
+            bytes((_LIST,)), _U32.pack(len(offs)), struct.pack(f"<{len(offs)}I", *offs)
+        )
+
+    def origins(self, cmap: CascadeMap) -> Tuple[int, int]:
+        entries = sorted((pack_key_path(kp), kp) for kp in cmap.reverse)
+        files: Dict[Path, int] = {}
+        file_entries: List[List[int]] = []
+        index = []
+        for i, (packed, kp) in enumerate(entries):
+            origins = cmap.reverse[kp]
+            rows = []
+            for o in origins:
+                f = files.setdefault(o.file, len(files))
+                if f == len(file_entries):
+                    file_entries.append([])
+                if not file_entries[f] or file_entries[f][-1] != i:
+                    file_entries[f].append(i)
+                rows.append(_PAIR.pack(f, self.blob(pack_key_path(o.local_path))))
+            listed = self._emit(_U32.pack(len(rows)), *rows)
+            index.append(_PAIR.pack(self.blob(packed), listed))
+        origins_off = self._emit(_U32.pack(len(index)), *index)
+        table = [
+            _PAIR.pack(
+                self.string(str(file)),
+                self._emit(
+                    _U32.pack(len(file_entries[f])),
+                    struct.pack(f"<{len(file_entries[f])}I", *file_entries[f]),
+                ),
+            )
+            for file, f in files.items()
+        ]
+        files_off = self._emit(_U32.pack(len(table)), *table)
+        return origins_off, files_off
+
+
+def pack_cascade(root: Path, data: Dict[str, Any], cmap: CascadeMap) -> bytes:
+    """Pack fully loaded ``data`` and ``cmap`` into a shared buffer image."""
+    packer = _Packer()
+    root_off = packer.value(data)
+    origins_off, files_off = packer.origins(cmap)
+    meta = pickle.dumps(
+        {
+            "root": str(root),
+            "fingerprints": cmap.fingerprints,
+            "configs": cmap.configs,
+        }
+    )
+    meta_off = packer._emit(meta)
+    out = packer.out
+    if len(out) > _MAX_OFFSET:
+        raise ValueError(f"{root} is too large to share ({len(out)} bytes)")
+    _HEADER.pack_into(
+        out, 0, MAGIC, root_off, origins_off, files_off, meta_off, len(meta)
+    )
+    return bytes(out)
+
+
+class CascadeBuffer:
+    """Read access to a packed cascade (see :func:`share_cascade`).
+
+    ``buf`` is any buffer supporting slicing and :mod:`struct` reads, usually
+    an :class:`mmap.mmap`. Reads never write to it, so the pages of a mapping
+    inherited across ``fork`` stay shared; safe to use from several threads.
+    """
+
+    def __init__(self, buf: Any) -> None:
+        self._buf = buf
+        magic, self._root, self._origins, self._files, meta_off, meta_len = (
+            _HEADER.unpack_from(buf, 0)
+        )
+        if magic != MAGIC:
+            raise ValueError("not a packed cascade")
+        meta = pickle.loads(buf[meta_off : meta_off + meta_len])
+        self.root = Path(meta["root"])
+        self.fingerprints = meta["fingerprints"]
+        self.configs = meta["configs"]
+        self._origin_count = _U32.unpack_from(buf, self._origins)[0]
+        # built per process on first use; small next to the data
+        self._file_paths: List[Path] = []
+        self._file_index: Dict[Path, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path | str) -> "CascadeBuffer":
+        """Map the packed cascade file at ``path`` read-only."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def size(self) -> int:
+        return len(self._buf)
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self) -> "CascadeBuffer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- values ------------------------------------------------------------
+
+    def data(self) -> "SharedNode":
+        return SharedNode(self, self._root)
+
+    def value(self, off: int) -> Any:
+        buf = self._buf
+        tag = buf[off]
+        if tag == _STR:
+            n = _U32.unpack_from(buf, off + 1)[0]
+            return buf[off + 5 : off + 5 + n].decode("utf-8")
+        if tag == _DICT:
+            return SharedNode(self, off)
+        if tag == _INT:
+            return _I64.unpack_from(buf, off + 1)[0]
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _FLOAT:
+            return _F64.unpack_from(buf, off + 1)[0]
+        if tag == _LIST:
+            n = _U32.unpack_from(buf, off + 1)[0]
+            return [self.value(o) for o in struct.unpack_from(f"<{n}I", buf, off + 5)]
+        n = _U32.unpack_from(buf, off + 1)[0]
+        return decode(buf[off + 5 : off + 5 + n])
+
+    def length(self, off: int) -> int:
+        return _U32.unpack_from(self._buf, off + 1)[0]
+
+    def items(self, off: int) -> List[Tuple[Any, Any]]:
+        """The ``(key, value)`` pairs of the dict at ``off``, in order."""
+        n = self.length(off)
+        flat = struct.unpack_from(f"<{2 * n}I", self._buf, off + 5)
+        return [
+            (self.value(flat[i]), self.value(flat[i + 1])) for i in range(0, 2 * n, 2)
+        ]
+
+    def _key_bytes(self, off: int) -> bytes:
+        buf = self._buf
+        if buf[off] == _STR:
+            n = _U32.unpack_from(buf, off + 1)[0]
+            return buf[off + 5 : off + 5 + n]
+        return _sort_key(self.value(off))
+
+    def lookup(self, off: int, key: Any) -> int:
+        """Offset of the value of ``key`` in the dict at ``off``, or -1."""
+        buf = self._buf
+        n = self.length(off)
+        pairs = off + 5
+        order = pairs + 8 * n
+        target = _sort_key(key)
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = _U32.unpack_from(buf, order + 4 * mid)[0]
+            key_off = _U32.unpack_from(buf, pairs + 8 * i)[0]
+            if self._key_bytes(key_off) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        # keys of other types (``1`` and ``"1"``) share a search string
+        for pos in range(lo, n):
+            i = _U32.unpack_from(buf, order + 4 * pos)[0]
+            key_off, value_off = _PAIR.unpack_from(buf, pairs + 8 * i)
+            if self._key_bytes(key_off) != target:
+                break
+            if (type(key) is str and buf[key_off] == _STR) or self.value(
+                key_off
+            ) == key:
+                return value_off
+        return -1
+
+    # -- origins -----------------------------------------------------------
+
+    def _blob(self, off: int) -> bytes:
+        n = _U32.unpack_from(self._buf, off)[0]
+        return self._buf[off + 4 : off + 4 + n]
+
+    def _entry(self, i: int) -> Tuple[int, int]:
+        return _PAIR.unpack_from(self._buf, self._origins + 4 + 8 * i)
+
+    def _entry_path(self, i: int) -> bytes:
+        return self._blob(self._entry(i)[0])
+
+    def _find(self, packed: bytes) -> int:
+        lo, hi = 0, self._origin_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry_path(mid) < packed:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def origins(self, kp: KeyPath) -> List[KeyOrigin]:
+        packed = pack_key_path(kp)
+        i = self._find(packed)
+        if i == self._origin_count or self._entry_path(i) != packed:
+            return []
+        listed = self._entry(i)[1]
+        n = _U32.unpack_from(self._buf, listed)[0]
+        flat = struct.unpack_from(f"<{2 * n}I", self._buf, listed + 4)
+        files = self.files()
+        return [
+            KeyOrigin(
+                file=files[flat[j]], local_path=unpack_key_path(self._blob(flat[j + 1]))
+            )
+            for j in range(0, 2 * n, 2)
+        ]
+
+    def has_origins(self, kp: KeyPath) -> bool:
+        packed = pack_key_path(kp)
+        i = self._find(packed)
+        return i < self._origin_count and self._entry_path(i) == packed
+
+    def has_descendant(self, kp: KeyPath) -> bool:
+        """Whether a key path strictly below ``kp`` has origins."""
+        packed = pack_key_path(kp)
+        i = self._find(packed)
+        if i < self._origin_count and self._entry_path(i) == packed:
+            i += 1
+        return i < self._origin_count and self._entry_path(i).startswith(packed)
+
+    def origin_paths(self) -> Iterator[KeyPath]:
+        for i in range(self._origin_count):
+            yield unpack_key_path(self._entry_path(i))
+
+    def count_origin_paths(self) -> int:
+        return self._origin_count
+
+    def files(self) -> List[Path]:
+        """The files owning at least one key path."""
+        if not self._file_paths:
+            with self._lock:
+                if not self._file_paths:
+                    n = _U32.unpack_from(self._buf, self._files)[0]
+                    flat = struct.unpack_from(f"<{2 * n}I", self._buf, self._files + 4)
+                    paths = [Path(self.value(flat[f])) for f in range(0, 2 * n, 2)]
+                    self._file_index = {p: f for f, p in enumerate(paths)}
+                    self._file_paths = paths
+        return self._file_paths
+
+    def key_paths(self, file: Path) -> Set[KeyPath]:
+        """The key paths ``file`` contributes."""
+        self.files()
+        f = self._file_index.get(Path(file))
+        if f is None:
+            return set()
+        listed = _PAIR.unpack_from(self._buf, self._files + 4 + 8 * f)[1]
+        n = _U32.unpack_from(self._buf, listed)[0]
+        return {
+            unpack_key_path(self._entry_path(i))
+            for i in struct.unpack_from(f"<{n}I", self._buf, listed + 4)
+        }
+
+
+class SharedNode(DeferredDict):
+    """A dict node read from a :class:`CascadeBuffer`.
+
+    Single-key reads (``node[key]``, ``get``, ``in``, ``len``) search the
+    buffer and decode only the value asked for; anything else decodes the
+    node's items once, into this process.
+    """
+
+    __slots__ = ("_buffer", "_offset")
+
+    def __init__(self, buffer: CascadeBuffer, offset: int) -> None:
+        super().__init__()
+        self._buffer = buffer
+        self._offset = offset
+
+    def _materialize(self) -> None:
+        with self._buffer._lock:
+            if self._loaded:
+                return
+            dict.update(self, self._buffer.items(self._offset))
+            self._loaded = True
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._loaded:
+            return dict.__getitem__(self, key)
+        off = self._buffer.lookup(self._offset, key)
+        if off < 0:
+            raise KeyError(key)
+        return self._buffer.value(off)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if self._loaded:
+            return dict.get(self, key, default)
+        off = self._buffer.lookup(self._offset, key)
+        return default if off < 0 else self._buffer.value(off)
+
+    def __contains__(self, key: object) -> bool:
+        if self._loaded:
+            return dict.__contains__(self, key)
+        return self._buffer.lookup(self._offset, key) >= 0
+
+    def __len__(self) -> int:
+        if self._loaded:
+            return dict.__len__(self)
+        return self._buffer.length(self._offset)
+
+    def _unread(self) -> bool:
+        # the buffer keeps its state after a refresh, so diffs compare it
+        return False
+
+    def _record_origins(self) -> None:
+        # the buffer's map holds every origin already
+        pass
+
+
+class _SharedReverse(Mapping[KeyPath, List[KeyOrigin]]):
+    def __init__(self, buffer: CascadeBuffer) -> None:
+        self._buffer = buffer
+
+    def __getitem__(self, kp: KeyPath) -> List[KeyOrigin]:
+        origins = self._buffer.origins(kp)
+        if not origins:
+            raise KeyError(kp)
+        return origins
+
+    def __contains__(self, kp: object) -> bool:
+        return isinstance(kp, tuple) and self._buffer.has_origins(kp)
+
+    def __iter__(self) -> Iterator[KeyPath]:
+        return self._buffer.origin_paths()
+
+    def __len__(self) -> int:
+        return self._buffer.count_origin_paths()
+
+
+class _SharedForward(Mapping[Path, Set[KeyPath]]):
+    def __init__(self, buffer: CascadeBuffer) -> None:
+        self._buffer = buffer
+
+    def __getitem__(self, file: Path) -> Set[KeyPath]:
+        kps = self._buffer.key_paths(file)
+        if not kps:
+            raise KeyError(file)
+        return kps
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._buffer.files())
+
+    def __len__(self) -> int:
+        return len(self._buffer.files())
+
+
+class SharedMap(CascadeMap):
+    """Read-only :class:`CascadeMap` whose origins are looked up in a
+    :class:`CascadeBuffer`."""
+
+    def __init__(self, buffer: CascadeBuffer) -> None:
+        super().__init__(
+            forward=_SharedForward(buffer),  # type: ignore[arg-type]
+            reverse=_SharedReverse(buffer),  # type: ignore[arg-type]
+            fingerprints=buffer.fingerprints,
+            configs=buffer.configs,
+        )
+        self.buffer = buffer
+
+    def add_origin(self, key_path: KeyPath, origin: KeyOrigin) -> None:
+        raise TypeError("The origin map of a shared cascade is read-only")
+
+    def descendant_test(self) -> Callable[[KeyPath], bool]:
+        return self.buffer.has_descendant
+
+
+def share_cascade(
+    root: Path | str, path: Path | str | None = None, **load_options: Any
+) -> CascadeBuffer:
+    """Load the cascade below ``root`` and pack it into a shared buffer.
+
+    Without ``path`` the buffer is an anonymous shared mapping, inherited by
+    processes forked afterwards. With ``path`` it is written to that file
+    (next to it first, then moved into place) and mapped; other processes
+    open it with :meth:`CascadeBuffer.open`. ``load_options`` go to
+    :func:`~data_cascade.loader.load_data_cascade`.
+    """
+    root_path = Path(root)
+    data, cmap = load_data_cascade(root_path, **load_options)
+    claim_origins(data)
+    image = pack_cascade(root_path, plain(data), cmap)
+    del data, cmap
+    log.info("Packed %s into %d shared bytes", root_path, len(image))
+    if path is None:
+        mm = mmap.mmap(-1, len(image))
+        mm[:] = image
+        return CascadeBuffer(mm)
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        tmp.write_bytes(image)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return CascadeBuffer.open(path)
+
+
+class SharedCascade(Cascade):
+    """Read-only cascade over a :class:`CascadeBuffer`.
+
+    Reads, queries, node proxies and :meth:`frozen` work as usual; nodes are
+    decoded from the buffer as they are read. Writes raise ``TypeError``;
+    ``refresh`` and watchers pack the cascade again to pick up changes.
+    """
+
+    def __init__(self, buffer: CascadeBuffer, **kwargs: Any) -> None:
+        super().__init__(buffer.root, buffer.data(), SharedMap(buffer), **kwargs)
+        self.buffer = buffer
+
+    def _write(self, pairs: List[Tuple[KeyPath, Any]]) -> None:
+        raise TypeError("A shared cascade is read-only")
+
+    def refresh(self) -> ChangeSet:
+        """Pack ``root`` again into a new anonymous buffer.
+
+        Only this process switches to it; processes sharing the previous
+        buffer (which is left open) keep reading the old state.
+        """
+        buffer = share_cascade(self.root, **self.load_options)
+        self.buffer = buffer
+        return self._reload(buffer.data(), SharedMap(buffer))
+
+    async def refresh_async(self, **kwargs: Any) -> ChangeSet:
+        return self.refresh()
+
+    def _reload_files(self, files: Set[Path], **options: Any) -> ChangeSet:
+        return self.refresh()
+
+    def _preload(self, **options: Any) -> None:
+        pass
+
+
+__all__ = [
+    "CascadeBuffer",
+    "SharedCascade",
+    "SharedMap",
+    "SharedNode",
+    "pack_cascade",
+    "share_cascade",
+]
@@ -0,0 +1,134 @@
+"""Timings and sizes collected while loading a cascade."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .compact import CompactReport
+
+# phases, in the order they happen for a directory
+LIST = "list"  # listing files and subdirectories
+PARSE = "parse"  # reading and parsing one file
+STRATEGY = "strategy"  # extracting merge strategies from config
+MERGE = "merge"  # merging a file's or subdirectory's content into the node
+ORIGINS = "origins"  # enumerating key paths and recording their origins
+MAP_MERGE = "map_merge"  # merging a subdirectory's origin map
+DIRECTORY = "directory"  # a whole directory, subdirectories included
+
+PHASES = (LIST, PARSE, STRATEGY, MERGE, ORIGINS, MAP_MERGE, DIRECTORY)
+
+
+@dataclass
+class Timing:
+    phase: str
+    path: Path
+    seconds: float = 0.0
+    bytes: int = 0
+    nodes: int = 0
+
+
+class LoadStats:
+    """Collects a :class:`Timing` per phase and file or directory.
+
+    Pass an instance as ``stats=`` to ``load_data_cascade``. Subclasses can
+    override :meth:`record` to stream timings elsewhere instead of keeping
+    them. ``directory`` timings include everything below the directory, all
+    other phases are exclusive.
+    """
+
+    def __init__(self) -> None:
+        self.timings: List[Timing] = []
+        # set by loads with ``compact=True``
+        self.compaction: Optional["CompactReport"] = None
+        self._lock = threading.Lock()
+
+    def record(self, timing: Timing) -> None:
+        with self._lock:
+            self.timings.append(timing)
+
+    @contextmanager
+    def measure(self, phase: str, path: Path) -> Iterator[Timing]:
+        timing = Timing(phase, path)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - start
+            self.record(timing)
+
+    def by_phase(self) -> Dict[str, float]:
+        """Total seconds per phase (``directory`` counts top-level only)."""
+        out: Dict[str, float] = defaultdict(float)
+        dirs = [t for t in self.timings if t.phase == DIRECTORY]
+        for t in self.timings:
+            if t.phase != DIRECTORY:
+                out[t.phase] += t.seconds
+        if dirs:
+            top = min(len(t.path.parts) for t in dirs)
+            out[DIRECTORY] = sum(t.seconds for t in dirs if len(t.path.parts) == top)
+        return dict(out)
+
+    def by_file(self) -> Dict[Path, Timing]:
+        """Per-file totals of the parse, merge and origins phases."""
+        out: Dict[Path, Timing] = {}
+        parsed = {t.path for t in self.timings if t.phase == PARSE}
+        for t in self.timings:
+            if t.path not in parsed:
+                continue
+            agg = out.setdefault(t.path, Timing("file", t.path))
+            agg.seconds += t.seconds
+            agg.bytes += t.bytes
+            agg.nodes += t.nodes
+        return out
+
+    def slowest(self, n: int = 10, phase: Optional[str] = None) -> List[Timing]:
+        """The ``n`` slowest files, or the slowest timings of one ``phase``."""
+        pool = (
+            list(self.by_file().values())
+            if phase is None
+            else [t for t in self.timings if t.phase == phase]
+        )
+        return sorted(pool, key=lambda t: t.seconds, reverse=True)[:n]
+
+    def report(self, top: int = 10) -> str:
+        """A plain-text summary: phase totals and the ``top`` slowest files."""
+        lines = ["phase         seconds"]
+        totals = self.by_phase()
+        for phase in PHASES:
+            if phase in totals:
+                lines.append(f"{phase:<12} {totals[phase]:>9.4f}")
+        files = self.by_file()
+        lines.append("")
+        lines.append(
+            f"{len(files)} files, {sum(t.bytes for t in files.values())} bytes, "
+            f"{sum(t.nodes for t in files.values())} key paths"
+        )
+        if self.compaction is not None:
+            c = self.compaction
+            lines.append(
+                f"compaction saved {c.saved} of {c.bytes_before} bytes "
+                f"({c.strings_shared} strings, {c.values_shared} values shared)"
+            )
+        lines.append(f"slowest {top} files:")
+        for t in self.slowest(top):
+            lines.append(f"{t.seconds:>9.4f}s {t.bytes:>10}B {t.nodes:>7}  {t.path}")
+        return "\n".join(lines)
+
+
+def measure(
+    stats: Optional[LoadStats], phase: str, path: Path
+) -> ContextManager[Optional[Timing]]:
+    """``stats.measure(...)``, or a no-op context yielding ``None``."""
+    if stats is None:
+        return nullcontext()
+    return stats.measure(phase, path)
+
+
+__all__ = ["LoadStats", "Timing", "PHASES"]
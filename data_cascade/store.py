@@ -0,0 +1,519 @@
+"""Cascades compiled into a SQLite file and read from it on demand.
+
+:func:`compile_store` loads a cascade once and writes its merged values,
+origins, fingerprints and directory configs to a SQLite file. A
+:class:`CascadeStore` opened on that file answers value, prefix and origin
+lookups with indexed queries, and :class:`SqliteCascade` is a
+:class:`~data_cascade.cascade.Cascade` whose data and map are read from a store
+as they are accessed, so workers never hold the whole merged tree.
+
+Key paths are stored as BLOBs of NUL-terminated UTF-8 segments: the key paths
+below a prefix form one contiguous range of an index, ordered like the tuples.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pickle
+import sqlite3
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .aio import DEFAULT_CONCURRENCY
+from .cascade import Cascade, ConcurrentCascade
+from .codec import decode, encode
+from .config import SUPPORTED_EXTS_DEFAULT
+from .deferred import DeferredDict, plain
+from .diff import ChangeSet
+from .fs import FileStamp, root_stamps
+from .layered import claim_origins
+from .loader import load_data_cascade
+from .logging_utils import get_logger
+from .mapping import (
+    CascadeMap,
+    DirectoryConfig,
+    KeyOrigin,
+    KeyPath,
+    pack_key_path,
+    unpack_key_path,
+)
+
+log = get_logger(__name__)
+
+STORE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE nodes (
+    path BLOB PRIMARY KEY,
+    parent BLOB,
+    pos INTEGER NOT NULL,
+    key,
+    kind INTEGER NOT NULL,
+    value BLOB
+) WITHOUT ROWID;
+CREATE INDEX nodes_parent ON nodes (parent, pos);
+CREATE TABLE origins (
+    path BLOB NOT NULL,
+    pos INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    local_path BLOB NOT NULL,
+    PRIMARY KEY (path, pos)
+) WITHOUT ROWID;
+CREATE INDEX origins_file ON origins (file);
+CREATE TABLE fingerprints (file TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE sources (file TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE configs (path BLOB PRIMARY KEY, payload BLOB);
+"""
+
+# node kinds
+_LEAF, _DICT, _LIST = 0, 1, 2
+
+_BATCH = 1000
+
+
+def _below(kp: KeyPath) -> Tuple[bytes, bytes]:
+    # bounds of the key paths strictly below ``kp``
+    prefix = pack_key_path(kp)
+    return prefix, prefix + b"\xff"
+
+
+def _options_key(load_options: Mapping[str, Any]) -> str:
+    # the load options a compiled store depends on
+    def norm(v: Any) -> Any:
+        if v is None or isinstance(v, str):
+            return v
+        return tuple(norm(x) for x in v)
+
+    return repr(
+        (
+            norm(load_options.get("allowed_exts", SUPPORTED_EXTS_DEFAULT)),
+            norm(load_options.get("include")),
+            norm(load_options.get("exclude")),
+        )
+    )
+
+
+def _node_rows(
+    obj: Any, kp: KeyPath, parent: Optional[bytes], pos: int, key: Any
+) -> Iterator[tuple]:
+    path = pack_key_path(kp)
+    if isinstance(obj, dict):
+        yield (path, parent, pos, key, _DICT, None)
+        for i, (k, v) in enumerate(obj.items()):
+            # keys other than strings (e.g. YAML integers) keep their type
+            stored = k if isinstance(k, str) else encode(k)
+            yield from _node_rows(v, kp + (str(k),), path, i, stored)
+    elif isinstance(obj, list):
+        yield (path, parent, pos, key, _LIST, None)
+        for i, v in enumerate(obj):
+            yield from _node_rows(v, kp + (str(i),), path, i, i)
+    else:
+        yield (path, parent, pos, key, _LEAF, encode(obj))
+
+
+def _write_store(
+    path: Path,
+    root: Path,
+    data: Dict[str, Any],
+    cmap: CascadeMap,
+    sources: Dict[Path, FileStamp],
+    options_key: str,
+) -> None:
+    db = sqlite3.connect(path)
+    try:
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.executescript(_SCHEMA)
+        with db:
+            db.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("version", str(STORE_VERSION)),
+                    ("root", str(root)),
+                    ("options", options_key),
+                ],
+            )
+            db.executemany(
+                "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?)",
+                _node_rows(data, (), None, 0, None),
+            )
+            db.executemany(
+                "INSERT INTO origins VALUES (?, ?, ?, ?)",
+                (
+                    (pack_key_path(kp), i, str(o.file), pack_key_path(o.local_path))
+                    for kp, origins in cmap.reverse.items()
+                    for i, o in enumerate(origins)
+                ),
+            )
+            for table, stamps in (
+                ("fingerprints", cmap.fingerprints),
+                ("sources", sources),
+            ):
+                db.executemany(
+                    f"INSERT INTO {table} VALUES (?, ?, ?)",
+                    ((str(f), st[0], st[1]) for f, st in stamps.items()),
+                )
+            db.executemany(
+                "INSERT INTO configs VALUES (?, ?)",
+                (
+                    (pack_key_path(kp), pickle.dumps(dc))
+                    for kp, dc in cmap.configs.items()
+                ),
+            )
+    finally:
+        db.close()
+
+
+def compile_store(
+    root: Path | str, path: Path | str, **load_options: Any
+) -> "CascadeStore":
+    """Load the cascade below ``root`` and compile it into a store at ``path``.
+
+    ``load_options`` go to :func:`~data_cascade.loader.load_data_cascade`. The
+    file is written next to ``path`` and moved into place, so processes that
+    have the previous store open keep reading it consistently.
+    """
+    root_path = Path(root)
+    path = Path(path)
+    allowed_exts = load_options.get("allowed_exts", SUPPORTED_EXTS_DEFAULT)
+    # taken before loading, so a file changed during the load makes the store
+    # stale rather than silently out of date
+    sources = root_stamps(root_path, allowed_exts)
+    data, cmap = load_data_cascade(root_path, **load_options)
+    claim_origins(data)
+    data = plain(data)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        _write_store(tmp, root_path, data, cmap, sources, _options_key(load_options))
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    log.info("Compiled %s into %s", root_path, path)
+    return CascadeStore(path)
+
+
+def open_store(
+    root: Path | str, path: Path | str, **load_options: Any
+) -> "CascadeStore":
+    """Open the store at ``path``, (re)compiling it from ``root`` first if it is
+    missing, was compiled from another root or with other options, or any file
+    below ``root`` changed since."""
+    root_path = Path(root)
+    if Path(path).exists():
+        try:
+            store = CascadeStore(path)
+        except (sqlite3.DatabaseError, ValueError) as e:
+            log.warning("Recompiling unreadable store %s: %s", path, e)
+        else:
+            if store.root == root_path and store.is_current(**load_options):
+                return store
+            store.close()
+    return compile_store(root_path, path, **load_options)
+
+
+class CascadeStore:
+    """A compiled cascade in a SQLite file (see :func:`compile_store`).
+
+    Opened read-only; safe to share between threads (queries are serialized)
+    but not across ``fork``: open it in each worker process.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._db = sqlite3.connect(
+            self.path.resolve().as_uri() + "?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        self._lock = threading.RLock()
+        meta = dict(self._fetch("SELECT key, value FROM meta"))
+        if meta.get("version") != str(STORE_VERSION):
+            self._db.close()
+            raise ValueError(f"{path} is not a version {STORE_VERSION} store")
+        self.root = Path(meta["root"])
+        self._options_key = meta["options"]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "CascadeStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _fetch(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _stream(self, sql: str, params: tuple = ()) -> Iterator[tuple]:
+        # fetched in batches so that other threads can query in between
+        with self._lock:
+            cur = self._db.execute(sql, params)
+            rows = cur.fetchmany(_BATCH)
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cur.fetchmany(_BATCH)
+
+    def is_current(self, **load_options: Any) -> bool:
+        """Whether the store matches ``load_options`` and the files below its
+        root."""
+        if self._options_key != _options_key(load_options):
+            return False
+        allowed_exts = load_options.get("allowed_exts", SUPPORTED_EXTS_DEFAULT)
+        return self.sources() == root_stamps(self.root, allowed_exts)
+
+    # -- values ------------------------------------------------------------
+
+    def _value(self, kp: KeyPath, kind: int, value: Optional[bytes]) -> Any:
+        if kind == _LEAF:
+            return decode(value)  # type: ignore[arg-type]
+        if kind == _DICT:
+            return StoreNode(self, kp)
+        return [v for _, v in self.children(kp)]
+
+    def children(self, kp: KeyPath) -> List[Tuple[Any, Any]]:
+        """The ``(key, value)`` pairs of the container at ``kp``, in order.
+
+        Dicts are returned as unloaded :class:`StoreNode` mappings, lists in
+        full.
+        """
+        rows = self._fetch(
+            "SELECT key, kind, value FROM nodes WHERE parent = ? ORDER BY pos",
+            (pack_key_path(kp),),
+        )
+        out = []
+        for key, kind, value in rows:
+            if isinstance(key, bytes):
+                key = decode(key)
+            out.append((key, self._value(kp + (str(key),), kind, value)))
+        return out
+
+    def get(self, kp: KeyPath, default: Any = None) -> Any:
+        rows = self._fetch(
+            "SELECT kind, value FROM nodes WHERE path = ?", (pack_key_path(kp),)
+        )
+        if not rows:
+            return default
+        return self._value(kp, *rows[0])
+
+    def leaves(self, prefix: KeyPath = ()) -> Iterator[Tuple[KeyPath, Any]]:
+        """Yield the scalar values at or below ``prefix`` with their key paths,
+        in key-path order."""
+        lo, hi = _below(prefix)
+        for path, value in self._stream(
+            "SELECT path, value FROM nodes WHERE kind = ? AND path >= ? AND path < ?"
+            " ORDER BY path",
+            (_LEAF, lo, hi),
+        ):
+            yield unpack_key_path(path), decode(value)
+
+    # -- origins -----------------------------------------------------------
+
+    def origins(self, kp: KeyPath) -> List[KeyOrigin]:
+        return [
+            KeyOrigin(file=Path(file), local_path=unpack_key_path(local))
+            for file, local in self._fetch(
+                "SELECT file, local_path FROM origins WHERE path = ? ORDER BY pos",
+                (pack_key_path(kp),),
+            )
+        ]
+
+    def has_origins(self, kp: KeyPath) -> bool:
+        return bool(
+            self._fetch(
+                "SELECT 1 FROM origins WHERE path = ? LIMIT 1", (pack_key_path(kp),)
+            )
+        )
+
+    def has_descendant(self, kp: KeyPath) -> bool:
+        """Whether a key path strictly below ``kp`` has origins."""
+        lo, hi = _below(kp)
+        return bool(
+            self._fetch(
+                "SELECT 1 FROM origins WHERE path > ? AND path < ? LIMIT 1", (lo, hi)
+            )
+        )
+
+    def origin_paths(self) -> Iterator[KeyPath]:
+        for (path,) in self._stream("SELECT DISTINCT path FROM origins ORDER BY path"):
+            yield unpack_key_path(path)
+
+    def count_origin_paths(self) -> int:
+        return self._fetch("SELECT COUNT(DISTINCT path) FROM origins")[0][0]
+
+    def files(self) -> List[Path]:
+        """The files owning at least one key path."""
+        return [Path(f) for (f,) in self._fetch("SELECT DISTINCT file FROM origins")]
+
+    def key_paths(self, file: Path) -> Set[KeyPath]:
+        """The key paths ``file`` contributes."""
+        return {
+            unpack_key_path(path)
+            for (path,) in self._fetch(
+                "SELECT path FROM origins WHERE file = ?", (str(file),)
+            )
+        }
+
+    def fingerprints(self) -> Dict[Path, FileStamp]:
+        return self._stamps("fingerprints")
+
+    def sources(self) -> Dict[Path, FileStamp]:
+        """Stamps of the files below the root when the store was compiled."""
+        return self._stamps("sources")
+
+    def _stamps(self, table: str) -> Dict[Path, FileStamp]:
+        return {
+            Path(f): (mtime, size)
+            for f, mtime, size in self._fetch(f"SELECT * FROM {table}")
+        }
+
+    def configs(self) -> Dict[KeyPath, DirectoryConfig]:
+        return {
+            unpack_key_path(path): pickle.loads(payload)
+            for path, payload in self._fetch("SELECT path, payload FROM configs")
+        }
+
+
+class StoreNode(DeferredDict):
+    """A dict node whose children are read from a store on first access."""
+
+    __slots__ = ("_store", "_key_path")
+
+    def __init__(self, store: CascadeStore, key_path: KeyPath) -> None:
+        super().__init__()
+        self._store = store
+        self._key_path = key_path
+
+    def _materialize(self) -> None:
+        with self._store._lock:
+            if self._loaded:
+                return
+            dict.update(self, self._store.children(self._key_path))
+            self._loaded = True
+
+    def _unread(self) -> bool:
+        # a replaced store still holds the state it was compiled from, so
+        # refresh diffs compare its nodes whether or not they were read
+        return False
+
+    def _record_origins(self) -> None:
+        # the store's map holds every origin already
+        pass
+
+
+class _StoreReverse(Mapping[KeyPath, List[KeyOrigin]]):
+    def __init__(self, store: CascadeStore) -> None:
+        self._store = store
+
+    def __getitem__(self, kp: KeyPath) -> List[KeyOrigin]:
+        origins = self._store.origins(kp)
+        if not origins:
+            raise KeyError(kp)
+        return origins
+
+    def __contains__(self, kp: object) -> bool:
+        return isinstance(kp, tuple) and self._store.has_origins(kp)
+
+    def __iter__(self) -> Iterator[KeyPath]:
+        return self._store.origin_paths()
+
+    def __len__(self) -> int:
+        return self._store.count_origin_paths()
+
+
+class _StoreForward(Mapping[Path, Set[KeyPath]]):
+    def __init__(self, store: CascadeStore) -> None:
+        self._store = store
+
+    def __getitem__(self, file: Path) -> Set[KeyPath]:
+        kps = self._store.key_paths(file)
+        if not kps:
+            raise KeyError(file)
+        return kps
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._store.files())
+
+    def __len__(self) -> int:
+        return len(self._store.files())
+
+
+class StoreMap(CascadeMap):
+    """Read-only :class:`CascadeMap` whose origins are looked up in a store.
+
+    Fingerprints and directory configs (one per file or directory) are read
+    up front.
+    """
+
+    def __init__(self, store: CascadeStore) -> None:
+        super().__init__(
+            forward=_StoreForward(store),  # type: ignore[arg-type]
+            reverse=_StoreReverse(store),  # type: ignore[arg-type]
+            fingerprints=store.fingerprints(),
+            configs=store.configs(),
+        )
+        self.store = store
+
+    def add_origin(self, key_path: KeyPath, origin: KeyOrigin) -> None:
+        raise TypeError("The origin map of a compiled store is read-only")
+
+    def descendant_test(self) -> Callable[[KeyPath], bool]:
+        return self.store.has_descendant
+
+
+class SqliteCascade(Cascade):
+    """Cascade reading its data and origins from a :class:`CascadeStore`.
+
+    Nodes are fetched from the store as they are accessed and kept; edits
+    stay in memory and :meth:`save` writes them to the source files below
+    :attr:`root` as usual. :meth:`refresh` recompiles the store.
+    """
+
+    def __init__(self, store: CascadeStore, **kwargs: Any) -> None:
+        super().__init__(store.root, StoreNode(store, ()), StoreMap(store), **kwargs)
+        self.store = store
+
+    def refresh(self) -> ChangeSet:
+        # the old store file is replaced, not rewritten: nodes not read yet
+        # from it stay readable for the diff
+        store = compile_store(self.root, self.store.path, **self.load_options)
+        self.store = store
+        return self._reload(StoreNode(store, ()), StoreMap(store))
+
+    async def refresh_async(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> ChangeSet:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.refresh)
+
+    def _reload_files(self, files: Set[Path], **options: Any) -> ChangeSet:
+        # the store is compiled again with its own options
+        return self.refresh()
+
+    def _preload(self, **options: Any) -> None:
+        pass
+
+
+class ConcurrentSqliteCascade(SqliteCascade, ConcurrentCascade):
+    """Thread-safe :class:`SqliteCascade`; see :class:`ConcurrentCascade`."""
+
+
+__all__ = [
+    "CascadeStore",
+    "SqliteCascade",
+    "ConcurrentSqliteCascade",
+    "StoreMap",
+    "StoreNode",
+    "compile_store",
+    "open_store",
+]
@@ -2,26 +2,329 @@
 
 from __future__ import annotations
 
+import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
-from .config import CONFIG_STEM, MAIN_STEM, SUPPORTED_EXTS_DEFAULT
-from .fs import list_dirs, list_files
+from .config import CONFIG_STEM, MAIN_STEM, SUPPORTED_EXTS_DEFAULT, file_stem
+from .deferred import DeferredDict
+from .filters import PathFilter
+from .fs import FileSystem, local_fs
 from .io import load_file
-from .logging_utils import get_logger
-from .mapping import CascadeMap, KeyOrigin, KeyPath, enumerate_paths, merge_maps
+from .logging_utils import get_logger, tracer
+from .mapping import (
+    CascadeMap,
+    DirectoryConfig,
+    KeyOrigin,
+    KeyPath,
+    enumerate_paths,
+    merge_maps,
+)
 from .merge.merge import deep_merge_dicts, merge_lists
 from .merge.strategy import MergeStrategy, extract_strategy_from_node
+from .stats import (
+    DIRECTORY,
+    LIST,
+    MAP_MERGE,
+    MERGE,
+    ORIGINS,
+    PARSE,
+    STRATEGY,
+    LoadStats,
+    measure,
+)
 
 log = get_logger(__name__)
 
+# inherited strategy and default config, node and map of a cached directory
+_CachedDir = Tuple[
+    MergeStrategy, Optional[Mapping[str, Any]], Dict[str, Any], CascadeMap
+]
+
 
 def _assign_origins_for_subtree(
     base_path: KeyPath, content: Any, file_path: Path, cmap: CascadeMap
-) -> None:
+) -> int:
+    count = 0
     for rel_path in enumerate_paths(content):
         full: KeyPath = tuple(list(base_path) + list(rel_path))
         cmap.add_origin(full, KeyOrigin(file=file_path, local_path=rel_path))
+        count += 1
+    return count
+
+
+def _skipped_by_filter(path_filter: Optional[PathFilter], key: str) -> bool:
+    return path_filter is not None and not path_filter.wants(key)
+
+
+def collect_files(
+    directory: Path,
+    allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+    path_filter: Optional[PathFilter] = None,
+    fs: FileSystem = local_fs,
+) -> List[Path]:
+    """List every file ``load_directory_node`` may parse below ``directory``.
+
+    Merge-strategy excludes are not known before parsing, so excluded stems and
+    directories are included; the result is a superset suitable for prefetching.
+    """
+    out = []
+    for f in fs.list_files(directory, allowed_exts):
+        stem = file_stem(f)
+        if stem in (CONFIG_STEM, MAIN_STEM) or not _skipped_by_filter(
+            path_filter, stem
+        ):
+            out.append(f)
+    for subdir in fs.list_dirs(directory):
+        if subdir.name in (CONFIG_STEM, MAIN_STEM):
+            continue
+        if _skipped_by_filter(path_filter, subdir.name):
+            continue
+        child_filter = path_filter.child(subdir.name) if path_filter else None
+        out.extend(collect_files(subdir, allowed_exts, child_filter, fs))
+    return out
+
+
+def _record_stamp(cmap: CascadeMap, file_path: Path, fs: FileSystem) -> None:
+    try:
+        cmap.fingerprints[file_path] = fs.stat(file_path)
+    except OSError:
+        pass
+
+
+def _parse(
+    loader: Callable[[Path], Any],
+    file_path: Path,
+    cmap: CascadeMap,
+    stats: Optional[LoadStats],
+    fs: FileSystem = local_fs,
+) -> Any:
+    _record_stamp(cmap, file_path, fs)
+    if stats is None:
+        return loader(file_path)
+    with stats.measure(PARSE, file_path) as timing:
+        if file_path in cmap.fingerprints:
+            timing.bytes = cmap.fingerprints[file_path][1]
+        return loader(file_path)
+
+
+def _merge_sibling(
+    node: Dict[str, Any],
+    stem: str,
+    content: Any,
+    strategy: MergeStrategy,
+    file_path: Path,
+) -> None:
+    # merge a sibling file's content into the key ``stem`` already in ``node``
+    if isinstance(node[stem], dict) and isinstance(content, dict):
+        if tracer.on:
+            tracer.emit(log, "Merging dict child node for key %s", stem)
+        node[stem] = deep_merge_dicts(node[stem], content, strategy.for_child(stem))
+    elif isinstance(node[stem], list) and isinstance(content, list):
+        if tracer.on:
+            tracer.emit(log, "Merging list child node for key %s", stem)
+        node[stem] = merge_lists(
+            node[stem], content, strategy.for_child(stem).list_strategy
+        )
+    else:
+        log.warning(
+            "Type mismatch when merging key %s from file %s; skipping",
+            stem,
+            file_path,
+        )
+
+
+def _assign_main_origins(file_path: Path, content: Any, cmap: CascadeMap) -> int:
+    # give a ``__main__`` file the key paths no sibling file owns
+    count = 0
+    for rel_path in enumerate_paths(content):
+        if not rel_path:
+            continue  # skip () root-container path
+        if rel_path not in cmap.reverse:
+            cmap.add_origin(rel_path, KeyOrigin(file=file_path, local_path=rel_path))
+            count += 1
+    return count
+
+
+def _merge_child_dir(
+    node: Dict[str, Any],
+    child_key: str,
+    child_node: Dict[str, Any],
+    strategy: MergeStrategy,
+) -> None:
+    # merge a subdirectory's node into the key ``child_key`` already in ``node``
+    if isinstance(node[child_key], dict) and isinstance(child_node, dict):
+        if tracer.on:
+            tracer.emit(log, "Merging dict child node for %s", child_key)
+        node[child_key] = deep_merge_dicts(
+            node[child_key], child_node, strategy.for_child(child_key)
+        )
+    if isinstance(node[child_key], list) and isinstance(child_node, list):
+        if tracer.on:
+            tracer.emit(log, "Merging list child node for %s", child_key)
+        node[child_key] = merge_lists(
+            node[child_key],
+            child_node,
+            strategy.for_child(child_key).list_strategy,
+        )
+
+
+def _read_default_config(
+    loader: Callable[[Path], Any],
+    file_path: Path,
+    config: Optional[Mapping[str, Any]],
+    cmap: CascadeMap,
+    stats: Optional[LoadStats],
+    fs: FileSystem = local_fs,
+) -> Optional[Mapping[str, Any]]:
+    # merge a ``__config__`` file over the default config in effect so far
+    try:
+        cfg_content = _parse(loader, file_path, cmap, stats, fs) or {}
+    except Exception as e:
+        log.error("Failed to load config file %s: %s", file_path, e)
+        return config
+    if not isinstance(cfg_content, Mapping):
+        log.warning("Config file %s does not contain a mapping; ignoring", file_path)
+        return config
+    if config and isinstance(config, Mapping):
+        log.info("Merging directory default config from %s", file_path)
+        merged_cfg = dict(config)
+        merged_cfg.update(cfg_content)
+        return merged_cfg
+    log.info("Setting directory default config from %s", file_path)
+    return dict(cfg_content)
+
+
+class LazyContext:
+    """Shared state of one lazy load.
+
+    ``cmap`` is the map lazily loaded subtrees add their origins to; ``lock``
+    serializes materialization; ``stats`` collects timings of deferred loads;
+    ``fs`` is the file system deferred loads read from.
+    """
+
+    def __init__(
+        self, stats: Optional[LoadStats] = None, fs: FileSystem = local_fs
+    ) -> None:
+        self.cmap: Optional[CascadeMap] = None
+        self.lock = threading.RLock()
+        self.stats = stats
+        self.fs = fs
+
+
+class DirectoryCache:
+    """Merged subdirectories kept between loads of the same tree.
+
+    A subdirectory's node and map are reused while no file below it changed
+    (see :meth:`invalidate`) and it inherits the same strategy and default
+    config. Reused nodes are shared with the previous load's data, so the
+    data must not be modified in place (write copy-on-write).
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Path, _CachedDir] = {}
+
+    def get(
+        self,
+        directory: Path,
+        strategy: MergeStrategy,
+        config: Optional[Mapping[str, Any]],
+    ) -> Optional[Tuple[Dict[str, Any], CascadeMap]]:
+        entry = self._entries.get(directory)
+        if entry is None or entry[0] != strategy or entry[1] != config:
+            return None
+        return entry[2], entry[3]
+
+    def put(
+        self,
+        directory: Path,
+        strategy: MergeStrategy,
+        config: Optional[Mapping[str, Any]],
+        node: Dict[str, Any],
+        cmap: CascadeMap,
+    ) -> None:
+        self._entries[directory] = (strategy, config, node, cmap)
+
+    def invalidate(self, paths: Iterable[Path]) -> None:
+        """Drop the directories containing ``paths`` (files or directories
+        added, removed or modified)."""
+        for p in paths:
+            for d in p.parents:
+                self._entries.pop(d, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class LazyDirNode(DeferredDict):
+    """Placeholder for a subdirectory that is loaded on first access.
+
+    On materialization the directory is loaded with the strategy and default
+    config it would have inherited eagerly, merged over the content a sibling
+    ``<dir>.*`` file already contributed, and its origins are added to the
+    context's map under the node's key path.
+    """
+
+    __slots__ = (
+        "_ctx",
+        "_directory",
+        "_key_path",
+        "_base",
+        "_strategy",
+        "_default_config",
+        "_allowed_exts",
+        "_loader",
+        "_path_filter",
+    )
+
+    def __init__(
+        self,
+        ctx: LazyContext,
+        directory: Path,
+        key_path: KeyPath,
+        base: Optional[Dict[str, Any]],
+        strategy: MergeStrategy,
+        default_config: Optional[Mapping[str, Any]],
+        allowed_exts: tuple[str, ...],
+        loader: Callable[[Path], Any],
+        path_filter: Optional[PathFilter] = None,
+    ):
+        super().__init__()
+        self._ctx = ctx
+        self._directory = directory
+        self._key_path = key_path
+        self._base = base
+        self._strategy = strategy
+        self._default_config = default_config
+        self._allowed_exts = allowed_exts
+        self._loader = loader
+        self._path_filter = path_filter
+
+    def _materialize(self) -> None:
+        with self._ctx.lock:
+            if self._loaded:
+                return
+            log.debug("Materializing lazy directory %s", self._directory)
+            child_node, child_map = load_directory_node(
+                self._directory,
+                inherited_strategy=self._strategy,
+                inherited_default_config=self._default_config,
+                allowed_exts=self._allowed_exts,
+                loader=self._loader,
+                lazy=self._ctx,
+                key_path=self._key_path,
+                path_filter=self._path_filter,
+                stats=self._ctx.stats,
+                fs=self._ctx.fs,
+            )
+            if self._base is not None:
+                child_node = deep_merge_dicts(self._base, child_node, self._strategy)
+            dict.update(self, child_node)
+            if self._ctx.cmap is not None:
+                self._ctx.cmap.merge_in(child_map, prefix=self._key_path)
+            self._base = None
+            self._loaded = True
 
 
 def load_directory_node(
@@ -29,43 +332,82 @@ def load_directory_node(
     inherited_strategy: Optional[MergeStrategy] = None,
     inherited_default_config: Optional[Mapping[str, Any]] = None,
     allowed_exts: tuple[str, ...] = SUPPORTED_EXTS_DEFAULT,
+    loader: Callable[[Path], Any] = load_file,
+    lazy: Optional[LazyContext] = None,
+    key_path: KeyPath = (),
+    path_filter: Optional[PathFilter] = None,
+    stats: Optional[LoadStats] = None,
+    fs: FileSystem = local_fs,
+    dir_cache: Optional[DirectoryCache] = None,
+) -> Tuple[Dict[str, Any], CascadeMap]:
+    """Load and merge ``directory`` into a node plus its origin map.
+
+    With a ``lazy`` context subdirectories become :class:`LazyDirNode`
+    placeholders (``key_path`` is the node's path from the cascade root).
+    Sibling files and subdirectories rejected by ``path_filter`` are neither
+    parsed nor walked. ``stats`` receives per-phase timings. Directories are
+    listed and files stamped through ``fs``; ``loader`` must read from it too.
+    Subdirectories are reused from and stored in ``dir_cache`` (not with
+    ``lazy``).
+    """
+    with measure(stats, DIRECTORY, directory) as timing:
+        node, cmap = _load_directory_node(
+            directory,
+            inherited_strategy,
+            inherited_default_config,
+            allowed_exts,
+            loader,
+            lazy,
+            key_path,
+            path_filter,
+            stats,
+            fs,
+            dir_cache if lazy is None else None,
+        )
+        if timing is not None:
+            timing.nodes = len(cmap.reverse)
+    return node, cmap
+
+
+def _load_directory_node(
+    directory: Path,
+    inherited_strategy: Optional[MergeStrategy],
+    inherited_default_config: Optional[Mapping[str, Any]],
+    allowed_exts: tuple[str, ...],
+    loader: Callable[[Path], Any],
+    lazy: Optional[LazyContext],
+    key_path: KeyPath,
+    path_filter: Optional[PathFilter],
+    stats: Optional[LoadStats],
+    fs: FileSystem,
+    dir_cache: Optional[DirectoryCache],
 ) -> Tuple[Dict[str, Any], CascadeMap]:
     strategy = inherited_strategy or MergeStrategy()
     node: Dict[str, Any] = {}
     cmap = CascadeMap()
 
     dir_default_config: Optional[Mapping[str, Any]] = inherited_default_config
-    listed_files = list(list_files(directory, allowed_exts))
+    with measure(stats, LIST, directory):
+        listed_files = fs.list_files(directory, allowed_exts)
     files_to_process = list()
     for file_path in listed_files:
-        if file_path.stem == CONFIG_STEM:
-            try:
-                cfg_content = load_file(file_path) or {}
-            except Exception as e:
-                log.error("Failed to load config file %s: %s", file_path, e)
-                continue
-            if isinstance(cfg_content, Mapping):
-                if dir_default_config and isinstance(dir_default_config, Mapping):
-                    log.info("Merging directory default config from %s", file_path)
-                    merged_cfg = dict(dir_default_config)
-                    merged_cfg.update(cfg_content)
-                    dir_default_config = merged_cfg
-                else:
-                    log.info("Setting directory default config from %s", file_path)
-                    dir_default_config = dict(cfg_content)
-            else:
-                log.warning(
-                    "Config file %s does not contain a mapping; ignoring", file_path
-                )
-        elif file_path.stem == MAIN_STEM:
+        stem = file_stem(file_path)
+        if stem == CONFIG_STEM:
+            dir_default_config = _read_default_config(
+                loader, file_path, dir_default_config, cmap, stats, fs
+            )
+        elif stem == MAIN_STEM:
             files_to_process.insert(0, file_path)
+        elif _skipped_by_filter(path_filter, stem):
+            log.debug("Skipping %s outside the requested paths", file_path)
         else:
             files_to_process.append(file_path)
 
     if isinstance(dir_default_config, Mapping):
-        strategy = extract_strategy_from_node(
-            {"__config__": dir_default_config}, strategy
-        )
+        with measure(stats, STRATEGY, directory):
+            strategy = extract_strategy_from_node(
+                {"__config__": dir_default_config}, strategy
+            )
 
     # Sibling-file origin assignments happen in the main loop below.
     # __main__ origin assignments are deferred until after siblings so that
@@ -73,74 +415,65 @@ def load_directory_node(
     main_files_for_origin: list[tuple[Path, Any]] = []
 
     for file_path in files_to_process:
-        log.debug("Processing file %s", file_path)
-        stem = file_path.stem
+        if tracer.on:
+            tracer.emit(log, "Processing file %s", file_path)
+        stem = file_stem(file_path)
         if stem == CONFIG_STEM:
             continue
         if stem in strategy.excludes:
             log.debug("Excluding stem %s due to strategy excludes", stem)
             continue
         try:
-            content = load_file(file_path)
+            content = _parse(loader, file_path, cmap, stats, fs)
         except Exception as e:
             log.warning("Skipping file %s due to load error: %s", file_path, e)
             continue
         if content is None:
             content = {}
-        if (
-            isinstance(content, Mapping)
-            and dir_default_config
-            and "__config__" not in content
-        ):
-            tmp = dict(content)
-            tmp["__config__"] = dict(dir_default_config)
-            content = tmp
         if stem == MAIN_STEM:
             if not isinstance(content, Mapping):
                 raise RuntimeError(
                     f"{file_path} must contain a mapping for {MAIN_STEM}"
                 )
-            node = deep_merge_dicts(node, content, strategy)
+            if stats is None:
+                node = deep_merge_dicts(node, content, strategy)
+            else:
+                with stats.measure(MERGE, file_path):
+                    node = deep_merge_dicts(node, content, strategy)
             main_files_for_origin.append((file_path, content))
             continue
-        if stem in node:
-            if isinstance(node[stem], dict) and isinstance(content, dict):
-                log.debug("Merging dict child node for key %s", stem)
-                node[stem] = deep_merge_dicts(
-                    node[stem], content, strategy.for_child(stem)
-                )
-            elif isinstance(node[stem], list) and isinstance(content, list):
-                log.debug("Merging list child node for key %s", stem)
-                node[stem] = merge_lists(
-                    node[stem], content, strategy.for_child(stem).list_strategy
-                )
-            else:
-                log.warning(
-                    "Type mismatch when merging key %s from file %s; skipping",
-                    stem,
-                    file_path,
-                )
-                node[stem] = content if stem not in node else node[stem]
+        if stem not in node:
+            node[stem] = content
+        elif stats is None:
+            _merge_sibling(node, stem, content, strategy, file_path)
         else:
-            node[stem] = content if stem not in node else node[stem]
+            with stats.measure(MERGE, file_path):
+                _merge_sibling(node, stem, content, strategy, file_path)
         base = (stem,)
-        _assign_origins_for_subtree(base, content, file_path, cmap)
+        if stats is None:
+            _assign_origins_for_subtree(base, content, file_path, cmap)
+        else:
+            with stats.measure(ORIGINS, file_path) as timing:
+                timing.nodes = _assign_origins_for_subtree(
+                    base, content, file_path, cmap
+                )
 
     # Assign __main__ origins after all sibling files have claimed their paths.
     # 1. Skip () — prevents _reconstruct_file_object from writing entire cascade to __main__.
     # 2. Skip already-owned paths — prevents duplicate writes to both __main__ and sibling.
     for file_path, content in main_files_for_origin:
-        for rel_path in enumerate_paths(content):
-            if not rel_path:
-                continue  # skip () root-container path
-            if rel_path not in cmap.reverse:
-                cmap.add_origin(
-                    rel_path, KeyOrigin(file=file_path, local_path=rel_path)
-                )
+        if stats is None:
+            _assign_main_origins(file_path, content, cmap)
+        else:
+            with stats.measure(ORIGINS, file_path) as timing:
+                timing.nodes = _assign_main_origins(file_path, content, cmap)
 
-    strategy = extract_strategy_from_node(node, strategy)
+    with measure(stats, STRATEGY, directory):
+        strategy = extract_strategy_from_node(node, strategy)
 
-    for subdir in list_dirs(directory):
+    with measure(stats, LIST, directory):
+        subdirs = fs.list_dirs(directory)
+    for subdir in subdirs:
         child_key = subdir.name
         if child_key in (CONFIG_STEM, MAIN_STEM):
             log.debug("Skipping directory %s due to reserved name", child_key)
@@ -148,33 +481,68 @@ def load_directory_node(
         if child_key in strategy.excludes:
             log.debug("Excluding directory %s due to strategy excludes", child_key)
             continue
-        child_node, child_map = load_directory_node(
-            subdir,
-            inherited_strategy=strategy.for_child(child_key),
-            inherited_default_config=dir_default_config,
-            allowed_exts=allowed_exts,
-        )
-        if child_key in node:
-            if isinstance(node[child_key], dict) and isinstance(child_node, dict):
-                log.debug("Merging dict child node for key %s", child_key)
-                node[child_key] = deep_merge_dicts(
-                    node[child_key], child_node, strategy.for_child(child_key)
-                )
-            if isinstance(node[child_key], list) and isinstance(child_node, list):
-                log.debug("Merging list child node for key %s", child_key)
-                node[child_key] = merge_lists(
-                    node[child_key],
-                    child_node,
-                    strategy.for_child(child_key).list_strategy,
+        if _skipped_by_filter(path_filter, child_key):
+            log.debug("Skipping directory %s outside the requested paths", subdir)
+            continue
+        child_filter = path_filter.child(child_key) if path_filter else None
+        existing = node.get(child_key)
+        if lazy is not None and (child_key not in node or isinstance(existing, dict)):
+            node[child_key] = LazyDirNode(
+                lazy,
+                subdir,
+                key_path + (child_key,),
+                existing,
+                strategy.for_child(child_key),
+                dir_default_config,
+                allowed_exts,
+                loader,
+                child_filter,
+            )
+            continue
+        child_strategy = strategy.for_child(child_key)
+        cached = None
+        if dir_cache is not None:
+            cached = dir_cache.get(subdir, child_strategy, dir_default_config)
+        if cached is not None:
+            child_node, child_map = cached
+        else:
+            child_node, child_map = load_directory_node(
+                subdir,
+                inherited_strategy=child_strategy,
+                inherited_default_config=dir_default_config,
+                allowed_exts=allowed_exts,
+                loader=loader,
+                lazy=lazy,
+                key_path=key_path + (child_key,),
+                path_filter=child_filter,
+                stats=stats,
+                fs=fs,
+                dir_cache=dir_cache,
+            )
+            if dir_cache is not None:
+                dir_cache.put(
+                    subdir, child_strategy, dir_default_config, child_node, child_map
                 )
+        if child_key not in node:
+            node[child_key] = child_node
+        elif stats is None:
+            _merge_child_dir(node, child_key, child_node, strategy)
+        else:
+            with stats.measure(MERGE, subdir):
+                _merge_child_dir(node, child_key, child_node, strategy)
+        if stats is None:
+            cmap = merge_maps(cmap, child_map, prefix=(child_key,))
         else:
-            node[child_key] = child_node if child_key not in node else node[child_key]
-        cmap = merge_maps(cmap, child_map, prefix=(child_key,))
+            with stats.measure(MAP_MERGE, subdir):
+                cmap = merge_maps(cmap, child_map, prefix=(child_key,))
 
     for k in list(node.keys()):
         if k in strategy.excludes:
             del node[k]
             cmap.drop_prefix((k,))
+    # directory config stays out of the data; see CascadeMap.configs
+    cmap.configs[()] = DirectoryConfig(dir_default_config, strategy)
 
-    log.debug("Loaded node for %s with keys: %s", directory, list(node.keys()))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Loaded node for %s with keys: %s", directory, list(node.keys()))
     return node, cmap
@@ -0,0 +1,181 @@
+"""Attribute-access views compiled from frozen cascade data.
+
+:func:`compile_view` turns a (frozen) subtree into objects whose fields are
+``__slots__`` attributes, so hot paths read ``cfg.db.host`` as plain attribute
+loads instead of path parsing or nested dict lookups. Classes are either
+inferred from the data (one generated :class:`View` class per distinct key
+set, shared by all mappings with those keys) or given as a dataclass schema.
+:meth:`~data_cascade.cascade.Cascade.view` caches views per path and rebuilds
+them after writes and refreshes, reusing the views of unchanged subtrees.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import keyword
+import typing
+from collections import abc
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# (id of a frozen node, schema) -> (node, view) of a previous compilation
+ViewMemo = Dict[Tuple[int, Any], Tuple[Any, Any]]
+
+
+class View:
+    """Base of the generated view classes; instances are read-only.
+
+    ``_keys`` are the mapping's keys and ``_slots`` the attribute holding each
+    (keys that are not identifiers are mangled); ``view[key]`` reads by key.
+    """
+
+    __slots__ = ()
+    _keys: Tuple[Any, ...] = ()
+    _slots: Tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            slot = self._slots[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+        return getattr(self, slot)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def _asdict(self) -> Dict[Any, Any]:
+        return {k: getattr(self, s) for k, s in zip(self._keys, self._slots)}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, View) or other._keys != self._keys:
+            return NotImplemented
+        return self._asdict() == other._asdict()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, s) for s in self._slots))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self._slots)
+        return f"View({fields})"
+
+
+def _slot_name(key: Any, taken: set) -> str:
+    name = "".join(c if c.isalnum() or c == "_" else "_" for c in str(key))
+    if not name or name[0].isdigit():
+        name = "_" + name
+    if keyword.iskeyword(name) or name.startswith("__"):
+        name += "_"
+    while name in taken:
+        name += "_"
+    taken.add(name)
+    return name
+
+
+@lru_cache(maxsize=None)
+def view_class(keys: Tuple[Any, ...]) -> type:
+    """The :class:`View` class for mappings with ``keys`` (in this order)."""
+    taken = {"_keys", "_slots", "_asdict"}
+    slots = tuple(_slot_name(k, taken) for k in keys)
+    return type("View", (View,), {"__slots__": slots, "_keys": keys, "_slots": slots})
+
+
+def _infer(value: Any, memo: ViewMemo, reuse: ViewMemo) -> Any:
+    if isinstance(value, Mapping):
+        key = (id(value), None)
+        old = reuse.get(key)
+        if old is not None and old[0] is value:
+            memo[key] = old
+            return old[1]
+        cls = view_class(tuple(value))
+        view = object.__new__(cls)
+        for slot, v in zip(cls._slots, value.values()):
+            object.__setattr__(view, slot, _infer(v, memo, reuse))
+        memo[key] = (value, view)
+        return view
+    if isinstance(value, (list, tuple)):
+        return tuple(_infer(v, memo, reuse) for v in value)
+    return value
+
+
+def _schema_of(tp: Any) -> Any:
+    # the dataclass a field annotation asks for, if any: ``Db``,
+    # ``Optional[Db]``, ``List[Db]`` / ``Tuple[Db, ...]`` or ``Dict[str, Db]``
+    if dataclasses.is_dataclass(tp):
+        return tp
+    args = [a for a in typing.get_args(tp) if a not in (type(None), Ellipsis)]
+    if args and dataclasses.is_dataclass(args[-1]):
+        return args[-1]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _type_hints(schema: type) -> Dict[str, Any]:
+    return typing.get_type_hints(schema)
+
+
+def _build(schema: type, value: Any, memo: ViewMemo, reuse: ViewMemo) -> Any:
+    if not isinstance(value, Mapping):
+        raise TypeError(f"{schema.__name__} needs a mapping, got {value!r}")
+    key = (id(value), schema)
+    old = reuse.get(key)
+    if old is not None and old[0] is value:
+        memo[key] = old
+        return old[1]
+    hints = _type_hints(schema)
+    kwargs = {}
+    for f in dataclasses.fields(schema):
+        if f.name in value:
+            kwargs[f.name] = _convert(hints.get(f.name), value[f.name], memo, reuse)
+    view = schema(**kwargs)
+    memo[key] = (value, view)
+    return view
+
+
+def _convert(tp: Any, value: Any, memo: ViewMemo, reuse: ViewMemo) -> Any:
+    schema = _schema_of(tp)
+    if schema is None or value is None:
+        return value
+    origin = typing.get_origin(tp)
+    if origin in (list, tuple, abc.Sequence) and isinstance(value, tuple):
+        items = [_build(schema, v, memo, reuse) for v in value]
+        return items if origin is list else tuple(items)
+    if origin in (dict, abc.Mapping) and isinstance(value, Mapping):
+        return {k: _build(schema, v, memo, reuse) for k, v in value.items()}
+    return _build(schema, value, memo, reuse)
+
+
+def compile_view(
+    value: Any,
+    schema: Optional[type] = None,
+    *,
+    reuse: Optional[ViewMemo] = None,
+    memo: Optional[ViewMemo] = None,
+) -> Any:
+    """Compile the frozen ``value`` into a view.
+
+    Without ``schema`` mappings become generated :class:`View` instances and
+    sequences tuples. With a dataclass ``schema`` (declare it with
+    ``slots=True`` for slot reads) the mapping's keys fill its fields; fields
+    annotated with dataclasses, or lists, tuples and dicts of them, are built
+    recursively and other values are passed as they are. Nodes recorded in
+    ``reuse`` by an earlier compilation keep their view while they are the
+    same objects; ``memo`` receives this compilation's records.
+    """
+    if memo is None:
+        memo = {}
+    if reuse is None:
+        reuse = {}
+    if schema is None:
+        return _infer(value, memo, reuse)
+    if not dataclasses.is_dataclass(schema):
+        raise TypeError(f"view schemas are dataclasses, not {schema!r}")
+    return _build(schema, value, memo, reuse)
+
+
+__all__ = ["View", "ViewMemo", "compile_view", "view_class"]
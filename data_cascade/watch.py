@@ -0,0 +1,377 @@
+"""Keep a Cascade live by reloading it when files below its root change.
+
+Changes are detected with inotify (through ctypes, Linux only) or, as a
+fallback, by periodically comparing ``os.scandir`` stat snapshots. Bursts of
+events are debounced; only changed files are re-read and re-parsed, and only
+the directories containing them are merged again (the others are reused from
+a :class:`~data_cascade.traverse.DirectoryCache`).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .config import SUPPORTED_EXTS_DEFAULT
+from .diff import ChangeSet
+from .fs import FileStamp, local_fs, scan_files
+from .io import load_file
+from .loader import _bind_fs
+from .logging_utils import get_logger
+from .traverse import DirectoryCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cascade import Cascade
+
+log = get_logger(__name__)
+
+ChangeCallback = Callable[[ChangeSet], None]
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+class _InotifyBackend:
+    """Reports the directories in which inotify saw events."""
+
+    def __init__(self, libc: ctypes.CDLL):
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wds: Dict[int, Path] = {}
+
+    def add(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(str(directory)), _WATCH_MASK
+        )
+        if wd < 0:
+            log.warning("Cannot watch %s (errno %d)", directory, ctypes.get_errno())
+            return
+        self._wds[wd] = directory
+
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        touched: Set[Path] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            off = 0
+            while off < len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, off)
+                off += _EVENT.size + length
+                directory = self._wds.get(wd)
+                if directory is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    del self._wds[wd]
+                touched.add(directory)
+        return touched
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Asks for a full rescan every ``interval`` seconds."""
+
+    def __init__(self, interval: float, stop: threading.Event):
+        self._interval = interval
+        self._stop = stop
+
+    def add(self, directory: Path) -> None:
+        pass
+
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        self._stop.wait(self._interval)
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+def _subdirs(directory: Path) -> List[Path]:
+    try:
+        return [Path(e.path) for e in os.scandir(directory) if e.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _all_subdirs(directory: Path) -> List[Path]:
+    out: List[Path] = []
+    for sub in _subdirs(directory):
+        out.append(sub)
+        out.extend(_all_subdirs(sub))
+    return out
+
+
+class _ContentMemo:
+    """Loader that parses each file once with ``loader`` and hands out the
+    parsed content.
+
+    Content is shared between reloads, so the watched cascade writes
+    copy-on-write and never modifies it.
+    """
+
+    def __init__(self, loader: Callable[[Path], Any] = load_file) -> None:
+        self._loader = loader
+        self._items: Dict[Path, Any] = {}
+
+    def __call__(self, path: Path) -> Any:
+        if path not in self._items:
+            self._items[path] = self._loader(path)
+        return self._items[path]
+
+    def invalidate(self, paths: Iterable[Path]) -> None:
+        for p in paths:
+            self._items.pop(p, None)
+
+
+class CascadeWatcher:
+    """Reload a :class:`Cascade` in place when its files change.
+
+    ``callback`` receives the :class:`ChangeSet` of each reload that changed
+    any key; only key paths owned by changed files are compared. Reloading
+    discards unsaved edits, and the swap happens from the watcher thread, so
+    share the cascade across threads only in ``thread_safe`` mode. ``backend``
+    is ``"auto"``, ``"inotify"`` or ``"poll"``.
+
+    The watcher keeps parsed files and merged directories to reload from and
+    fills them in its thread when started; the cascade then writes
+    copy-on-write (like a ``thread_safe`` one) so they stay unmodified.
+    """
+
+    def __init__(
+        self,
+        cascade: "Cascade",
+        callback: Optional[ChangeCallback] = None,
+        *,
+        debounce: float = 0.05,
+        poll_interval: float = 1.0,
+        backend: str = "auto",
+        allowed_exts: Optional[tuple[str, ...]] = None,
+    ):
+        self.cascade = cascade
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        if allowed_exts is None:
+            allowed_exts = cascade.load_options.get(
+                "allowed_exts", SUPPORTED_EXTS_DEFAULT
+            )
+        self.allowed_exts = allowed_exts
+        self._backend_name = backend
+        # wraps the cascade's own loader, reading through its file system
+        options = cascade.load_options
+        self._memo = _ContentMemo(
+            _bind_fs(options.get("loader", load_file), options.get("fs") or local_fs)
+        )
+        self._dir_cache = DirectoryCache()
+        # guards the snapshot and the caches against check() calls racing
+        # the watcher thread
+        self._lock = threading.Lock()
+        cascade._copy_on_write = True
+        self.roots = cascade._watch_roots()
+        self._snapshot: Dict[Path, FileStamp] = {}
+        self._dirs: Set[Path] = set()
+        for root in self.roots:
+            self._snapshot.update(scan_files(root, allowed_exts))
+            self._dirs.update((root, *_all_subdirs(root)))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backend: Any = None
+
+    # -- change detection -------------------------------------------------
+
+    def _rescan(self, touched: Optional[Set[Path]]) -> Set[Path]:
+        """Update the stamp snapshot; return files added, removed or modified.
+
+        ``touched`` lists directories whose entries changed (``None`` rescans
+        the whole tree).
+        """
+        exts = self.allowed_exts
+        dirs = set(self._dirs)
+        if touched is None:
+            new = {}
+            for root in self.roots:
+                new.update(scan_files(root, exts))
+                self._watch_tree(root)
+        else:
+            new = dict(self._snapshot)
+            for d in touched:
+                for p in [p for p in new if p.parent == d]:
+                    del new[p]
+                new.update(scan_files(d, exts, recursive=False))
+                for sub in _subdirs(d):
+                    if sub not in self._dirs:
+                        # watch first so files created meanwhile are not missed
+                        self._watch_tree(sub)
+                        new.update(scan_files(sub, exts))
+                for gone in [x for x in self._dirs if x.parent == d]:
+                    if not gone.is_dir():
+                        self._dirs -= {x for x in self._dirs if gone in x.parents}
+                        self._dirs.discard(gone)
+                        for p in [p for p in new if gone in p.parents]:
+                            del new[p]
+        changed = {
+            p
+            for p in new.keys() | self._snapshot.keys()
+            if new.get(p) != self._snapshot.get(p)
+        }
+        self._snapshot = new
+        # an added or removed directory changes its parent's node
+        self._dir_cache.invalidate(dirs ^ self._dirs)
+        return changed
+
+    def _watch_tree(self, directory: Path) -> None:
+        for d in [directory, *_all_subdirs(directory)]:
+            if d not in self._dirs:
+                self._dirs.add(d)
+                if self._backend is not None:
+                    self._backend.add(d)
+
+    # -- applying changes -------------------------------------------------
+
+    def _load_options(self) -> Dict[str, Any]:
+        # unchanged files come from the memo, so there is nothing to offload
+        return dict(
+            allowed_exts=self.allowed_exts,
+            loader=self._memo,
+            dir_cache=self._dir_cache,
+            processes=None,
+        )
+
+    def _apply(self, changed: Set[Path]) -> ChangeSet:
+        self._memo.invalidate(changed)
+        self._dir_cache.invalidate(changed)
+        changes = self.cascade._reload_files(changed, **self._load_options())
+        log.info(
+            "Reloaded %d changed file(s) below %s", len(changed), self.cascade.root
+        )
+        if self.callback is not None and changes:
+            try:
+                self.callback(changes)
+            except Exception as e:
+                log.error("Cascade change callback failed: %s", e)
+        return changes
+
+    def _process(self, touched: Optional[Set[Path]]) -> ChangeSet:
+        with self._lock:
+            changed = self._rescan(touched)
+            return self._apply(changed) if changed else ChangeSet()
+
+    def check(self) -> ChangeSet:
+        """Rescan the whole tree once and apply any changes synchronously."""
+        return self._process(None)
+
+    # -- background thread ------------------------------------------------
+
+    def _make_backend(self) -> Any:
+        if self._backend_name in ("auto", "inotify"):
+            libc = _load_libc()
+            if libc is not None:
+                try:
+                    return _InotifyBackend(libc)
+                except OSError as e:
+                    log.warning("inotify unavailable, falling back to polling: %s", e)
+            if self._backend_name == "inotify":
+                raise RuntimeError("inotify is not available on this platform")
+        return _PollingBackend(self.poll_interval, self._stop)
+
+    def _run(self) -> None:
+        backend = self._backend
+        try:
+            with self._lock:
+                self.cascade._preload(**self._load_options())
+        except Exception as e:
+            log.warning("Failed to preload %s: %s", self.cascade.root, e)
+        while not self._stop.is_set():
+            touched = backend.wait(self.poll_interval)
+            if touched is not None:
+                if not touched:
+                    continue
+                # debounce: keep collecting until the burst goes quiet
+                while not self._stop.is_set():
+                    more = backend.wait(self.debounce)
+                    if not more:
+                        break
+                    touched |= more
+            if self._stop.is_set():
+                break
+            try:
+                self._process(touched)
+            except Exception as e:
+                log.error("Failed to reload cascade below %s: %s", self.cascade.root, e)
+
+    def start(self) -> "CascadeWatcher":
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._backend = self._make_backend()
+        for d in sorted(self._dirs):
+            self._backend.add(d)
+        self._thread = threading.Thread(
+            target=self._run, name="data-cascade-watcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def __enter__(self) -> "CascadeWatcher":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+__all__ = ["CascadeWatcher"]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+# files of the teams tree besides ``__main__.yaml``
+TEAMS_FILES = {
+    "tags.json": '["z"]',
+    "teams.yaml": "core: {size: 5}\n",
+    "teams/__config__.yaml": "dict: {mode: override}\n",
+    "teams/core/__main__.json": '{"lead": "bob", "members": [1, 2]}',
+}
+
+
+def _write_teams_tree(
+    base: Path,
+    *,
+    main: str = "",
+    merge: str = "",
+    files: Optional[Dict[str, str]] = None,
+) -> Path:
+    root = base / "data"
+    (root / "teams" / "core").mkdir(parents=True)
+    (root / "__main__.yaml").write_text(
+        "title: root\n"
+        "teams:\n  core: {lead: ann, size: 3}\n  extra: {x: 1}\n"
+        "tags: [x]\n"
+        + main
+        + "__config__:\n  data:\n    merge:\n"
+        + merge
+        + "      per_key:\n        tags: {list: {mode: extend}}\n",
+        encoding="utf-8",
+    )
+    for name, content in {**TEAMS_FILES, **(files or {})}.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content, encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def teams_tree():
+    """Writes the teams tree into ``base / "data"`` and returns that root.
+
+    ``main`` adds lines to the root ``__main__.yaml``, ``merge`` to its merge
+    config and ``files`` adds or replaces files.
+    """
+    return _write_teams_tree
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from data_cascade import (
+    load_data_cascade,
+    load_data_cascade_async,
+    make_cascade,
+    make_cascade_async,
+)
+from data_cascade.io import load_file
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n", encoding="utf-8"
+    )
+    (root / "team.yaml").write_text("members:\n  - Alice\n", encoding="utf-8")
+    (root / "team").mkdir()
+    (root / "team" / "__main__.yaml").write_text(
+        "members:\n  - Bob\n", encoding="utf-8"
+    )
+    (root / "numbers.json").write_text(json.dumps([1, 2, 3]), encoding="utf-8")
+    (root / "broken.json").write_text("{", encoding="utf-8")
+    return root
+
+
+def test_async_load_matches_sync_load(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    adata, acmap = asyncio.run(load_data_cascade_async(root, max_concurrency=2))
+    assert adata == data
+    assert acmap.reverse == cmap.reverse
+    assert adata["team"]["members"] == ["Alice", "Bob"]
+
+
+def test_async_cascade_save_and_refresh(tmp_path: Path):
+    root = setup_tree(tmp_path)
+
+    async def run() -> None:
+        c = await make_cascade_async(root)
+        c.set("numbers[0]", 10)
+        c.set("team.lead", "Alice")
+        await c.save_async()
+        assert not c._dirty_files
+
+        (root / "numbers.json").write_text(json.dumps([7]), encoding="utf-8")
+        await c.refresh_async()
+        assert c.get("numbers") == [7]
+        assert c.get("team.lead") == "Alice"
+
+    asyncio.run(run())
+
+
+def test_async_load_forwards_load_options(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    parsed: list = []
+
+    def loader(path: Path):
+        parsed.append(path.name)
+        return load_file(path)
+
+    data, _ = asyncio.run(
+        load_data_cascade_async(root, loader=loader, include=["team"])
+    )
+    assert data == load_data_cascade(root, include=["team"])[0]
+    assert "numbers.json" not in parsed and "team.yaml" in parsed
+
+
+def test_overlay_refresh_async(tmp_path: Path):
+    base, env = tmp_path / "base", tmp_path / "env"
+    for root, name in ((base, "Alpha"), (env, "Beta")):
+        root.mkdir()
+        (root / "__main__.yaml").write_text(f"name: {name}\n", encoding="utf-8")
+    c = make_cascade([base, env], cache=None)
+    (env / "__main__.yaml").write_text("name: Gamma\n", encoding="utf-8")
+    changes = asyncio.run(c.refresh_async(max_concurrency=1))
+    assert [(ch.path, ch.new) for ch in changes.changes] == [(("name",), "Gamma")]
+
+
+def test_cancelled_save_async_releases_the_save_lock(tmp_path: Path):
+    root = setup_tree(tmp_path)
+
+    async def run() -> None:
+        c = await make_cascade_async(root, thread_safe=True)
+        c.set("numbers[0]", 10)
+        c._save_lock.acquire()  # a save running in another thread
+        task = asyncio.create_task(c.save_async())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        c._save_lock.release()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # the loop stays free to run the release callback meanwhile
+        assert await asyncio.to_thread(c._save_lock.acquire, timeout=5)
+        c._save_lock.release()
+        await c.save_async()
+        assert json.loads((root / "numbers.json").read_text())[0] == 10
+
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from data_cascade import ParseCache, make_cascade
+from data_cascade.codec import encode
+
+
+def setup_roots(tmp_path: Path) -> tuple[Path, Path]:
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "db.yaml").write_text("host: h\nports: [1, 2]\n", encoding="utf-8")
+    roots = []
+    for name in ("a", "b"):
+        root = tmp_path / name
+        root.mkdir()
+        (root / "__main__.yaml").write_text(f"tenant: {name}\n", encoding="utf-8")
+        os.symlink(shared, root / "shared")
+        roots.append(root)
+    return roots[0], roots[1]
+
+
+def test_parse_cache_shares_files_between_cascades(tmp_path: Path):
+    a, b = setup_roots(tmp_path)
+    cache = ParseCache()
+    ca = make_cascade(a, loader=cache)
+    cb = make_cascade(b, loader=cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+    ca.set("shared.db.ports[0]", 9)
+    ca.get("shared.db.ports").append(3)
+    assert cb.get("shared.db.ports") == [1, 2]
+    assert make_cascade(b, loader=cache).get("shared.db") == {
+        "host": "h",
+        "ports": [1, 2],
+    }
+
+
+def test_parse_cache_revalidates_changed_files(tmp_path: Path):
+    a, _ = setup_roots(tmp_path)
+    cache = ParseCache()
+    c = make_cascade(a, loader=cache)
+    (tmp_path / "shared" / "db.yaml").write_text("host: other\n", encoding="utf-8")
+    c.refresh()
+    assert c.get("shared.db") == {"host": "other"}
+    assert cache.misses == 3 and len(cache) == 2
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path: Path):
+    files = []
+    for i in range(3):
+        f = tmp_path / f"f{i}.json"
+        f.write_text(f'{{"v": {i}}}', encoding="utf-8")
+        files.append(f)
+    budget = 2 * len(encode({"v": 0}))
+    cache = ParseCache(max_bytes=budget)
+    cache(files[0])
+    cache(files[1])
+    cache(files[0])
+    cache(files[2])
+    assert cache.evictions == 1 and cache.size <= budget
+    assert cache(files[0]) == {"v": 0}
+    assert cache(files[1]) == {"v": 1}
+    assert (cache.hits, cache.misses) == (2, 4)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import gc
 import json
 import time
+import weakref
 from pathlib import Path
 
 from data_cascade import make_cascade
@@ -45,3 +47,102 @@ def test_proxy_and_dirty_save(tmp_path: Path):
     t1_main = main_yaml.stat().st_mtime
     assert t1_main > t0_main
     assert "new_root" in main_yaml.read_text(encoding="utf-8")
+
+
+def test_bulk_get_set_and_update(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    (root / "db.yaml").write_text("host: localhost\nport: 5432\n", encoding="utf-8")
+    c = make_cascade(root)
+
+    assert c.get_many(["db.port", "team.members[0]", "missing.key", "name"]) == [
+        5432,
+        "Alice",
+        None,
+        "Alpha",
+    ]
+
+    c.set_many({"db.port": 6543, "team.members[1]": "Carol"})
+    assert c.get_many(["db.port", "team.members"]) == [6543, ["Alice", "Carol"]]
+    c.update({"db": {"host": "db.internal", "pool": {"size": 4}}})
+    assert c.get("db") == {
+        "host": "db.internal",
+        "port": 6543,
+        "pool": {"size": 4},
+    }
+    c.save()
+
+    c2 = make_cascade(root)
+    assert c2.get("db.pool.size") == 4
+    assert c2.get("team.members") == ["Alice", "Carol"]
+    assert "pool" not in (root / "__main__.yaml").read_text(encoding="utf-8")
+    assert "Carol" in (root / "team.yaml").read_text(encoding="utf-8")
+
+
+def test_node_proxies_are_interned_and_cache_reads(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, cache_reads=True)
+    members = c.node("team").members
+    assert members is c.node("team.members")
+    assert c.node("team").members[0] is members[0]
+
+    assert members[1].get() == "Bob"
+    c.data["team"]["members"][1] = "Mallory"  # direct mutation is not tracked
+    assert members[1].get() == "Bob"
+    c.set("team.members[1]", "Carol")
+    assert members[1].get() == "Carol"
+
+    # proxies nobody references are not kept
+    dropped = weakref.ref(c.node("team.lead"))
+    gc.collect()
+    assert dropped() is None and members is c.node("team.members")
+
+
+def test_query_returns_values_with_origins(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    (root / "services").mkdir()
+    (root / "services" / "api.yaml").write_text("port: 80\n", encoding="utf-8")
+    (root / "services" / "db.yaml").write_text("port: 5432\n", encoding="utf-8")
+    c = make_cascade(root)
+
+    matches = c.query("services.*.port")
+    assert [(m.path, m.value) for m in matches] == [
+        (("services", "api", "port"), 80),
+        (("services", "db", "port"), 5432),
+    ]
+    assert [o.file.name for o in matches[1].origins] == ["db.yaml"]
+    assert matches[1].origins[0].local_path == ("port",)
+
+
+def test_concurrent_cascade_writes_do_not_touch_snapshots(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    (root / "db.yaml").write_text("host: a\nport: 1\n", encoding="utf-8")
+    c = make_cascade(root, thread_safe=True)
+    before = c.snapshot()
+    db_before = before["db"]
+
+    c.set("db.port", 2)
+    c.update({"db": {"pool": {"size": 4}}, "team": {"members": ["Zed"]}})
+    assert before["db"] == {"host": "a", "port": 1}
+    assert before["db"] is db_before
+    assert before["team"]["members"] == ["Alice", "Bob"]
+    assert c.get("db") == {"host": "a", "port": 2, "pool": {"size": 4}}
+    # untouched subtrees are shared between snapshots
+    assert c.snapshot()["numbers"] is before["numbers"]
+
+    c.save()
+    assert make_cascade(root).get("db.pool.size") == 4
+
+
+def test_concurrent_cascade_parallel_writers(tmp_path: Path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, thread_safe=True)
+
+    def work(i: int) -> None:
+        c.set(f"counters.w{i}", i)
+        assert c.get(f"counters.w{i}") == i
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(64)))
+    assert c.get("counters") == {f"w{i}": i for i in range(64)}
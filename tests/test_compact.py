@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from data_cascade import LoadStats, load_data_cascade, make_cascade, make_cascade_async
+from data_cascade.compact import compact
+from data_cascade.io import load_file
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    (root / "users").mkdir(parents=True)
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    for n in range(3):
+        records = "".join(
+            f"- {{name: user{i}, role: member, score: 1.5, zero: -0.0}}\n"
+            for i in range(50)
+        )
+        (root / "users" / f"g{n}.yaml").write_text(records, encoding="utf-8")
+    return root
+
+
+def test_compact_shares_keys_values_and_paths(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    data2, cmap2, report = compact(data, cmap)
+    assert data2 == data
+    assert cmap2.reverse == cmap.reverse and cmap2.forward == cmap.forward
+    assert report.saved > 0 and report.strings_shared > 0
+    g0, g1 = data2["users"]["g0"], data2["users"]["g1"]
+    assert next(iter(g0[0])) is next(iter(g1[0]))
+    assert g0[0]["role"] is g1[3]["role"] and g0[0]["score"] is g1[3]["score"]
+    assert str(g0[0]["zero"]) == "-0.0"
+    kp = ("users", "g0", "0", "name")
+    (stored,) = [k for k in cmap2.reverse if k == kp]
+    forward = cmap2.forward[root / "users" / "g0.yaml"]
+    assert stored is next(k for k in forward if k == kp)
+
+
+def test_load_with_compact_reports_and_saves(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    stats = LoadStats()
+    data, _ = load_data_cascade(root, compact=True, stats=stats)
+    assert data == load_data_cascade(root)[0]
+    assert stats.compaction is not None and stats.compaction.saved > 0
+    assert "compaction saved" in stats.report()
+
+    c = make_cascade(root, compact=True)
+    c.set("users.g1.0.role", "admin")
+    c.save()
+    assert load_file(root / "users" / "g1.yaml")[0]["role"] == "admin"
+
+
+def test_compact_cascades_load_and_refresh_async(tmp_path: Path):
+    root = setup_tree(tmp_path)
+
+    async def run() -> None:
+        c = await make_cascade_async(root, compact=True)
+        assert c.load_options["compact"]
+        (root / "__main__.yaml").write_text("name: Beta\n", encoding="utf-8")
+        changes = await c.refresh_async()
+        assert [ch.path for ch in changes.changes] == [("name",)]
+        assert c.get("users.g2[49].name") == "user49"
+
+    asyncio.run(run())
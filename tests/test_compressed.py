@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.config import split_ext
+from data_cascade.handlers import CompressedHandler, get_handler_for
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    (root / "svc").mkdir(parents=True)
+    (root / "__main__.yaml").write_text("svc: {api: {host: h}}\n", encoding="utf-8")
+    with gzip.open(root / "svc" / "api.json.gz", "wt", encoding="utf-8") as f:
+        f.write('{"port": 1, "tags": ["a"]}')
+    with lzma.open(root / "svc" / "db.yaml.xz", "wt", encoding="utf-8") as f:
+        f.write("port: 5432\n")
+    with bz2.open(root / "__config__.yaml.bz2", "wt", encoding="utf-8") as f:
+        f.write("data: {merge: {exclude: [skip]}}\n")
+    (root / "skip.json").write_text("{}", encoding="utf-8")
+    (root / "notes.txt.gz").write_bytes(gzip.compress(b"not data"))
+    return root
+
+
+def test_compound_extensions():
+    assert split_ext("a.json.gz") == ("a", ".json.gz")
+    assert split_ext("v1.2.YAML") == ("v1.2", ".yaml")
+    assert split_ext("a.gz") == ("a", ".gz")
+    handler = get_handler_for(Path("a.yaml.xz"))
+    assert isinstance(handler, CompressedHandler)
+    assert handler is get_handler_for(Path("b.yaml.xz"))
+    assert get_handler_for(Path("a.txt.gz")) is None
+
+
+def test_compressed_files_load_under_their_stem(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    assert data == {
+        "svc": {
+            "api": {"host": "h", "port": 1, "tags": ["a"]},
+            "db": {"port": 5432},
+        }
+    }
+    origin = cmap.reverse[("svc", "api", "port")][0]
+    assert origin.file == root / "svc" / "api.json.gz"
+    assert cmap.configs[()].config == {"data": {"merge": {"exclude": ["skip"]}}}
+    assert load_data_cascade(root, allowed_exts=(".yaml",))[0] == {
+        "svc": {"api": {"host": "h"}, "db": {"port": 5432}}
+    }
+
+
+def test_compressed_files_save_compressed(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root)
+    c.set("svc.api.tags[0]", "b")
+    c.set("svc.db.port", 5433)
+    c.save()
+    assert gzip.decompress((root / "svc" / "api.json.gz").read_bytes()).startswith(b"{")
+    assert load_data_cascade(root)[0]["svc"] == {
+        "api": {"host": "h", "port": 1, "tags": ["b"]},
+        "db": {"port": 5433},
+    }
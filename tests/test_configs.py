@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.io import load_file
+from data_cascade.merge.strategy import DictMode, ListMode
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    (root / "teams").mkdir(parents=True)
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n"
+        "    per_key:\n      pinned:\n        dict:\n          mode: override\n",
+        encoding="utf-8",
+    )
+    (root / "__main__.yaml").write_text("tags: [a]\n", encoding="utf-8")
+    for i in range(20):
+        (root / f"svc{i}.yaml").write_text(f"port: {i}\n", encoding="utf-8")
+    (root / "teams" / "__config__.yaml").write_text(
+        "data:\n  merge:\n    dict:\n      mode: first_wins\n", encoding="utf-8"
+    )
+    (root / "teams" / "core.yaml").write_text("members: [A]\n", encoding="utf-8")
+    return root
+
+
+def test_config_is_not_copied_into_data_or_origins(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    assert data["svc3"] == {"port": 3}
+    assert "__config__" not in data and "__config__" not in data["teams"]
+    assert not [kp for kp in cmap.reverse if "__config__" in kp]
+    assert set(cmap.configs) == {(), ("teams",)}
+
+
+def test_config_and_strategy_queries(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root)
+    root_cfg = c.config_for("svc3.port")
+    assert root_cfg["data"]["merge"]["list"]["mode"] == "extend"
+    assert c.config_for("teams.core")["data"]["merge"]["dict"]["mode"] == "first_wins"
+    # teams inherits the root's list mode and adds its own dict mode
+    assert c.strategy_for("teams.core").list_strategy.mode == ListMode.EXTEND
+    assert c.strategy_for("teams").dict_mode == DictMode.FIRST_WINS
+    assert c.strategy_for("pinned").dict_mode == DictMode.OVERRIDE
+    assert c.strategy_for("svc1").dict_mode == DictMode.DEEP
+
+
+def test_saving_does_not_write_inherited_config(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root)
+    c.set("teams.core.members", ["B"])
+    c.set("svc1.port", 99)
+    c.save()
+    assert load_file(root / "teams" / "core.yaml") == {"members": ["B"]}
+    assert load_file(root / "svc1.yaml") == {"port": 99}
+
+
+def test_lazy_subtrees_register_their_config(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, lazy=True)
+    assert ("teams",) not in c.cmap.configs
+    assert c.strategy_for("teams").dict_mode == DictMode.DEEP  # inherited so far
+    c.get("teams.core")
+    assert c.strategy_for("teams").dict_mode == DictMode.FIRST_WINS
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from data_cascade import diff, load_data_cascade, make_cascade
+
+
+def test_diff_reports_added_removed_modified():
+    old = {"a": {"x": 1, "y": [1, 2]}, "b": 1, "c": {"k": 1}}
+    new = {"a": {"x": 2, "y": [1]}, "c": {"k": 1}, "d": {"n": 1}}
+    changes = diff(old, new)
+    assert changes.modified == [("a", "x")]
+    assert changes.removed == [("a", "y", "1"), ("b",)]
+    assert changes.added == [("d",)]
+    assert not diff(old, old)
+
+
+def test_diff_uses_fingerprints_to_skip_unchanged_files(tmp_path: Path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "db.yaml").write_text("host: a\n", encoding="utf-8")
+    (root / "api.yaml").write_text("port: 80\n", encoding="utf-8")
+    old, old_map = load_data_cascade(root)
+    assert set(old_map.fingerprints) == {
+        root / "__main__.yaml",
+        root / "db.yaml",
+        root / "api.yaml",
+    }
+
+    (root / "db.yaml").write_text("host: bb\nport: 1\n", encoding="utf-8")
+    new, new_map = load_data_cascade(root)
+    old["api"]["port"] = 81  # not owned by a changed file: never compared
+    changes = diff(old, new, old_map, new_map)
+    assert changes.paths == [("db", "host"), ("db", "port")]
+    assert changes.changes[0].old == "a"
+    assert changes.changes[0].origins[0].file == root / "db.yaml"
+
+
+def test_refresh_returns_change_set(tmp_path: Path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "db.yaml").write_text("host: a\n", encoding="utf-8")
+    c = make_cascade(root)
+    (root / "db.yaml").write_text("host: bb\n", encoding="utf-8")
+    assert c.refresh().modified == [("db", "host")]
+
+
+def test_refresh_compares_values_merged_from_several_files(tmp_path: Path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n", encoding="utf-8"
+    )
+    (root / "__main__.yaml").write_text("team: {members: [A]}\n", encoding="utf-8")
+    (root / "team.yaml").write_text("members: [B]\n", encoding="utf-8")
+    c = make_cascade(root)
+    assert c.get("team.members") == ["A", "B"]
+    (root / "__main__.yaml").write_text("team: {members: [C, D]}\n", encoding="utf-8")
+    changes = c.refresh()
+    assert c.get("team.members") == ["C", "D", "B"]
+    assert changes.modified == [("team", "members", "0"), ("team", "members", "1")]
+    assert changes.added == [("team", "members", "2")]
+
+
+def test_refresh_reports_unsaved_writes(tmp_path: Path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "db.yaml").write_text("host: a\n", encoding="utf-8")
+    c = make_cascade(root)
+    c.set("db", 1)
+    changes = c.refresh()
+    assert changes.modified == [("db",)]
+    assert changes.changes[0].old == 1
+    assert c.get("db.host") == "a"
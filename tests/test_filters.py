@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from data_cascade import load_data_cascade, load_data_cascade_async, make_cascade
+from data_cascade.io import load_file
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n", encoding="utf-8"
+    )
+    (root / "services.yaml").write_text("api:\n  tags: [a]\n", encoding="utf-8")
+    (root / "services").mkdir()
+    (root / "services" / "api.yaml").write_text("tags: [b]\n", encoding="utf-8")
+    (root / "services" / "web.yaml").write_text("port: 8080\n", encoding="utf-8")
+    (root / "teams").mkdir()
+    (root / "teams" / "core.yaml").write_text("members: [Alice]\n", encoding="utf-8")
+    (root / "teams" / "ops.yaml").write_text("members: [Bob]\n", encoding="utf-8")
+    return root
+
+
+def recording_loader(root: Path, loaded: list):
+    def loader(path: Path):
+        loaded.append(path.relative_to(root).as_posix())
+        return load_file(path)
+
+    return loader
+
+
+def test_include_prunes_files_and_directories(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    loaded: list = []
+    data, cmap = load_data_cascade(
+        root, include=["services.api"], loader=recording_loader(root, loaded)
+    )
+    assert sorted(loaded) == [
+        "__config__.yaml",
+        "__main__.yaml",
+        "services.yaml",
+        "services/api.yaml",
+    ]
+    full, _ = load_data_cascade(root)
+    assert data["services"]["api"] == full["services"]["api"]
+    assert data["name"] == "Alpha"
+    assert "teams" not in data and "web" not in data["services"]
+    assert all(kp[0] != "teams" for kp in cmap.reverse)
+
+
+def test_exclude_and_wildcards(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    full, _ = load_data_cascade(root)
+    data, _ = load_data_cascade(root, exclude=["teams.ops", "services"])
+    assert "services" not in data
+    assert list(data["teams"]) == ["core"]
+    assert data["teams"]["core"] == full["teams"]["core"]
+
+    data, _ = load_data_cascade(root, include=["*.core", ("name",)])
+    assert list(data["teams"]) == ["core"]
+    assert data["services"]["api"]["tags"] == ["a"]
+
+
+def test_partial_cascade_rejects_writes_outside_loaded_paths(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, include=["teams"])
+    c.set("teams.core.members", ["Carol"])
+    with pytest.raises(ValueError):
+        c.set("services.api.port", 1)
+    c.save()
+    assert load_file(root / "teams" / "core.yaml")["members"] == ["Carol"]
+    assert load_file(root / "services.yaml") == {"api": {"tags": ["a"]}}
+    assert c.refresh().paths == []
+
+
+def test_async_load_respects_filters(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    expected = load_data_cascade(root, include=["teams"])
+    assert asyncio.run(load_data_cascade_async(root, include=["teams"])) == expected
+    lazy, _ = load_data_cascade(root, include=["teams.core"], lazy=True)
+    assert list(lazy["teams"]) == ["core"]
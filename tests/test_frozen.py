@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from data_cascade import FrozenDict, freeze, make_cascade, thaw
+from data_cascade.frozen import refreeze
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "db.yaml").write_text("host: h\nports: [1, 2]\n", encoding="utf-8")
+    (root / "teams.yaml").write_text(
+        "core:\n  members: [Alice]\nops:\n  members: [Bob]\n", encoding="utf-8"
+    )
+    return root
+
+
+def test_freeze_is_immutable_and_hashable():
+    data = {"a": {"b": [1, {"c": 2}]}, "d": None}
+    f = freeze(data)
+    assert isinstance(f, FrozenDict) and f["a"]["b"] == (1, FrozenDict(c=2))
+    assert thaw(f) == data and hash(f) == hash(freeze(data))
+    assert {f: 1}[freeze(data)] == 1
+    with pytest.raises(TypeError):
+        f["x"] = 1  # type: ignore[index]
+    assert thaw(f) == data and isinstance(thaw(f)["a"]["b"], list)
+
+
+def test_refreeze_shares_untouched_subtrees():
+    data = {"a": {"x": 1}, "b": {"y": [1, 2]}}
+    old = freeze(data)
+    data["b"]["y"][1] = 3
+    new = refreeze(old, data, [("b", "y", "1")])
+    assert new == freeze(data)
+    assert new["a"] is old["a"] and new["b"] is not old["b"]
+
+
+def test_cascade_frozen_is_cached_and_updated_incrementally(tmp_path: Path):
+    c = make_cascade(setup_tree(tmp_path))
+    f1 = c.frozen()
+    assert c.frozen() is f1 and thaw(f1) == c.data
+    c.set("db.ports.0", 5)
+    f2 = c.frozen()
+    assert f2["db"]["ports"] == (5, 2) and f1["db"]["ports"] == (1, 2)
+    assert f2["teams"] is f1["teams"]
+    c.update({"teams": {"qa": {"members": []}}})
+    assert c.frozen() == freeze(c.data)
+    assert c.node("teams").core.members.frozen() == ("Alice",)
+    c.refresh()
+    assert c.frozen() == freeze(c.data) and "qa" not in c.frozen()["teams"]
+
+
+def test_thread_safe_cascade_frozen_snapshots(tmp_path: Path):
+    c = make_cascade(setup_tree(tmp_path), thread_safe=True)
+    seen = []
+
+    def reader():
+        for _ in range(200):
+            f = c.frozen()
+            seen.append(f == freeze(thaw(f)))
+
+    t = threading.Thread(target=reader)
+    t.start()
+    for i in range(200):
+        c.set("db.host", f"h{i}")
+    t.join()
+    assert all(seen) and c.frozen()["db"]["host"] == "h199"
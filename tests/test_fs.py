@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from data_cascade import ParseCache, load_data_cascade, make_cascade, make_cascade_async
+from data_cascade.fs import FileSystem, MemoryFS, TarFS, ZipFS, _IndexedFS
+
+FILES = {
+    "__main__.yaml": "name: x\nsvc: {api: {host: h}}\n",
+    "svc/api.json": '{"port": 1}',
+    "svc/db.toml": "port = 5432\n",
+    "svc/__config__.yaml": "dict: {mode: deep}\n",
+}
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    for name, content in FILES.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content, encoding="utf-8")
+    return root
+
+
+def _relative(cmap, root: Path):
+    return {
+        kp: [(o.file.relative_to(root), o.local_path) for o in origins]
+        for kp, origins in cmap.reverse.items()
+    }
+
+
+def test_zip_loads_like_a_directory(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    archive = tmp_path / "release.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name, content in FILES.items():
+            zf.writestr(name, content)
+    data, cmap = load_data_cascade(root)
+    zdata, zmap = load_data_cascade(archive)
+    assert zdata == data
+    assert _relative(zmap, archive) == _relative(cmap, root)
+    assert set(zmap.fingerprints) == {archive / name for name in FILES}
+    lazy, _ = load_data_cascade(archive, lazy=True)
+    assert lazy["svc"]["api"] == {"host": "h", "port": 1}
+
+
+def test_directory_inside_a_tar_archive(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    archive = tmp_path / "release.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        tf.add(root, arcname="data")
+    data, cmap = load_data_cascade(archive / "data", layered=True)
+    assert data["svc"]["db"] == {"port": 5432}
+    assert cmap.fingerprints[archive / "data" / "svc" / "db.toml"][1] == 12
+    fs = TarFS(archive)
+    assert fs.list_dirs(archive) == [archive / "data"]
+    fs.close()
+
+
+def test_memory_fs(tmp_path: Path):
+    fs = MemoryFS(FILES, root="/mem")
+    data, cmap = load_data_cascade("/mem", fs=fs)
+    assert data == load_data_cascade(setup_tree(tmp_path))[0]
+    assert cmap.reverse[("svc", "api", "port")][0].file == Path("/mem/svc/api.json")
+    with pytest.raises(NotADirectoryError):
+        load_data_cascade("/mem/svc/api.json", fs=fs)
+
+
+def test_virtual_cascades_are_read_only(tmp_path: Path):
+    archive = tmp_path / "release.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("__main__.yaml", "a: 1\n")
+    for c in (make_cascade(archive), make_cascade(".", fs=MemoryFS(FILES))):
+        c.set("a", 2)
+        with pytest.raises(ValueError):
+            c.save()
+    assert ZipFS(archive).list_files(archive, (".yaml",)) == [archive / "__main__.yaml"]
+
+
+def test_file_systems_are_abstract(tmp_path: Path, monkeypatch):
+    with pytest.raises(TypeError):
+        FileSystem()  # type: ignore[abstract]
+    with pytest.raises(TypeError):
+        _IndexedFS("/mem")  # type: ignore[abstract]
+    root = setup_tree(tmp_path)
+    c = make_cascade(root)
+    # writability is decided once, not by statting the ancestors per save
+    monkeypatch.setattr(Path, "is_file", lambda self: pytest.fail("statted"))
+    c.set("name", "y")
+    c.save()
+
+
+def test_archives_load_async_and_through_a_parse_cache(tmp_path: Path):
+    archive = tmp_path / "release.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name, content in FILES.items():
+            zf.writestr(name, content)
+    data, _ = load_data_cascade(archive)
+
+    async def run() -> None:
+        c = await make_cascade_async(archive)
+        assert c.data == data
+        await c.refresh_async()
+        assert c.data == data
+
+    asyncio.run(run())
+    cache = ParseCache()
+    assert load_data_cascade(archive, loader=cache)[0] == data
+    memory = MemoryFS({"__main__.yaml": "name: y\n"})
+    assert load_data_cascade(".", fs=memory, loader=cache)[0] == {"name": "y"}
+    assert load_data_cascade(archive, loader=cache)[0] == data
+    assert cache.misses == len(FILES) + 1 and cache.hits == len(FILES)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import functools
+import json
+from pathlib import Path
+
+import pytest
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.deferred import plain
+from data_cascade.layered import claim_origins
+
+
+@pytest.fixture
+def setup_tree(teams_tree):
+    return functools.partial(
+        teams_tree,
+        merge="      exclude: [skip]\n",
+        files={"__main__.json": '{"more": {"a": 1}}', "skip/a.yaml": "q: 1\n"},
+    )
+
+
+def _origins(cmap):
+    return {kp: tuple(origins) for kp, origins in cmap.reverse.items()}
+
+
+def test_layered_matches_full_load(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    layered, lmap = load_data_cascade(root, layered=True)
+    assert plain(layered) == data
+    assert list(layered) == list(data)
+    claim_origins(layered)
+    assert _origins(lmap) == _origins(cmap)
+    assert lmap.forward == cmap.forward
+    assert lmap.configs == cmap.configs
+
+
+def test_layered_resolves_keys_on_demand(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root, layered=True)
+    assert not cmap.reverse
+    assert data["teams"]["core"]["lead"] == "bob"
+    assert {kp[0] for kp in cmap.reverse} == {"teams"}
+    assert "more" in data and "skip" not in data
+    assert ("more",) not in cmap.reverse
+    # partial reads record origins in the order a full load does
+    claim_origins(data)
+    assert _origins(cmap) == _origins(load_data_cascade(root)[1])
+
+
+def test_lazy_layered_parses_directories_on_access(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    core = root / "teams" / "core" / "__main__.json"
+    data, cmap = load_data_cascade(root, layered=True, lazy=True)
+    assert core not in cmap.fingerprints
+    assert data["teams"]["core"]["members"] == [1, 2]
+    assert core in cmap.fingerprints
+
+
+def test_layered_cascade_saves_like_full_load(setup_tree, tmp_path: Path):
+    saved = {}
+    for layered in (False, True):
+        root = setup_tree(tmp_path / str(layered))
+        c = make_cascade(root, layered=layered)
+        c.set("more.a", 2)
+        c.set("teams.core.lead", "cat")
+        c.set("brand_new", 1)
+        c.save()
+        saved[layered] = {
+            str(p.relative_to(root)): p.read_text(encoding="utf-8")
+            for p in sorted(root.rglob("*.*"))
+        }
+    assert saved[True] == saved[False]
+    assert json.loads(saved[True]["__main__.json"]) == {"more": {"a": 2}}
+
+
+def test_layered_refresh_reports_changed_keys(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, layered=True)
+    (root / "teams.yaml").write_text("core: {size: 6}\n", encoding="utf-8")
+    changes = c.refresh()
+    assert [(ch.path, ch.old, ch.new) for ch in changes.changes] == [
+        (("teams", "core", "size"), 5, 6)
+    ]
+    assert changes.changes[0].origins[0].file == root / "teams.yaml"
+
+
+def test_layered_replaced_directories_save_like_full_load(setup_tree, tmp_path):
+    saved = {}
+    for opts in ({}, {"layered": True}, {"layered": True, "lazy": True}, None):
+        root = setup_tree(tmp_path / str(len(saved)))
+        c = make_cascade(root, **(opts or {"layered": True}))
+        if opts is None:
+            c.frozen()  # merges every node, dropping its layers
+        c.set("teams", {"core": {"lead": "cat", "members": [3]}, "new": 1})
+        c.save()
+        assert make_cascade(root).get("teams.core.members") == [3]
+        saved[len(saved)] = {
+            str(p.relative_to(root)): p.read_text(encoding="utf-8")
+            for p in sorted(root.rglob("*.*"))
+        }
+    assert saved[1] == saved[2] == saved[3] == saved[0]
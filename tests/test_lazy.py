@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.deferred import DeferredDict, is_unloaded, plain
+from data_cascade.io import load_file
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n", encoding="utf-8"
+    )
+    (root / "services.yaml").write_text(
+        "api:\n  tags: [a]\nshared: 1\n", encoding="utf-8"
+    )
+    (root / "services").mkdir()
+    (root / "services" / "api.yaml").write_text(
+        "port: 80\ntags: [b]\n", encoding="utf-8"
+    )
+    (root / "services" / "web").mkdir()
+    (root / "services" / "web" / "__main__.yaml").write_text(
+        "port: 8080\n", encoding="utf-8"
+    )
+    (root / "teams").mkdir()
+    (root / "teams" / "core.yaml").write_text("members: [Alice]\n", encoding="utf-8")
+    return root
+
+
+def test_lazy_load_matches_eager_after_access(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    loaded: list = []
+
+    def loader(path: Path):
+        loaded.append(path.relative_to(root).as_posix())
+        return load_file(path)
+
+    eager, eager_map = load_data_cascade(root)
+    data, cmap = load_data_cascade(root, lazy=True, loader=loader)
+    assert is_unloaded(data["teams"])
+    assert not any(p.startswith(("teams/", "services/")) for p in loaded)
+    assert ("teams", "core") not in cmap.reverse
+
+    # inherited list mode and the sibling services.yaml still apply
+    assert data["services"]["api"]["tags"] == ["a", "b"]
+    assert "services/api.yaml" in loaded
+    assert is_unloaded(data["services"]["web"])
+    assert not any(p.startswith("teams/") for p in loaded)
+    assert cmap.reverse[("services", "api", "port")][0].file.name == "api.yaml"
+
+    assert plain(data) == eager
+    assert cmap.reverse == eager_map.reverse
+
+
+def test_lazy_cascade_saves_only_loaded_parts(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, lazy=True)
+    c.set("services.web.port", 9090)
+    c.save()
+    assert is_unloaded(c.data["teams"])
+    assert "9090" in (root / "services" / "web" / "__main__.yaml").read_text(
+        encoding="utf-8"
+    )
+    assert make_cascade(root).get("services.web.port") == 9090
+    c.refresh()
+    assert is_unloaded(c.data["teams"])
+
+
+def test_full_refresh_diff_skips_subtrees_never_read(tmp_path: Path):
+    with pytest.raises(TypeError):
+        DeferredDict()  # abstract: subclasses implement _materialize
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, lazy=True)
+    assert c.get("name") == "Alpha"
+    # a changed __config__ compares the whole tree
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: replace\n", encoding="utf-8"
+    )
+    (root / "__main__.yaml").write_text("name: Beta\n", encoding="utf-8")
+    assert c.refresh().modified == [("name",)]
+    assert is_unloaded(c.data["teams"]) and is_unloaded(c.data["services"])
+    assert c.get("services.api.tags") == ["b"]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_replacing_an_unread_directory_rewrites_its_files(tmp_path: Path, lazy):
+    root = tmp_path / "data"
+    (root / "b").mkdir(parents=True)
+    (root / "b" / "b.yaml").write_text("c: 1\n", encoding="utf-8")
+    c = make_cascade(root, lazy=lazy)
+    c.set("b", {"k": 1, "b": [1]})
+    c.save()
+    assert load_file(root / "b" / "b.yaml") == [1]
+    assert make_cascade(root).get("b") == {"k": 1, "b": [1]}
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from data_cascade.logging_utils import TRACE, disable_trace, enable_trace, tracer
+from data_cascade.merge.merge import merge_lists
+from data_cascade.merge.strategy import ListMode, ListStrategy
+
+
+class NoRepr:
+    def __repr__(self) -> str:
+        raise AssertionError("formatted while tracing is off")
+
+
+@pytest.fixture
+def tracing():
+    yield
+    disable_trace()
+    logging.getLogger("data_cascade").setLevel(logging.NOTSET)
+
+
+def test_disabled_trace_points_do_not_format(caplog):
+    caplog.set_level(logging.DEBUG, logger="data_cascade")
+    assert not tracer.on
+    merge_lists([NoRepr()], [NoRepr()], ListStrategy(mode=ListMode.EXTEND))
+    assert not [r for r in caplog.records if r.levelno <= logging.DEBUG]
+
+
+def test_trace_points_are_sampled(caplog, tracing):
+    caplog.set_level(TRACE, logger="data_cascade")
+    enable_trace(1.0)
+    merge_lists([1], [2], ListStrategy(mode=ListMode.EXTEND))
+    assert [r.levelname for r in caplog.records] == ["TRACE"]
+    assert "1 + 1 items" in caplog.records[0].getMessage()
+
+    enable_trace(0.25, seed=1)
+    for _ in range(400):
+        merge_lists([1], [2], ListStrategy(mode=ListMode.EXTEND))
+    assert tracer.emitted + tracer.dropped == 400
+    assert 50 < tracer.emitted < 150
+
+
+def test_enable_trace_rejects_bad_rates():
+    with pytest.raises(ValueError):
+        enable_trace(0)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import yaml
+
+from data_cascade import (
+    LayerCache,
+    LoadStats,
+    OverlayCascade,
+    load_overlay,
+    make_cascade,
+)
+from data_cascade.cascade import ConcurrentOverlayCascade
+from data_cascade.io import load_file
+from data_cascade.stats import PARSE
+
+
+def setup_roots(tmp_path: Path) -> tuple[Path, Path]:
+    base, env = tmp_path / "base", tmp_path / "env"
+    (base / "svc").mkdir(parents=True)
+    (env / "svc").mkdir(parents=True)
+    (base / "__main__.yaml").write_text(
+        "name: base\nlimits: {cpu: 1, mem: 2}\ntags: [a]\n"
+        "__config__: {data: {merge: {per_key: {tags: {list: {mode: extend}}}}}}\n",
+        encoding="utf-8",
+    )
+    (base / "svc" / "api.yaml").write_text("port: 80\nhost: h\n", encoding="utf-8")
+    (base / "svc" / "db.yaml").write_text("port: 5432\n", encoding="utf-8")
+    (env / "__main__.yaml").write_text(
+        "limits: {cpu: 4}\ntags: [b]\n", encoding="utf-8"
+    )
+    (env / "svc" / "api.yaml").write_text("port: 8080\n", encoding="utf-8")
+    return base, env
+
+
+def test_overlay_merges_roots_and_shares_the_base(tmp_path: Path):
+    base, env = setup_roots(tmp_path)
+    data, cmap, layers = load_overlay([base, env], cache=LayerCache())
+    assert data["limits"] == {"cpu": 4, "mem": 2}
+    assert data["tags"] == ["a", "b"]  # the base root's strategy applies
+    assert data["svc"]["api"] == {"port": 8080, "host": "h"}
+    assert data["svc"]["db"] is layers[0].data["svc"]["db"]
+    assert cmap.reverse[("svc", "api", "port")][0].file == env / "svc" / "api.yaml"
+
+
+def test_overlay_merges_directories_with_their_own_strategy(tmp_path: Path):
+    base, env = setup_roots(tmp_path)
+    for root, member in ((base, "A"), (env, "B")):
+        (root / "teams").mkdir()
+        (root / "teams" / "__main__.yaml").write_text(
+            f"members: [{member}]\n", encoding="utf-8"
+        )
+    (base / "teams" / "__config__.yaml").write_text(
+        "data: {merge: {list: {mode: extend}}}\n", encoding="utf-8"
+    )
+    data, _, _ = load_overlay([base, env], cache=None)
+    assert data["teams"]["members"] == ["A", "B"]
+    assert data["limits"] == {"cpu": 4, "mem": 2}
+
+
+def test_layer_cache_reuses_unchanged_roots(tmp_path: Path):
+    base, env = setup_roots(tmp_path)
+    cache = LayerCache()
+    load_overlay([base, env], cache=cache)
+    stats = LoadStats()
+    data, _, _ = load_overlay([base, env / "svc"], cache=cache, stats=stats)
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert {t.path for t in stats.timings if t.phase == PARSE} == {
+        env / "svc" / "api.yaml"
+    }
+    (base / "svc" / "db.yaml").write_text("port: 5433\n", encoding="utf-8")
+    data, _, _ = load_overlay([base, env], cache=cache)
+    assert data["svc"]["db"]["port"] == 5433
+    assert cache.misses == 4
+
+
+def test_overlay_saves_to_the_top_most_defining_root(tmp_path: Path):
+    base, env = setup_roots(tmp_path)
+    c = make_cascade([base, env], cache=LayerCache())
+    assert isinstance(c, OverlayCascade)
+    layers_before = repr(c.layers)
+    c.set("svc.api.port", 9000)  # defined by both roots
+    c.set("svc.api.host", "h2")  # only in the base
+    c.set("limits.mem", 3)
+    c.set("extra", {"a": 1})  # new
+    c.save()
+    assert repr(c.layers) == layers_before
+    assert load_file(env / "svc" / "api.yaml") == {"port": 9000}
+    assert load_file(base / "svc" / "api.yaml") == {"port": 80, "host": "h2"}
+    assert load_file(env / "__main__.yaml") == {
+        "limits": {"cpu": 4},
+        "tags": ["b"],
+        "extra": {"a": 1},
+    }
+    saved_base = yaml.safe_load((base / "__main__.yaml").read_text("utf-8"))
+    assert saved_base["limits"] == {"cpu": 1, "mem": 3}
+    assert saved_base["tags"] == ["a"]
+    changes = c.refresh()
+    assert not changes.changes
+    assert c.get("svc.api") == {"port": 9000, "host": "h2"}
+
+
+def test_thread_safe_overlay(tmp_path: Path):
+    base, env = setup_roots(tmp_path)
+    c = make_cascade([base, env], thread_safe=True, cache=None)
+    assert isinstance(c, ConcurrentOverlayCascade)
+    snap = c.snapshot()
+    c.set("limits.cpu", 8)
+    assert snap["limits"]["cpu"] == 4 and c.get("limits.cpu") == 8
+    c.save()
+    assert load_file(env / "__main__.yaml")["limits"] == {"cpu": 8}
+
+
+def test_overlay_watcher_reloads_changed_roots(tmp_path: Path):
+    base, env = setup_roots(tmp_path)
+    c = make_cascade([base, env], cache=LayerCache())
+    watcher = c.watch(backend="poll", poll_interval=3600)
+    try:
+        (base / "svc" / "db.yaml").write_text("port: 5433\n", encoding="utf-8")
+        (env / "svc" / "web.yaml").write_text("port: 81\n", encoding="utf-8")
+        changes = watcher.check()
+    finally:
+        watcher.stop()
+    assert changes.paths == [("svc", "db", "port"), ("svc", "web")]
+    assert c.get("svc.web.port") == 81
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.codec import decode, encode
+from data_cascade.parallel import parse_files
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "__config__.yaml").write_text(
+        "data:\n  merge:\n    list:\n      mode: extend\n", encoding="utf-8"
+    )
+    (root / "services.yaml").write_text(
+        "api:\n  tags: [a]\nsince: 2024-01-02\n", encoding="utf-8"
+    )
+    (root / "services").mkdir()
+    (root / "services" / "api.json").write_text('{"tags": ["b"]}', encoding="utf-8")
+    big = {f"k{i}": list(range(20)) for i in range(2000)}
+    (root / "services" / "big.json").write_text(repr(big).replace("'", '"'))
+    (root / "broken.json").write_text("{", encoding="utf-8")
+    return root
+
+
+def test_codec_roundtrip_with_pickle_fallback():
+    plain = {"a": [1, 2.5, None, True, "x"]}
+    assert encode(plain)[:1] == b"M" and decode(encode(plain)) == plain
+    dated = {"when": datetime.date(2024, 1, 2)}
+    assert encode(dated)[:1] == b"P" and decode(memoryview(encode(dated))) == dated
+
+
+def test_process_load_matches_sequential(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    expected_data, expected_map = load_data_cascade(root)
+    data, cmap = load_data_cascade(root, processes=2)
+    assert data == expected_data
+    assert cmap.reverse == expected_map.reverse
+    assert data["services"]["since"] == datetime.date(2024, 1, 2)
+    assert "broken" not in data
+
+
+def test_parse_files_reports_errors_and_uses_shared_memory(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    files = [root / "services" / "big.json", root / "broken.json"]
+    results = parse_files(files, 1, shm_threshold=1024)
+    content, error = results[files[0]]
+    assert error is None and len(content) == 2000
+    assert results[files[1]][0] is None
+    assert isinstance(results[files[1]][1], Exception)
+
+
+def test_processes_rejects_lazy(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    with pytest.raises(ValueError):
+        load_data_cascade(root, processes=2, lazy=True)
+    c = make_cascade(root, processes=2)
+    assert c.refresh().paths == []
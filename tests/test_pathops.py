@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from data_cascade.pathops import delete_at, get_at, parse_path, set_at
+from data_cascade.pathops import (
+    delete_at,
+    get_at,
+    get_many_at,
+    parse_path,
+    parse_query,
+    query_at,
+    set_at,
+    set_many_at,
+)
 
 
 def test_parse_and_access():
@@ -12,3 +21,64 @@ def test_parse_and_access():
     assert obj2["a"]["b"][0] == 99
     obj3 = delete_at(obj2, ("a", "b", "0"))
     assert obj3["a"]["b"][0] is None
+
+
+def test_get_many_and_set_many():
+    obj = {"a": {"b": [1, {"c": 2}], "d": 3}}
+    paths = [("a", "d"), ("a", "b", "1", "c"), ("x",), ("a", "b", "0"), ("a",)]
+    assert get_many_at(obj, paths, missing="NA") == [3, 2, "NA", 1, obj["a"]]
+
+    out = set_many_at(
+        obj,
+        [
+            (("a", "b", "1", "c"), 20),
+            (("a", "new", "k"), "v"),
+            (("a", "d"), 30),
+            (("a", "d"), 31),
+        ],
+    )
+    assert out is obj
+    assert obj["a"]["b"][1]["c"] == 20
+    assert obj["a"]["new"] == {"k": "v"}
+    assert obj["a"]["d"] == 31
+    assert set_many_at(None, [(("0", "x"), 1)]) == [{"x": 1}]
+    # a None assigned earlier in the batch is replaced by a container
+    assert set_many_at({}, [(("a", "b"), None), (("a", "b", "c"), 1)]) == {
+        "a": {"b": {"c": 1}}
+    }
+    assert set_many_at(
+        {"a": {}}, [(("a", "b"), None), (("a", "b", "0"), 1)], copy_on_write=True
+    ) == {"a": {"b": [1]}}
+
+
+def test_set_many_applies_paths_in_order_without_touching_values():
+    # a later parent replaces what an earlier descendant wrote, as with set_at
+    obj = {"a": {"x": 1}}
+    assert set_many_at(obj, [(("a", "y"), 2), (("a",), {"z": 3})]) == {"a": {"z": 3}}
+    v = {"q": {"s": 1}}
+    for copy_on_write in (False, True):
+        out = set_many_at(
+            {},
+            [(("b",), v), (("c",), 1), (("b", "q", "r"), 2), (("b", "t"), 3)],
+            copy_on_write=copy_on_write,
+        )
+        assert out == {"b": {"q": {"s": 1, "r": 2}, "t": 3}, "c": 1}
+        assert v == {"q": {"s": 1}}
+
+
+def test_query_wildcards_and_slices():
+    obj = {
+        "services": {"api": {"port": 80}, "db": {"port": 5432}, "x": 1},
+        "teams": [{"members": ["a"]}, {"members": ["b"]}, {"members": ["c"]}],
+    }
+    assert dict(query_at(obj, "services.*.port")) == {
+        ("services", "api", "port"): 80,
+        ("services", "db", "port"): 5432,
+    }
+    assert [v for _, v in query_at(obj, "teams[*].members")] == [["a"], ["b"], ["c"]]
+    assert [kp for kp, _ in query_at(obj, "teams[1:].members[0]")] == [
+        ("teams", "1", "members", "0"),
+        ("teams", "2", "members", "0"),
+    ]
+    assert sorted(v for _, v in query_at(obj, "**.port")) == [80, 5432]
+    assert parse_query("a.**.**.b") == (("key", "a"), ("deep", None), ("key", "b"))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import datetime
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from data_cascade import make_cascade
+from data_cascade.server import CascadeClient, CascadeServer
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    (root / "services").mkdir(parents=True)
+    (root / "__main__.yaml").write_text(
+        "name: Alpha\nday: 2024-01-02\n", encoding="utf-8"
+    )
+    (root / "db.yaml").write_text("host: a\nport: 1\n", encoding="utf-8")
+    (root / "services" / "api.yaml").write_text("port: 80\n", encoding="utf-8")
+    (root / "services" / "web.json").write_text('{"port": 81}', encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def served(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, thread_safe=True, lazy=True)
+    server = CascadeServer(c, tmp_path / "cascade.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield root, c, server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_client_reads_values_queries_and_origins(served):
+    root, c, server = served
+    assert (server.path.stat().st_mode & 0o777) == 0o600
+    with CascadeClient(server.path) as client:
+        assert client.get("db.host") == "a"
+        assert client.get("nope.x") is None
+        assert client.get_many(["services.api.port", ("day",)]) == [
+            80,
+            datetime.date(2024, 1, 2),
+        ]
+        assert client.get("services") == {"api": {"port": 80}, "web": {"port": 81}}
+        assert client.node().services.web["port"].get() == 81
+        matches = client.query("services.*.port")
+        assert [(m.path, m.value) for m in matches] == [
+            (("services", "api", "port"), 80),
+            (("services", "web", "port"), 81),
+        ]
+        assert matches[0].origins == tuple(c.cmap.reverse[("services", "api", "port")])
+        assert client.node("db.port").origins()[0].file == root / "db.yaml"
+        assert client.origins("nope") == []
+
+
+def test_errors_are_raised_in_the_client(served):
+    _, _, server = served
+    client = CascadeClient(server.path)
+    with pytest.raises(TypeError):
+        client.query(["not", "a", "string"])  # type: ignore[arg-type]
+    assert client.get("name") == "Alpha"  # the connection is still usable
+    client.close()
+    assert CascadeClient(server.path).get("name") == "Alpha"
+
+
+def test_reloaded_cascade_is_served(served):
+    root, c, server = served
+    client = CascadeClient(server.path)
+    assert client.get("db.host") == "a"
+    watcher = c.watch(backend="poll", poll_interval=3600)
+    try:
+        (root / "db.yaml").write_text("host: b\nport: 1\n", encoding="utf-8")
+        watcher.check()
+    finally:
+        watcher.stop()
+    assert client.get("db.host") == "b"
+    client.close()
+
+
+def test_live_sockets_are_kept_and_stale_ones_replaced(served, tmp_path: Path):
+    _, c, server = served
+    with pytest.raises(OSError):
+        CascadeServer(c, server.path)
+    assert CascadeClient(server.path).get("name") == "Alpha"
+
+    stale = tmp_path / "stale.sock"
+    dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    dead.bind(str(stale))
+    dead.close()  # the file stays, nothing listens
+    CascadeServer(c, stale).server_close()
+    assert not stale.exists()
+
+    # a server whose path was taken over leaves the new socket alone
+    first = CascadeServer(c, tmp_path / "other.sock")
+    first.path.unlink()
+    second = CascadeServer(c, first.path)
+    first.server_close()
+    assert second.path.exists()
+    second.server_close()
+    assert not second.path.exists()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.deferred import is_unloaded, plain
+from data_cascade.shared import CascadeBuffer, SharedCascade, share_cascade
+
+
+@pytest.fixture
+def setup_tree(teams_tree):
+    return functools.partial(
+        teams_tree,
+        main="ports: {80: http, '80': str, 443: https}\n"
+        "misc: {ratio: -0.0, big: 123456789012345678901234, day: 2024-01-02}\n",
+        files={"tags.json": '["z", {"k": null, "t": true}]'},
+    )
+
+
+# inherited by forked workers, not pickled
+_SHARED: list = []
+
+
+def _read_in_child(i: int) -> list:
+    c = _SHARED[i]
+    return [c.get("teams.core.lead"), c.cmap.reverse[("tags",)][0].file.name]
+
+
+def test_shared_matches_full_load(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    c = make_cascade(root, shared=True)
+    assert isinstance(c, SharedCascade)
+    assert c.get("teams.core.members[1]") == 2
+    assert is_unloaded(c.data) and len(c.data) == len(data)
+    assert "teams" in c.data and "nope" not in c.data
+    ports = c.data["ports"]
+    assert (ports[80], ports["80"], ports.get(443), ports.get(8080)) == (
+        "http",
+        "str",
+        "https",
+        None,
+    )
+    assert plain(c.data) == data and list(c.data) == list(data)
+    assert str(c.get("misc.ratio")) == "-0.0"
+    assert c.get_many(["misc.big", "tags[1].t"]) == [123456789012345678901234, True]
+    assert [m.path for m in c.query("teams.*.size")] == [("teams", "core", "size")]
+    assert dict(c.cmap.reverse) == cmap.reverse
+    assert ("teams", "nope") not in c.cmap.reverse
+    assert dict(c.cmap.forward) == cmap.forward
+    assert c.config_for("teams") == {"dict": {"mode": "override"}}
+    test = c.cmap.descendant_test()
+    assert test(("teams",)) and not test(("title",))
+
+
+def test_shared_cascade_is_read_only(setup_tree, tmp_path: Path):
+    c = make_cascade(setup_tree(tmp_path), shared=True)
+    with pytest.raises(TypeError):
+        c.set("title", "other")
+    with pytest.raises(TypeError):
+        c.node("teams").core.lead.set("cat")
+    c.save()  # nothing to write
+    assert c.frozen()["teams"]["core"]["lead"] == "bob"
+
+
+def test_shared_cascade_is_packed_again_on_refresh(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, shared=True)
+    old = c.buffer
+    (root / "teams.yaml").write_text("core: {size: 6}\n", encoding="utf-8")
+    changes = c.refresh()
+    assert [(ch.path, ch.old, ch.new) for ch in changes.changes] == [
+        (("teams", "core", "size"), 5, 6)
+    ]
+    assert c.buffer is not old and c.get("teams.core.size") == 6
+    watcher = c.watch(backend="poll", poll_interval=3600)
+    try:
+        (root / "__main__.yaml").write_text("title: other\n", encoding="utf-8")
+        assert ("title",) in watcher.check().modified
+    finally:
+        watcher.stop()
+    assert c.get("title") == "other"
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_forked_workers_read_the_shared_mapping(setup_tree, tmp_path: Path):
+    _SHARED[:] = [make_cascade(setup_tree(tmp_path), shared=True)]
+    try:
+        with multiprocessing.get_context("fork").Pool(2) as pool:
+            results = pool.map(_read_in_child, [0, 0])
+    finally:
+        _SHARED.clear()
+    assert results == [["bob", "tags.json"]] * 2
+
+
+def test_shared_file_is_opened_by_other_processes(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    path = tmp_path / "data.dcs"
+    first = share_cascade(root, path, allowed_exts=(".json",))
+    with CascadeBuffer.open(path) as buffer:
+        assert buffer.size == path.stat().st_size == first.size
+        c = SharedCascade(buffer)
+        assert c.root == root
+        assert plain(c.data) == load_data_cascade(root, allowed_exts=(".json",))[0]
+    first.close()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from data_cascade import LoadStats, load_data_cascade, make_cascade
+from data_cascade.cli import main
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "services.yaml").write_text("api:\n  port: 80\n", encoding="utf-8")
+    (root / "services").mkdir()
+    (root / "services" / "api.json").write_text('{"tags": ["b"]}', encoding="utf-8")
+    return root
+
+
+def test_load_stats_records_phases_per_file(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    stats = LoadStats()
+    data, _ = load_data_cascade(root, stats=stats)
+    assert data == load_data_cascade(root)[0]
+
+    phases = stats.by_phase()
+    assert {"list", "parse", "strategy", "merge", "origins", "map_merge"} <= set(phases)
+    assert phases["directory"] >= phases["parse"] > 0
+
+    files = stats.by_file()
+    api = files[root / "services" / "api.json"]
+    assert api.bytes == len('{"tags": ["b"]}')
+    assert api.nodes == 3  # (), ("tags",), ("tags", "0")
+    assert set(files) == {
+        root / "__main__.yaml",
+        root / "services.yaml",
+        root / "services" / "api.json",
+    }
+    assert len(stats.slowest(2)) == 2
+    assert "slowest 2 files" in stats.report(2)
+
+
+def test_lazy_loads_report_into_the_same_stats(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    stats = LoadStats()
+    c = make_cascade(root, lazy=True, stats=stats)
+    assert root / "services" / "api.json" not in stats.by_file()
+    c.get("services.api")
+    assert root / "services" / "api.json" in stats.by_file()
+
+
+def test_cli_profile(tmp_path: Path, capsys):
+    root = setup_tree(tmp_path)
+    assert main(["profile", str(root), "--top", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "3 files" in out and "slowest 1 files" in out
+    assert main(["profile", str(root), "--phase", "parse"]) == 0
+    assert "api.json" in capsys.readouterr().out
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+
+import pytest
+
+from data_cascade import load_data_cascade, make_cascade
+from data_cascade.deferred import is_unloaded, plain
+from data_cascade.store import CascadeStore, SqliteCascade, compile_store
+
+
+@pytest.fixture
+def setup_tree(teams_tree):
+    return functools.partial(teams_tree, files={"__main__.json": '{"more": {"a": 1}}'})
+
+
+def test_store_matches_full_load(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    data, cmap = load_data_cascade(root)
+    c = make_cascade(root, store=tmp_path / "c.db")
+    assert isinstance(c, SqliteCascade)
+    assert is_unloaded(c.data["teams"])
+    assert c.get("teams.core.members[1]") == 2
+    assert not is_unloaded(c.data["teams"]) and is_unloaded(c.data["more"])
+    assert plain(c.data) == data and list(c.data) == list(data)
+    assert c.cmap.reverse[("tags",)] == cmap.reverse[("tags",)]
+    assert ("teams", "nope") not in c.cmap.reverse
+    assert c.cmap.forward[root / "teams.yaml"] == cmap.forward[root / "teams.yaml"]
+    assert c.config_for("teams") == {"dict": {"mode": "override"}}
+    assert list(c.store.leaves(("teams", "core", "members"))) == [
+        (("teams", "core", "members", "0"), 1),
+        (("teams", "core", "members", "1"), 2),
+    ]
+
+
+def test_store_cascade_saves_like_full_load(setup_tree, tmp_path: Path):
+    saved = {}
+    for store in (None, tmp_path / "c.db"):
+        root = setup_tree(tmp_path / str(store is not None))
+        c = make_cascade(root, store=store)
+        c.set("more.a", 2)
+        c.set("teams.core.lead", "cat")
+        c.set("brand_new", 1)
+        c.save()
+        saved[store] = {
+            str(p.relative_to(root)): p.read_text(encoding="utf-8")
+            for p in sorted(root.rglob("*.*"))
+        }
+    assert saved[tmp_path / "c.db"] == saved[None]
+
+
+def test_store_is_recompiled_when_stale(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    db = tmp_path / "c.db"
+    compile_store(root, db).close()
+    stamp = db.stat().st_mtime_ns, db.stat().st_ino
+    make_cascade(root, store=db)
+    assert (db.stat().st_mtime_ns, db.stat().st_ino) == stamp
+    (root / "teams.yaml").write_text("core: {size: 6}\n", encoding="utf-8")
+    assert not CascadeStore(db).is_current()
+    c = make_cascade(root, store=db)
+    assert c.get("teams.core.size") == 6
+    stamp = db.stat().st_ino
+    c = make_cascade(root, store=db, exclude=["teams.core"])
+    assert db.stat().st_ino != stamp
+    assert "members" not in c.get("teams.core")
+
+
+def test_store_refresh_reports_changed_keys(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, store=tmp_path / "c.db", thread_safe=True)
+    assert c.get("teams.core.size") == 5
+    (root / "teams.yaml").write_text("core: {size: 6}\n", encoding="utf-8")
+    changes = c.refresh()
+    assert [(ch.path, ch.old, ch.new) for ch in changes.changes] == [
+        (("teams", "core", "size"), 5, 6)
+    ]
+    assert c.get("teams.core.size") == 6
+    (root / "__main__.yaml").write_text("title: other\n", encoding="utf-8")
+    assert c.refresh().modified == [("title",)]
+
+
+def test_store_cascade_is_watched(setup_tree, tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, store=tmp_path / "c.db")
+    watcher = c.watch(backend="poll", poll_interval=3600)
+    try:
+        (root / "tags.json").write_text('["y"]', encoding="utf-8")
+        assert watcher.check().modified == [("tags", "0")]
+    finally:
+        watcher.stop()
+    assert c.get("tags") == ["y"]
+
+
+def test_make_cascade_rejects_unsupported_store_combinations(setup_tree, tmp_path):
+    root = setup_tree(tmp_path)
+    with pytest.raises(ValueError, match="shared"):
+        make_cascade(root, store=tmp_path / "c.db", shared=True)
+    with pytest.raises(ValueError, match="single root"):
+        make_cascade([root, root], store=tmp_path / "c.db")
+    with pytest.raises(ValueError, match="single root"):
+        make_cascade([root], shared=True)
+    assert not (tmp_path / "c.db").exists()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from data_cascade import make_cascade
+from data_cascade.views import View, compile_view, view_class
+
+
+@dataclass(frozen=True, slots=True)
+class Service:
+    port: int
+    host: str = "localhost"
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    name: str
+    services: Dict[str, Service]
+    backups: List[Service] = field(default_factory=list)
+    primary: Optional[Service] = None
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    (root / "services").mkdir(parents=True)
+    (root / "__main__.yaml").write_text(
+        "name: Alpha\nbackups: [{port: 9}]\nprimary: {port: 1, host: p}\n",
+        encoding="utf-8",
+    )
+    (root / "services" / "api.yaml").write_text("port: 80\n", encoding="utf-8")
+    (root / "services" / "web.yaml").write_text(
+        "port: 81\nhost: w\nmax-conns: 5\nclass: x\n", encoding="utf-8"
+    )
+    return root
+
+
+def test_inferred_views_are_slotted_and_read_only():
+    v = compile_view({"a": {"x": 1}, "b": {"x": 2}, "list": ({"x": 3}, 4)})
+    assert (v.a.x, v.b.x, v.list[0].x, v.list[1]) == (1, 2, 3, 4)
+    assert type(v.a) is type(v.b) and type(v.a) is type(v.list[0])
+    assert isinstance(v, View) and not hasattr(v, "__dict__")
+    with pytest.raises(AttributeError):
+        v.a.x = 5
+    w = compile_view({"max-conns": 5, "class": "x", "1": 0, "_keys": 1})
+    assert (w.max_conns, w.class_, w._1, w["_keys"]) == (5, "x", 0, 1)
+    assert w["max-conns"] == 5 and "class" in w and "nope" not in w
+    pytest.raises(KeyError, operator.getitem, w, "nope")
+    # views with the same keys compare equal, even across classes
+    view_class.cache_clear()
+    u = compile_view({"a": {"x": 1}})
+    assert type(u.a) is not type(v.a) and u.a == v.a and u.a != v
+
+
+def test_cascade_views_follow_writes_and_refreshes(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root)
+    v = c.view("services")
+    assert (v.api.port, v.web.max_conns) == (80, 5)
+    assert c.view("services") is v
+    assert c.node("services").web.view().host == "w"
+
+    c.set("services.api.port", 8080)
+    v2 = c.view("services")
+    assert v2 is not v and v2.api.port == 8080 and v.api.port == 80
+    assert v2.web is v.web  # unchanged subtrees keep their views
+
+    (root / "services" / "api.yaml").write_text("port: 90\n", encoding="utf-8")
+    c.refresh()
+    assert c.view("services").api.port == 90
+    assert c.view("nope") is None
+
+
+def test_schema_views(tmp_path: Path):
+    c = make_cascade(setup_tree(tmp_path))
+    s = c.view(schema=Settings)
+    assert isinstance(s, Settings) and s.name == "Alpha"
+    assert s.services["api"] == Service(port=80)
+    assert s.services["web"].host == "w"
+    assert s.backups == [Service(port=9)] and s.primary == Service(1, "p")
+    assert c.view(schema=Settings) is s
+    c.set("name", "Beta")
+    s2 = c.view(schema=Settings)
+    assert s2.name == "Beta" and s2.services["api"] is s.services["api"]
+    with pytest.raises(TypeError):
+        c.view("name", schema=Service)
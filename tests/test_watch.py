@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from data_cascade import make_cascade
+from data_cascade.io import load_file
+from data_cascade.watch import _load_libc
+
+
+def setup_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "__main__.yaml").write_text("name: Alpha\n", encoding="utf-8")
+    (root / "db.yaml").write_text("host: a\nport: 1\n", encoding="utf-8")
+    (root / "services").mkdir()
+    (root / "services" / "api.yaml").write_text("port: 80\n", encoding="utf-8")
+    return root
+
+
+def test_polling_check_reloads_changed_files(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root)
+    seen: list = []
+    watcher = c.watch(seen.append, backend="poll", poll_interval=3600)
+    try:
+        (root / "db.yaml").write_text("host: bb\nport: 1\n", encoding="utf-8")
+        (root / "services" / "web.yaml").write_text("port: 8080\n", encoding="utf-8")
+        changed = watcher.check()
+    finally:
+        watcher.stop()
+
+    assert c.get("db.host") == "bb"
+    assert c.get("services.web.port") == 8080
+    assert changed.modified == [("db", "host")]
+    assert changed.added == [("services", "web")]
+    assert seen == [changed]
+    assert not watcher.check()
+
+
+def test_reload_parses_and_merges_only_changed_directories(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    (root / "teams").mkdir()
+    (root / "teams" / "core.yaml").write_text("size: 3\n", encoding="utf-8")
+    parsed: list = []
+    # the watcher parses through the cascade's own loader
+    c = make_cascade(root, loader=lambda p: parsed.append(p) or load_file(p))
+    watcher = c.watch(backend="poll", poll_interval=3600)
+    try:
+        (root / "db.yaml").write_text("host: b\nport: 1\n", encoding="utf-8")
+        watcher.check()
+        teams = c.data["teams"]
+        c.set("teams.core.size", 4)  # unsaved, discarded by the next reload
+        parsed.clear()
+        (root / "services" / "api.yaml").write_text("port: 81\n", encoding="utf-8")
+        changes = watcher.check()
+    finally:
+        watcher.stop()
+    assert parsed == [root / "services" / "api.yaml"]
+    assert c.data["teams"] is teams and c.get("teams.core.size") == 3
+    assert changes.modified == [("services", "api", "port"), ("teams", "core", "size")]
+    assert c.get("db.host") == "b"
+
+
+@pytest.mark.skipif(_load_libc() is None, reason="inotify not available")
+def test_inotify_watcher_applies_edits(tmp_path: Path):
+    root = setup_tree(tmp_path)
+    c = make_cascade(root, thread_safe=True)
+    done = threading.Event()
+    seen: list = []
+
+    def on_change(changes) -> None:
+        seen.append(changes)
+        done.set()
+
+    with c.watch(on_change, backend="inotify", debounce=0.05):
+        (root / "services" / "new").mkdir()
+        (root / "services" / "new" / "x.json").write_text('{"k": 1}', encoding="utf-8")
+        assert done.wait(5)
+        if c.get("services.new.x.k") != 1:  # the mkdir may be reported first
+            done.clear()
+            assert done.wait(5)
+    assert c.get("services.new.x.k") == 1
+    assert any(changes.touches(("services", "new", "x")) for changes in seen)